@@ -1,34 +1,571 @@
-from flask import Flask, render_template, request, redirect, url_for, jsonify
+from flask import Flask, Response, g, has_request_context, render_template, stream_template, request, redirect, url_for, jsonify, session
+from markupsafe import Markup
 from flask_caching import Cache
 import aiohttp
 import asyncio
-from bs4 import BeautifulSoup, NavigableString
-from playwright.async_api import async_playwright
+import atexit
+import base64
+from bs4 import NavigableString, SoupStrainer
 from datetime import datetime, timedelta, timezone
 import os
 import calendar
-import praw
+import collections
+import functools
+import gzip
+import hashlib
+import json
+import math
+import multiprocessing
 import re
-from playwright_stealth import stealth_async
+import sqlite3
+import threading
+import time
+import concurrent.futures
+import contextvars
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlencode, urljoin
 from dotenv import load_dotenv
+try:
+    import brotli
+except ImportError:
+    brotli = None
+from append_log import AppendOnlySet
+from article_store import ArticleStore
+from circuit_breaker import CircuitBreaker
+from document_archive import DocumentArchive
+from metrics import BYTES_BUCKETS, COUNT_BUCKETS, MetricsRegistry
+from page_parsers import (
+    ARTICLE_NOT_FOUND_HTML, INSIGHTS_ARTICLE_NOT_FOUND, PRS_INDIA_URL, forumias_section_title,
+    make_soup, parse_air_rows, parse_current_affairs_iasgyan, parse_forumias, parse_full_article,
+    parse_full_article_insight, parse_indian_express_articles, parse_insights_articles, parse_orf_articles,
+    parse_page_mea, parse_pib_form, parse_pib_results, parse_prs_bills, parse_prs_bills_page, parse_prs_india,
+    parse_sansad_tv_summaries, parse_TH_learning
+)
+from rate_limiter import HostRateLimiter
+from search_index import SearchIndex
+from topic_index import TopicIndex
+from user_store import UserStore
 
 load_dotenv()
 API_KEY = os.environ.get('API_KEY')
 REDDIT_CLIENT_ID = os.environ.get('REDDIT_CLIENT_ID')
 REDDIT_CLIENT_SECRET = os.environ.get('REDDIT_CLIENT_SECRET')
 REDDIT_USER_AGENT = os.environ.get('REDDIT_USER_AGENT')
+# Optional integrations. YouTube playlists need API_KEY and are off without
+# one; Reddit reads its public listings when no credentials are set. One that
+# is off is never refreshed and is left off the dashboard.
+YOUTUBE_ENABLED = os.environ.get('YOUTUBE_ENABLED', '1' if API_KEY else '0') != '0'
+REDDIT_ENABLED = os.environ.get('REDDIT_ENABLED', '1') != '0'
 
 app = Flask(__name__)
-cache = Cache(app, config={'CACHE_TYPE': 'simple'})
+# Sessions carry the logged-in user; set SECRET_KEY so they survive restarts
+# and are accepted by every worker.
+app.secret_key = os.environ.get('SECRET_KEY') or os.urandom(32)
+if not os.environ.get('SECRET_KEY') and not app.debug and __name__ != '__main__':
+    print("Warning: SECRET_KEY is not set; logins will not survive a restart or carry over between workers")
+# Rendered pages and dashboard snapshots live in a tiered cache: a per-process
+# LRU in front of a SQLite file shared by all workers on the host, so cache
+# hits survive restarts and are not re-scraped by every worker.
+cache = Cache(app, config={
+    'CACHE_TYPE': 'tiered_cache.TieredCache',
+    'CACHE_DEFAULT_TIMEOUT': 300,
+    'CACHE_SQLITE_PATH': os.environ.get('CACHE_SQLITE_PATH', 'cache.sqlite3'),
+    'CACHE_L1_MAX_ENTRIES': int(os.environ.get('CACHE_L1_MAX_ENTRIES', 256)),
+    'CACHE_L1_TIMEOUT': int(os.environ.get('CACHE_L1_TIMEOUT', 30)),
+    'CACHE_MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 5000)),
+    'CACHE_MAX_BYTES': int(os.environ.get('CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+})
+# Per-route page cache TTLs in seconds, keyed by endpoint name.
+ROUTE_CACHE_TIMEOUTS = {
+    'index': int(os.environ.get('CACHE_TIMEOUT_INDEX', 300)),
+    'bilateral_documents': int(os.environ.get('CACHE_TIMEOUT_MEA', 3600)),
+    'prs_india': int(os.environ.get('CACHE_TIMEOUT_PRS', 3600)),
+}
+
+# Parsed full articles (/article, /article_insight, /TH_article) are kept in a
+# size-bounded store, since a published article does not change. Articles
+# nobody has read for ARTICLE_STORE_MAX_AGE seconds are dropped.
+article_store = ArticleStore(
+    path=os.environ.get('ARTICLE_STORE_PATH', 'articles.sqlite3'),
+    max_bytes=int(os.environ.get('ARTICLE_STORE_MAX_BYTES', 256 * 1024 * 1024)),
+    max_age=int(os.environ.get('ARTICLE_STORE_MAX_AGE', 30 * 24 * 3600)),
+    compress=os.environ.get('ARTICLE_STORE_COMPRESS', '1') != '0'
+)
+# Logged-in users keep their own playlists and watched/listened marks here;
+# logged-out visitors share the flat files below.
+user_store = UserStore(path=os.environ.get('USER_STORE_PATH', 'users.sqlite3'))
+# Every PIB backgrounder and factsheet and every PRS bill scraped is archived
+# here. Filtered queries over past periods are answered from the archive once
+# those periods have been backfilled; only the current period goes upstream.
+# The backfill archives every ministry and bill status a query has asked for,
+# besides the unfiltered listings.
+document_archive = DocumentArchive(path=os.environ.get('ARCHIVE_PATH', 'archive.sqlite3'))
+ARCHIVE_BACKFILL_ENABLED = os.environ.get('ARCHIVE_BACKFILL', '1') != '0'
+ARCHIVE_START_YEAR = int(os.environ.get('ARCHIVE_START_YEAR', 2015))
+ARCHIVE_BACKFILL_DELAY = float(os.environ.get('ARCHIVE_BACKFILL_DELAY', 5))
+ARCHIVE_BACKFILL_INTERVAL = int(os.environ.get('ARCHIVE_BACKFILL_INTERVAL', 24 * 3600))
+# Bill statuses change after a year is over, so archived years are re-read.
+PRS_ARCHIVE_MAX_AGE = int(os.environ.get('PRS_ARCHIVE_MAX_AGE', 7 * 24 * 3600))
+# A year of PRS bills is only marked archived once all its pages are read.
+PRS_BACKFILL_MAX_PAGES = int(os.environ.get('PRS_BACKFILL_MAX_PAGES', 50))
+# Items from the news sources are grouped into topic clusters as they are
+# scraped, so one story covered by several sources is read in one place.
+# Words that appear in nearly every title say nothing about the topic.
+TOPIC_IGNORED_WORDS = (
+    'upsc', 'essentials', 'editorial', 'editorials', '7pm', '9pm', 'daily', 'current', 'affairs',
+    'backgrounder', 'issue', 'brief', 'india', 'indian',
+)
+topic_index = TopicIndex(
+    path=os.environ.get('TOPIC_INDEX_PATH', 'topics.sqlite3'),
+    max_age=int(os.environ.get('TOPIC_INDEX_MAX_AGE', 14 * 24 * 3600)),
+    ignored_words=TOPIC_IGNORED_WORDS
+)
+TOPIC_DISPLAY_MAX_AGE = int(os.environ.get('TOPIC_DISPLAY_MAX_AGE', 3 * 24 * 3600))
+TOPIC_SOURCE_LABELS = {
+    'indian_express': 'Indian Express',
+    'forumias': 'ForumIAS',
+    'orf': 'ORF',
+    'pib_backgrounders': 'PIB',
+    'iasgyan': 'IASGyan',
+}
+# Everything scraped is searchable at /search: listings as their sources
+# refresh, archived PIB and PRS documents, and the bodies of listed articles
+# once read. Articles fetched from a URL no listing gave are not indexed.
+search_index = SearchIndex(path=os.environ.get('SEARCH_INDEX_PATH', 'search.sqlite3'))
+SEARCH_PAGE_SIZE = 20
+SEARCH_SOURCE_LABELS = {
+    'indian_express': 'Indian Express',
+    'orf': 'ORF',
+    'pib_backgrounders': 'PIB Backgrounders',
+    'pib_facts': 'PIB Factsheets',
+    'mea': 'MEA',
+    'prs': 'PRS',
+    'prs_bills': 'PRS Bills',
+    'forumias': 'ForumIAS',
+    'insights': 'Insights',
+    'iasgyan': 'IASGyan',
+    'sansad_tv': 'Sansad TV',
+    'air_spotlight': 'AIR Spotlight',
+    'air_insight': 'AIR Insight',
+    'air_economy': 'AIR Money Talk',
+    'air_current_affairs': 'AIR Current Affairs',
+}
 
 YOUTUBE_API_URL = 'https://www.googleapis.com/youtube/v3/playlistItems'
 PLAYLIST_API_URL = 'https://www.googleapis.com/youtube/v3/playlists'
 WATCHED_VIDEOS_FILE = 'watched_videos.txt'
 PLAYLISTS_FILE = 'playlists.txt'
 LISTENED_EPISODES_FILE = 'listened_episodes.txt'
+YOUTUBE_BATCH_SIZE = 50
+YOUTUBE_CONCURRENCY = 8
+
+# Watched/listened state is read once and then only the appended tail.
+watched_video_log = AppendOnlySet(WATCHED_VIDEOS_FILE)
+listened_episode_log = AppendOnlySet(LISTENED_EPISODES_FILE)
+
+# One pooled HTTP client is shared by every scraper. It lives on the scraper
+# event loop (see start_background_refresh), so routes hand their scraping
+# coroutines to that loop through run_on_scraper_loop().
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=20)
+PIB_TIMEOUT = aiohttp.ClientTimeout(total=30)
+# PIB's ASP.NET form state is reused across queries for this long, and each
+# ministry/year/month/day combination's results for PIB_RESULTS_TIMEOUT.
+PIB_FORM_STATE_TIMEOUT = int(os.environ.get('PIB_FORM_STATE_TIMEOUT', 1800))
+PIB_RESULTS_TIMEOUT = int(os.environ.get('PIB_RESULTS_TIMEOUT', 600))
+# The fallback PIB page is only asked once the primary has come back empty
+# or has taken longer than this.
+PIB_HEDGE_DELAY = float(os.environ.get('PIB_HEDGE_DELAY', 3))
+HTTP_CONNECTION_LIMIT = 100
+HTTP_CONNECTION_LIMIT_PER_HOST = 8
+HTTP_DNS_CACHE_TTL = 300
+HTTP_KEEPALIVE_TIMEOUT = 30
+# Every outbound request waits for its host's rate limiter: HTTP_HOST_BURST
+# requests back to back, then one per HTTP_HOST_INTERVAL seconds, or slower
+# if the site's robots.txt asks for a Crawl-delay. The buckets are shared by
+# all workers through RATE_LIMIT_PATH; set it empty to keep them per process.
+HTTP_HOST_INTERVAL = float(os.environ.get('HTTP_HOST_INTERVAL', 1))
+HTTP_HOST_BURST = int(os.environ.get('HTTP_HOST_BURST', 4))
+HTTP_HOST_LIMITS = {
+    'www.googleapis.com': (0.05, 8),
+    'oauth.reddit.com': (0.6, 10),
+}
+RATE_LIMIT_PATH = os.environ.get('RATE_LIMIT_PATH', 'rate_limits.sqlite3')
+ROBOTS_TIMEOUT = aiohttp.ClientTimeout(total=5)
+# Queued requests to a host go out lowest priority first: pages a user is
+# waiting for, then background refreshes, then article prefetching.
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_PREFETCH = 2
+fetch_priority = contextvars.ContextVar('fetch_priority', default=PRIORITY_BACKGROUND)
+
+# Every outbound request, parse, source refresh and route is measured. The
+# series are served in the Prometheus text format at /metrics, and each event
+# is also printed as one JSON line unless LOG_JSON=0. Outbound requests are
+# labelled with the dashboard source refreshing, or the route whose user is
+# waiting, that made them.
+LOG_JSON = os.environ.get('LOG_JSON', '1') != '0'
+metrics_source = contextvars.ContextVar('metrics_source', default='other')
+# Hosts the scrapers read. Any other host, such as one in an /article/<url>
+# link, is labelled 'other', so callers cannot add series of their own.
+METRICS_HOSTS = frozenset({
+    'www.pib.gov.in', 'www.mea.gov.in', 'www.newsonair.gov.in', 'www.orfonline.org', 'prsindia.org',
+    'www.iasgyan.in', 'www.insightsonindia.com', 'forumias.com', 'indianexpress.com',
+    'learningcorner.epaper.thehindu.com', 'www.reddit.com', 'reddit.com', 'oauth.reddit.com',
+    'www.googleapis.com',
+})
+metrics_registry = MetricsRegistry(prefix='tracker_')
+http_phase_seconds = metrics_registry.histogram(
+    'http_phase_seconds', "Outbound request time by phase: queued, dns, connect, ttfb, download and total.",
+    ('host', 'source', 'phase'))
+http_responses = metrics_registry.counter(
+    'http_responses_total', "Outbound responses by HTTP status, or 'error' where no response came.",
+    ('host', 'source', 'status'))
+http_response_bytes = metrics_registry.histogram(
+    'http_response_bytes', "Outbound response body size.", ('host', 'source'), buckets=BYTES_BUCKETS)
+http_cache_lookups = metrics_registry.counter(
+    'http_cache_lookups_total', "Cached pages revalidated upstream: 'hit' when unchanged (304), 'miss' when not.",
+    ('host', 'result'))
+parse_seconds = metrics_registry.histogram('parse_seconds', "Time to parse a page, per parser.", ('parser',))
+parse_cache_lookups = metrics_registry.counter(
+    'parse_cache_lookups_total', "Parses of unchanged pages reused ('hit') or run ('miss').", ('parser', 'result'))
+source_refresh_seconds = metrics_registry.histogram(
+    'source_refresh_seconds', "Time to refresh a dashboard source, by outcome.", ('source', 'outcome'))
+source_items = metrics_registry.gauge(
+    'source_items', "Items in the latest refresh of each source; a sudden drop usually means the page changed.",
+    ('source',))
+source_items_refreshed = metrics_registry.histogram(
+    'source_items_refreshed', "Items per successful refresh of each source.", ('source',), buckets=COUNT_BUCKETS)
+source_age_seconds = metrics_registry.gauge('source_age_seconds', "Time since each source last refreshed.", ('source',))
+source_breaker_open = metrics_registry.gauge(
+    'source_breaker_open', "1 while a source's circuit breaker keeps it from refreshing.", ('source',))
+host_interval_seconds = metrics_registry.gauge(
+    'host_interval_seconds', "Current gap between requests to each host, penalty included.", ('host',))
+host_queued_requests = metrics_registry.gauge(
+    'host_queued_requests', "Requests waiting for each host's rate limiter.", ('host',))
+request_seconds = metrics_registry.histogram(
+    'request_seconds', "Time to respond to each route, until the response starts.", ('route', 'method', 'status'))
+
+
+def metrics_host(host):
+    return host if host in METRICS_HOSTS else 'other'
+
+
+def log_event(event, **fields):
+    if LOG_JSON:
+        print(json.dumps({'time': datetime.now(timezone.utc).isoformat(timespec='milliseconds'), 'event': event,
+                          **fields}, default=str), flush=True)
+
+
+def _trace_timer(phase):
+    # A start/end pair of trace callbacks timing one phase of a request.
+    async def start(session, context, params):
+        context.started_at[phase] = time.perf_counter()
+
+    async def end(session, context, params):
+        if phase in context.started_at:
+            context.phases[phase] = time.perf_counter() - context.started_at[phase]
+    return start, end
+
+
+async def _trace_request_start(session, context, params):
+    context.started_at = {'total': time.perf_counter()}
+    context.phases = {}
+    context.headers_at = None
+    context.body_at = None
+    context.source = metrics_source.get()
+
+
+async def _trace_request_end(session, context, params):
+    context.headers_at = time.perf_counter()
+    context.phases['ttfb'] = context.headers_at - context.started_at.get('ttfb', context.started_at['total'])
+    http_responses.inc(host=metrics_host(params.url.host), source=context.source, status=params.response.status)
+    if context.body_at is not None:
+        _record_http_response(context, params.url)
+
+
+async def _trace_response_chunk(session, context, params):
+    # aiohttp reports the whole body as one chunk once read() has it, so
+    # this is the end of the download; bodies never read are not timed. A
+    # client middleware reading the body gets here before the request ends.
+    context.body_at = time.perf_counter()
+    context.body_bytes = len(params.chunk)
+    if context.headers_at is not None:
+        _record_http_response(context, params.url)
+
+
+def _record_http_response(context, url):
+    host = metrics_host(url.host)
+    context.phases['download'] = max(context.body_at - context.headers_at, 0)
+    context.phases['total'] = max(context.body_at, context.headers_at) - context.started_at['total']
+    for phase, seconds in context.phases.items():
+        http_phase_seconds.observe(seconds, host=host, source=context.source, phase=phase)
+    http_response_bytes.observe(context.body_bytes, host=host, source=context.source)
+    # Host and path only: query strings can carry API keys.
+    log_event('fetch', host=url.host, path=url.path, source=context.source, bytes=context.body_bytes,
+              **{f"{phase}_ms": round(seconds * 1000, 1) for phase, seconds in context.phases.items()})
+
+
+async def _trace_request_exception(session, context, params):
+    host = params.url.host
+    http_responses.inc(host=metrics_host(host), source=context.source, status='error')
+    log_event('fetch', host=host, path=params.url.path, source=context.source, status='error',
+              error=f"{type(params.exception).__name__}: {params.exception}",
+              total_ms=round((time.perf_counter() - context.started_at['total']) * 1000, 1))
+
+
+def http_trace_config():
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_trace_request_start)
+    for phase, (start_signal, end_signal) in {
+        'queued': (trace_config.on_connection_queued_start, trace_config.on_connection_queued_end),
+        'dns': (trace_config.on_dns_resolvehost_start, trace_config.on_dns_resolvehost_end),
+        'connect': (trace_config.on_connection_create_start, trace_config.on_connection_create_end),
+    }.items():
+        start, end = _trace_timer(phase)
+        start_signal.append(start)
+        end_signal.append(end)
+    # Time to first byte counts from the request being sent.
+    trace_config.on_request_headers_sent.append(_trace_timer('ttfb')[0])
+    trace_config.on_request_end.append(_trace_request_end)
+    trace_config.on_response_chunk_received.append(_trace_response_chunk)
+    trace_config.on_request_exception.append(_trace_request_exception)
+    return trace_config
+
+
+_http_session = None
+# aiohttp client middlewares wrapped around every outbound request, in order;
+# benchmarks/fixtures.py adds them to record responses and to replay them.
+http_middlewares = []
+
+
+async def get_http_session():
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_CONNECTION_LIMIT,
+            limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+        )
+        _http_session = aiohttp.ClientSession(connector=connector, headers=HTTP_HEADERS, timeout=HTTP_TIMEOUT,
+                                              trace_configs=[http_trace_config()],
+                                              middlewares=tuple(http_middlewares))
+    return _http_session
+
+
+async def close_http_session():
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
+async def fetch_robots_txt(url):
+    session = await get_http_session()
+    async with session.get(url, timeout=ROBOTS_TIMEOUT) as response:
+        if response.status != 200:
+            return ''
+        return await response.text()
+
+
+host_limiter = HostRateLimiter(
+    path=RATE_LIMIT_PATH or None,
+    interval=HTTP_HOST_INTERVAL,
+    burst=HTTP_HOST_BURST,
+    host_limits=HTTP_HOST_LIMITS,
+    fetch_robots=fetch_robots_txt
+)
+
+
+async def wait_for_host(url):
+    await host_limiter.acquire(url, fetch_priority.get())
+
+
+# On-disk HTTP cache: bodies are stored with their ETag/Last-Modified validators
+# and revalidated with conditional requests. On a 304 the stored body is reused,
+# and cached_parse() also reuses the result extracted from it last time.
+HTTP_CACHE_DIR = os.environ.get('HTTP_CACHE_DIR', 'http_cache')
+HTTP_CACHE_MAX_FILES = 2000
+# The directory is only scanned for pruning once per this many saves.
+HTTP_CACHE_PRUNE_EVERY = 100
+PARSED_RESULTS_MAX_ENTRIES = 256
+PARSED_RESULT_MAX_AGE = 6 * 3600
+
+HttpResult = collections.namedtuple('HttpResult', ['status', 'text', 'not_modified', 'cache_key'])
+
+_parsed_results = collections.OrderedDict()
+
+# Parsing runs in a process pool so it overlaps with network I/O and uses
+# more than one core; PARSE_POOL_WORKERS=0 parses everything in process. The
+# parsers live in page_parsers, so the workers import that and not the app.
+# Each app process has its own pool, so a few workers are plenty.
+PARSE_POOL_WORKERS = min(int(os.environ.get('PARSE_POOL_WORKERS', 2)), os.cpu_count() or 1)
+PARSE_POOL_MIN_BYTES = int(os.environ.get('PARSE_POOL_MIN_BYTES', 64 * 1024))
+
+_parse_pool = None
+
+
+def http_cache_key(url, params=None):
+    query = urlencode(sorted((params or {}).items()))
+    return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+
+def load_http_cache_entry(cache_key):
+    try:
+        with open(os.path.join(HTTP_CACHE_DIR, f"{cache_key}.json"), 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+_http_cache_saves = 0
+_http_cache_saves_lock = threading.Lock()
 
 
-async def fetch_videos_from_playlist(session, playlist_id):
+def save_http_cache_entry(cache_key, entry):
+    global _http_cache_saves
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        path = os.path.join(HTTP_CACHE_DIR, f"{cache_key}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(entry, file)
+        os.replace(tmp_path, path)
+        with _http_cache_saves_lock:
+            _http_cache_saves += 1
+            prune = _http_cache_saves % HTTP_CACHE_PRUNE_EVERY == 0
+        if prune:
+            prune_http_cache()
+    except OSError as e:
+        print(f"Error saving HTTP cache entry: {e}")
+
+
+def prune_http_cache():
+    entries = [entry for entry in os.scandir(HTTP_CACHE_DIR) if entry.name.endswith('.json')]
+    if len(entries) <= HTTP_CACHE_MAX_FILES:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    for entry in entries[:len(entries) - HTTP_CACHE_MAX_FILES]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+async def fetch_text(url, params=None, headers=None, **request_kwargs):
+    session = await get_http_session()
+    cache_key = http_cache_key(url, params)
+    cached = load_http_cache_entry(cache_key)
+    request_headers = dict(headers or {})
+    if cached:
+        if cached.get('etag'):
+            request_headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            request_headers['If-Modified-Since'] = cached['last_modified']
+
+    await wait_for_host(url)
+    async with session.get(url, params=params, headers=request_headers, **request_kwargs) as response:
+        await host_limiter.record_response(url, response.status, response.headers.get('Retry-After'))
+        if cached:
+            http_cache_lookups.inc(host=metrics_host(response.url.host), result='hit' if response.status == 304 else 'miss')
+        if response.status == 304 and cached:
+            return HttpResult(200, cached['body'], True, cache_key)
+        text = await response.text()
+        if response.status == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                await asyncio.to_thread(save_http_cache_entry, cache_key,
+                                        {'etag': etag, 'last_modified': last_modified, 'body': text})
+        return HttpResult(response.status, text, False, cache_key)
+
+
+def get_parse_pool():
+    global _parse_pool
+    if _parse_pool is None:
+        # spawn rather than fork: the scraper loop and Flask run in other threads.
+        _parse_pool = ProcessPoolExecutor(max_workers=PARSE_POOL_WORKERS,
+                                          mp_context=multiprocessing.get_context('spawn'))
+    return _parse_pool
+
+
+def shutdown_parse_pool():
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+async def parse_html(parse_function, content, *args):
+    started = time.perf_counter()
+    parsed = await _parse_in_pool_or_process(parse_function, content, *args)
+    seconds = time.perf_counter() - started
+    parse_seconds.observe(seconds, parser=parse_function.__name__)
+    log_event('parse', parser=parse_function.__name__, source=metrics_source.get(), bytes=len(content),
+              items=len(parsed) if isinstance(parsed, (list, dict)) else None, ms=round(seconds * 1000, 1))
+    return parsed
+
+
+async def _parse_in_pool_or_process(parse_function, content, *args):
+    # Large pages are parsed in the pool so the scraper loop keeps serving
+    # other requests meanwhile; small ones are cheaper to parse in place.
+    if PARSE_POOL_WORKERS > 0 and len(content) >= PARSE_POOL_MIN_BYTES:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                get_parse_pool(), functools.partial(parse_function, content, *args)
+            )
+        except BrokenProcessPool as e:
+            print(f"Parse pool failed, parsing {parse_function.__name__} in process: {e}")
+            shutdown_parse_pool()
+    return parse_function(content, *args)
+
+
+async def cached_parse(result, parse_function, *args):
+    key = (result.cache_key, parse_function.__name__, args)
+    if result.not_modified and key in _parsed_results:
+        parsed_at, parsed = _parsed_results[key]
+        if time.time() - parsed_at < PARSED_RESULT_MAX_AGE:
+            _parsed_results.move_to_end(key)
+            parse_cache_lookups.inc(parser=parse_function.__name__, result='hit')
+            return parsed
+    parse_cache_lookups.inc(parser=parse_function.__name__, result='miss')
+    parsed = await parse_html(parse_function, result.text, *args)
+    _parsed_results[key] = (time.time(), parsed)
+    _parsed_results.move_to_end(key)
+    while len(_parsed_results) > PARSED_RESULTS_MAX_ENTRIES:
+        _parsed_results.popitem(last=False)
+    return parsed
+
+
+# Concurrent calls to a @single_flight coroutine with the same arguments share
+# one in-flight task, so a page requested by several dashboard sources (or by
+# several users at once) is fetched and parsed only once.
+_inflight = {}
+
+
+def _forget_inflight(key, task):
+    if _inflight.get(key) is task:
+        del _inflight[key]
+
+
+def single_flight(scrape_function):
+    @functools.wraps(scrape_function)
+    async def wrapper(*args, **kwargs):
+        key = (scrape_function.__name__, args, tuple(sorted(kwargs.items())))
+        task = _inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(scrape_function(*args, **kwargs))
+            _inflight[key] = task
+            task.add_done_callback(functools.partial(_forget_inflight, key))
+        return await asyncio.shield(task)
+    return wrapper
+
+
+async def fetch_videos_from_playlist(playlist_id):
     params = {
         'part': 'snippet',
         'playlistId': playlist_id,
@@ -36,85 +573,167 @@ async def fetch_videos_from_playlist(session, playlist_id):
         'key': API_KEY
     }
     try:
-        async with session.get(YOUTUBE_API_URL, params=params) as response:
-            if response.status != 200:
-                print(f"Failed to fetch data for playlist {playlist_id}: {response.status} {await response.text()}")
-                return []
-            data = await response.json()
-            return data.get('items', [])
+        result = await fetch_text(YOUTUBE_API_URL, params=params)
+        if result.status != 200:
+            print(f"Failed to fetch data for playlist {playlist_id}: {result.status} {result.text}")
+            return []
+        return json.loads(result.text).get('items', [])
     except Exception as e:
         print(f"Error in fetch_videos_from_playlist for {playlist_id}: {e}")
         return []
 
-
-async def fetch_playlist_title(session, playlist_id):
+async def fetch_playlist_titles(playlist_ids):
+    # The playlists endpoint accepts up to YOUTUBE_BATCH_SIZE comma-separated IDs per call.
     params = {
         'part': 'snippet',
-        'id': playlist_id,
+        'id': ','.join(playlist_ids),
+        'maxResults': YOUTUBE_BATCH_SIZE,
         'key': API_KEY,
     }
     try:
-        async with session.get(PLAYLIST_API_URL, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                if data.get('items'):
-                    return {
-                        'id': data['items'][0]['id'],
-                        'title': data['items'][0]['snippet']['title'],
-                        'channel_title': data['items'][0]['snippet']['channelTitle']
-                    }
-            else:
-                print(f"Failed to fetch playlist title for {playlist_id}: {response.status} {await response.text()}")
+        result = await fetch_text(PLAYLIST_API_URL, params=params)
+        if result.status == 200:
+            data = json.loads(result.text)
+            return [{
+                'id': item['id'],
+                'title': item['snippet']['title'],
+                'channel_title': item['snippet']['channelTitle']
+            } for item in data.get('items', [])]
+        print(f"Failed to fetch playlist titles for {len(playlist_ids)} playlists: {result.status} {result.text}")
     except Exception as e:
-        print(f"Error in fetch_playlist_title for {playlist_id}: {e}")
-    return None
- 
+        print(f"Error in fetch_playlist_titles for {playlist_ids}: {e}")
+    return []
+
+# Reddit is read through its OAuth JSON API on the shared HTTP client with an
+# application-only token, or through the public JSON listings when no
+# credentials are configured.
+REDDIT_TOKEN_URL = 'https://www.reddit.com/api/v1/access_token'
+REDDIT_OAUTH_URL = 'https://oauth.reddit.com'
+REDDIT_PUBLIC_URL = 'https://www.reddit.com'
+REDDIT_SORTS = ('hot', 'new', 'top')
+# Listings are shared by all users for this long, per (subreddit, sort, limit).
+REDDIT_CACHE_TIMEOUT = int(os.environ.get('REDDIT_CACHE_TIMEOUT', 120))
+
+_reddit_token = {'value': None, 'expires_at': 0}
+
+
+async def get_reddit_token():
+    if _reddit_token['value'] and _reddit_token['expires_at'] > time.time() + 60:
+        return _reddit_token['value']
+    return await request_reddit_token()
+
+
+@single_flight
+async def request_reddit_token():
+    session = await get_http_session()
+    await wait_for_host(REDDIT_TOKEN_URL)
+    async with session.post(
+        REDDIT_TOKEN_URL,
+        data={'grant_type': 'client_credentials'},
+        auth=aiohttp.BasicAuth(REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET),
+        headers={'User-Agent': REDDIT_USER_AGENT}
+    ) as response:
+        await host_limiter.record_response(REDDIT_TOKEN_URL, response.status, response.headers.get('Retry-After'))
+        response.raise_for_status()
+        token = await response.json()
+    _reddit_token['value'] = token['access_token']
+    _reddit_token['expires_at'] = time.time() + token.get('expires_in', 3600)
+    return _reddit_token['value']
+
+
+def parse_reddit_listing(listing, subreddit_name):
+    posts = []
+    for child in listing.get('data', {}).get('children', []):
+        post = child.get('data', {})
+        selftext = post.get('selftext') or ''
+        posts.append({
+            'subreddit': subreddit_name,
+            'title': post.get('title'),
+            'url': post.get('url'),
+            'author': post.get('author') or '[deleted]',
+            'score': post.get('score'),
+            'num_comments': post.get('num_comments'),
+            'created_utc': post.get('created_utc'),
+            'selftext': selftext[:300] + '...' if len(selftext) > 300 else selftext,
+            'link': f"https://reddit.com{post.get('permalink', '')}",
+            'flair': post.get('link_flair_text') or 'No flair',
+            'nsfw': post.get('over_18', False),
+            'spoiler': post.get('spoiler', False)
+        })
+    return posts
+
+
+@single_flight
+async def fetch_subreddit_posts(subreddit_name, sort_method, limit):
+    cache_key = f"reddit/{subreddit_name}/{sort_method}/{limit}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    params = {'limit': limit, 'raw_json': 1}
+    if sort_method == 'top':
+        params['t'] = 'all'
+    headers = {'User-Agent': REDDIT_USER_AGENT or HTTP_HEADERS['User-Agent']}
+    if REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET:
+        headers['Authorization'] = f"bearer {await get_reddit_token()}"
+        url = f"{REDDIT_OAUTH_URL}/r/{subreddit_name}/{sort_method}"
+    else:
+        url = f"{REDDIT_PUBLIC_URL}/r/{subreddit_name}/{sort_method}.json"
+    session = await get_http_session()
+    await wait_for_host(url)
+    async with session.get(url, params=params, headers=headers) as response:
+        await host_limiter.record_response(url, response.status, response.headers.get('Retry-After'))
+        if response.status == 401:
+            _reddit_token['value'] = None
+        response.raise_for_status()
+        listing = await response.json()
+    posts = parse_reddit_listing(listing, subreddit_name)
+    cache.set(cache_key, posts, timeout=REDDIT_CACHE_TIMEOUT)
+    return posts
+
+
+async def fetch_subreddit_posts_safe(subreddit_name, sort_method, limit):
+    try:
+        return await fetch_subreddit_posts(subreddit_name, sort_method, limit)
+    except Exception as e:
+        print(f"Error fetching posts from subreddit {subreddit_name}: {e}")
+        return []
 
-reddit = praw.Reddit(
-    client_id=REDDIT_CLIENT_ID,
-    client_secret=REDDIT_CLIENT_SECRET,
-    user_agent=REDDIT_USER_AGENT
-)
+
+async def fetch_subreddits_posts(subreddit_names, sort_method, limit):
+    results = await asyncio.gather(*[
+        fetch_subreddit_posts_safe(subreddit_name, sort_method, limit) for subreddit_name in subreddit_names
+    ])
+    return [post for posts in results for post in posts]
 
 
 SUBREDDITS = ['UPSC','SideProject', 'datascience','explainlikeimfive','Krishnamurti','ycombinator','OpenAI','programming','AskReddit', 'worldnews', 'politics']
 
 @app.route('/get_posts', methods=['POST'])
-def get_posts():
+async def get_posts():
+    if not REDDIT_ENABLED:
+        return "Reddit is turned off", 404
     data = request.json
-    selected_subreddits = data.get('subreddits', [])
-    sort_method = data.get('sort', 'hot') 
+    selected_subreddits = list(dict.fromkeys(data.get('subreddits', [])))
+    sort_method = data.get('sort', 'hot')
+    if sort_method not in REDDIT_SORTS:
+        sort_method = 'hot'
     limit = int(data.get('limit', 10))
 
-    all_posts = []
-    for subreddit_name in selected_subreddits:
-        try:
-            subreddit = reddit.subreddit(subreddit_name)
-            if sort_method == 'top':
-                posts_iterable = subreddit.top(limit=limit)
-            elif sort_method == 'new':
-                posts_iterable = subreddit.new(limit=limit)
-            else:
-                posts_iterable = subreddit.hot(limit=limit)
-
-            for post in posts_iterable:
-                all_posts.append({
-                    'subreddit': subreddit_name,
-                    'title': post.title,
-                    'url': post.url,
-                    'author': post.author.name if post.author else '[deleted]',
-                    'score': post.score,
-                    'num_comments': post.num_comments,
-                    'created_utc': post.created_utc,
-                    'selftext': post.selftext[:300] + '...' if len(post.selftext) > 300 else post.selftext,
-                    'link': f"https://reddit.com{post.permalink}",
-                    'flair': post.link_flair_text if post.link_flair_text else 'No flair',
-                    'nsfw': post.over_18,
-                    'spoiler': post.spoiler
-                })
-        except Exception as e:
-            print(f"Error fetching posts from subreddit {subreddit_name}: {e}")
+    if data.get('stream'):
+        # One NDJSON line per subreddit, in the order they finish, so the
+        # page can render the fast ones while the slow ones are in flight.
+        futures = {
+            submit_to_scraper_loop(fetch_subreddit_posts_safe(subreddit_name, sort_method, limit)): subreddit_name
+            for subreddit_name in selected_subreddits
+        }
+
+        def generate():
+            for future in concurrent.futures.as_completed(futures):
+                yield json.dumps({'subreddit': futures[future], 'posts': future.result()}) + "\n"
 
+        return Response(generate(), mimetype='application/x-ndjson')
+
+    all_posts = await run_on_scraper_loop(fetch_subreddits_posts(selected_subreddits, sort_method, limit))
     return jsonify(all_posts)
 
 def filter_videos_by_date(videos, days=5):
@@ -136,104 +755,80 @@ def filter_videos_by_date(videos, days=5):
             continue
     return recent_videos
 
-def load_watched_videos():
-    if os.path.exists(WATCHED_VIDEOS_FILE):
-        with open(WATCHED_VIDEOS_FILE, 'r') as file:
-            return {line.strip() for line in file}
-    return set()
-
-def save_watched_videos(video_ids):
+def save_watched_videos(video_ids, user_id=None):
     try:
-        with open(WATCHED_VIDEOS_FILE, 'a') as file:
-            for video_id in video_ids:
-                file.write(f"{video_id}\n")
-    except IOError as e:
+        if user_id is not None:
+            user_store.mark_watched(user_id, video_ids)
+        else:
+            watched_video_log.add(video_ids)
+    except (IOError, sqlite3.Error) as e:
         print(f"Error saving watched videos: {e}")
 
 
-def filter_unseen_videos(videos):
+def watched_video_ids(video_ids, user_id=None):
+    if user_id is not None:
+        return user_store.watched_videos(user_id, video_ids)
+    watched_video_log.refresh()
+    return {video_id for video_id in video_ids if video_id in watched_video_log}
+
+
+def filter_unseen_videos(videos, user_id=None):
     if not videos: return []
-    watched_videos = load_watched_videos()
-    return [video for video in videos if video['videoId'] not in watched_videos]
+    watched = watched_video_ids([video['videoId'] for video in videos], user_id)
+    return [video for video in videos if video['videoId'] not in watched]
+
+def load_playlist_ids():
+    if not os.path.exists(PLAYLISTS_FILE):
+        return []
+    with open(PLAYLISTS_FILE, 'r') as file:
+        return list(dict.fromkeys(line.strip() for line in file if line.strip()))
+
 
-async def load_playlists(session):
+async def load_playlists(playlist_ids):
     playlists_data = []
-    if os.path.exists(PLAYLISTS_FILE):
+    if playlist_ids:
         try:
-            with open(PLAYLISTS_FILE, 'r') as file:
-                playlist_ids = [line.strip() for line in file]
+            batches = [playlist_ids[i:i + YOUTUBE_BATCH_SIZE] for i in range(0, len(playlist_ids), YOUTUBE_BATCH_SIZE)]
+            batch_results = await asyncio.gather(*[fetch_playlist_titles(batch) for batch in batches], return_exceptions=True)
             
-            tasks = [fetch_playlist_title(session, playlist_id) for playlist_id in playlist_ids]
-            playlist_details_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for detail in playlist_details_results:
-                if isinstance(detail, Exception):
-                    print(f"Error fetching a playlist detail: {detail}")
-                elif detail:
-                    playlists_data.append(detail)
+            details_by_id = {}
+            for batch_result in batch_results:
+                if isinstance(batch_result, Exception):
+                    print(f"Error fetching a batch of playlist details: {batch_result}")
+                    continue
+                for detail in batch_result:
+                    details_by_id[detail['id']] = detail
+            playlists_data = [details_by_id[playlist_id] for playlist_id in playlist_ids if playlist_id in details_by_id]
         except Exception as e:
-            print(f"Error loading playlists from file or fetching details: {e}")
+            print(f"Error fetching playlist details: {e}")
     return playlists_data
 
 
-def add_playlist(playlist_id):
+def add_playlist(playlist_id, user_id=None):
+    if user_id is not None:
+        user_store.add_playlist(user_id, playlist_id)
+        return
     try:
         with open(PLAYLISTS_FILE, 'a') as file:
             file.write(f"{playlist_id}\n")
     except IOError as e:
         print(f"Error adding playlist to file: {e}")
 
-async def scrape_air_content(url, title_filter):
-    episodes = []
+@single_flight
+async def fetch_air_rows(url):
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch data from {url}: {response.status}")
-                    return []
-                content = await response.text()
-                soup = BeautifulSoup(content, "html.parser")
-                
-                table = soup.find('table', class_='table')
-                if not table:
-                    print(f"Table not found on {url}")
-                    return []
-                
-                rows = table.find_all('tr')[1:] 
-                for row in rows:
-                    cols = row.find_all('td')
-                    if len(cols) < 4:
-                        continue
-                    
-                    title = cols[0].text.strip()
-                    date_str = cols[1].text.strip()
-                    time_str = cols[2].text.strip()
-                    
-                    audio_tag = cols[3].find('audio')
-                    audio_src = None
-                    if audio_tag:
-                        source_tag = audio_tag.find('source')
-                        if source_tag and 'src' in source_tag.attrs:
-                            audio_src = source_tag['src']
-
-                    if not audio_src:
-                        continue
-
-                    try:
-                        date_obj = datetime.strptime(f"{date_str} {time_str}", '%d %b %Y %H:%M')
-                    except ValueError:
-                        print(f"Could not parse date for AIR episode: {date_str} {time_str}")
-                        continue
-                    
-                    if title in title_filter:
-                        episodes.append({
-                            'title': title,
-                            'date': date_obj,
-                            'audio_link': audio_src
-                        })
+        result = await fetch_text(url)
+        if result.status != 200:
+            print(f"Failed to fetch data from {url}: {result.status}")
+            return []
+        return await cached_parse(result, parse_air_rows, url)
     except Exception as e:
-        print(f"Error scraping AIR content from {url} for titles {title_filter}: {e}")
-    return episodes
+        print(f"Error scraping AIR content from {url}: {e}")
+    return []
+
+async def scrape_air_content(url, title_filter):
+    rows = await fetch_air_rows(url)
+    return [row for row in rows if row['title'] in title_filter]
 
 async def scrape_air_spotlight():
     return await scrape_air_content("https://www.newsonair.gov.in/listen-broadcast-category/daily-broadcast/", ["Spotlight"])
@@ -253,111 +848,204 @@ def filter_recent_episodes(episodes, days=3):
     return [episode for episode in episodes if episode['date'] >= cutoff_date]
 
 
-def load_listened_episodes():
-    if os.path.exists(LISTENED_EPISODES_FILE):
-        with open(LISTENED_EPISODES_FILE, 'r') as file:
-            return {line.strip() for line in file}
-    return set()
-
-def save_listened_episodes(episode_links):
+def save_listened_episodes(episode_links, user_id=None):
     try:
-        with open(LISTENED_EPISODES_FILE, 'a') as file:
-            for link in episode_links:
-                file.write(f"{link}\n")
-    except IOError as e:
+        if user_id is not None:
+            user_store.mark_listened(user_id, episode_links)
+        else:
+            listened_episode_log.add(episode_links)
+    except (IOError, sqlite3.Error) as e:
         print(f"Error saving listened episodes: {e}")
 
 
-def filter_unheard_episodes(episodes):
+def listened_episode_links(episode_links, user_id=None):
+    if user_id is not None:
+        return user_store.listened_episodes(user_id, episode_links)
+    listened_episode_log.refresh()
+    return {link for link in episode_links if link in listened_episode_log}
+
+
+def filter_unheard_episodes(episodes, user_id=None):
     if not episodes: return []
-    listened_episodes = load_listened_episodes()
-    return [episode for episode in episodes if episode.get('audio_link') not in listened_episodes]
+    listened = listened_episode_links([episode.get('audio_link') for episode in episodes], user_id)
+    return [episode for episode in episodes if episode.get('audio_link') not in listened]
+
+
+PIB_BACKGROUNDERS_URL = "https://www.pib.gov.in/ViewBackgrounder.aspx?MenuId=51&reg=3&lang=1"
+PIB_BACKGROUNDERS_FALLBACK_URL = "https://www.pib.gov.in/ViewBackgrounder.aspx?MenuId=51"
+PIB_FACTS_URL = "https://www.pib.gov.in/AllFactsheet.aspx?MenuId=12&reg=3&lang=1"
+# The fallback page lists the same backgrounders, so it is archived with them.
+PIB_ARCHIVE_SOURCES = {
+    PIB_BACKGROUNDERS_URL: 'pib_backgrounders',
+    PIB_BACKGROUNDERS_FALLBACK_URL: 'pib_backgrounders',
+    PIB_FACTS_URL: 'pib_facts',
+}
 
+def pib_request_headers(url):
+    return {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Content-Type': 'application/x-www-form-urlencoded',
+        'Origin': 'https://www.pib.gov.in',
+        'Referer': url
+    }
 
+async def pib_form_state(url, refresh=False):
+    # The hidden ASP.NET fields (__VIEWSTATE and friends) are the same for
+    # every query, so one GET serves all filter combinations until they
+    # expire. Returns the fields and whether they were just fetched.
+    cache_key = f"pib/form/{url}"
+    form_data = None if refresh else cache.get(cache_key)
+    if form_data is not None:
+        return dict(form_data), False
+    result = await fetch_text(url, headers=pib_request_headers(url), ssl=False, timeout=PIB_TIMEOUT)
+    if result.status != 200:
+        return None, True
+    form_data = await cached_parse(result, parse_pib_form)
+    cache.set(cache_key, form_data, timeout=PIB_FORM_STATE_TIMEOUT)
+    return dict(form_data), True
+
+def pib_filter_values(ministry=None, year=None, month=None, day=None):
+    ministry_val = ministry if ministry and ministry != '0' else '0'
+    year_val = year if year else '2024'
+    month_val = month if month else '0'
+    day_val = day if day else '0'
+    return ministry_val, year_val, month_val, day_val
+
+def is_past_period(year, month=0):
+    now = datetime.now()
+    return year < now.year or (month and year == now.year and month < now.month)
+
+def pib_document_date(document):
+    for date_format in ("%d %b %Y", "%d %B %Y", "%d-%m-%Y"):
+        try:
+            date = datetime.strptime(document.get('date', '').title(), date_format)
+            return date.year, date.month, date.day
+        except ValueError:
+            continue
+    return None
+
+def archive_pib_results(source, results, ministry_val, year_val, month_val, day_val):
+    if not (year_val.isdigit() and month_val.isdigit()):
+        return
+    year, month = int(year_val), int(month_val)
+    if results:
+        document_archive.add(
+            source, results, year=year, month=month, category=ministry_val,
+            dates=[pib_document_date(document) for document in results]
+        )
+        index_search_documents(source, results)
+    # Only whole past months count as archived, including ones without a
+    # release; a year is covered once its twelve months are, in case PIB
+    # trims a year-long listing.
+    if month != 0 and day_val == '0' and is_past_period(year, month):
+        document_archive.mark_covered(source, year, month, ministry_val)
+
+def archived_pib_results(source, ministry=None, year=None, month=None, day=None):
+    ministry_val, year_val, month_val, day_val = pib_filter_values(ministry, year, month, day)
+    if not (year_val.isdigit() and month_val.isdigit() and day_val.isdigit()):
+        return None
+    year, month = int(year_val), int(month_val)
+    if not is_past_period(year, month):
+        return None
+    if not document_archive.covered(source, year, month, ministry_val):
+        document_archive.want(source, ministry_val)
+        return None
+    return document_archive.query(source, year, month, int(day_val), ministry_val)
+
+async def post_pib_query(url, form_data):
+    session = await get_http_session()
+    await wait_for_host(url)
+    async with session.post(url, data=form_data, headers=pib_request_headers(url), ssl=False, timeout=PIB_TIMEOUT) as post_response:
+        await host_limiter.record_response(url, post_response.status, post_response.headers.get('Retry-After'))
+        if post_response.status != 200:
+            return None
+        post_content = await post_response.text()
+    return await parse_html(parse_pib_results, post_content)
+
+@single_flight
 async def scrape_pib_asp_net(url, ministry=None, year=None, month=None, day=None):
-    results = []
+    ministry_val, year_val, month_val, day_val = pib_filter_values(ministry, year, month, day)
+    cache_key = f"pib/results/{url}/{ministry_val}/{year_val}/{month_val}/{day_val}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'Origin': 'https://www.pib.gov.in',
-            'Referer': url
+        overrides = {
+            '__EVENTTARGET': 'ctl00$ContentPlaceHolder1$ddlYear',
+            '__EVENTARGUMENT': '',
+            'ctl00$ContentPlaceHolder1$ddlMinistry': ministry_val,
+            'ctl00$ContentPlaceHolder1$ddlYear': year_val,
+            'ctl00$ContentPlaceHolder1$ddlMonth': month_val,
+            'ctl00$ContentPlaceHolder1$ddlday': day_val,
+            'ctl00$ContentPlaceHolder1$ddlSector': '0', 
         }
-
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url, ssl=False, timeout=30) as response:
-                if response.status != 200:
-                    return []
-                html = await response.text()
-                soup = BeautifulSoup(html, "html.parser")
-
-            form_data = {}
-            for input_tag in soup.find_all('input'):
-                if input_tag.get('name'):
-                    form_data[input_tag.get('name')] = input_tag.get('value', '')
-
-            ministry_val = ministry if ministry and ministry != '0' else '0'
-            year_val = year if year else '2024'
-            month_val = month if month else '0'
-            day_val = day if day else '0'
-            overrides = {
-                '__EVENTTARGET': 'ctl00$ContentPlaceHolder1$ddlYear',
-                '__EVENTARGUMENT': '',
-                'ctl00$ContentPlaceHolder1$ddlMinistry': ministry_val,
-                'ctl00$ContentPlaceHolder1$ddlYear': year_val,
-                'ctl00$ContentPlaceHolder1$ddlMonth': month_val,
-                'ctl00$ContentPlaceHolder1$ddlday': day_val,
-                'ctl00$ContentPlaceHolder1$ddlSector': '0', 
-            }
-            form_data.update(overrides)
-
-            async with session.post(url, data=form_data, ssl=False, timeout=30) as post_response:
-                if post_response.status != 200:
-                    return []
-                post_content = await post_response.text()
-                post_soup = BeautifulSoup(post_content, "html.parser")
-
-                content_area = post_soup.find('div', class_='content-area')
-                if content_area:
-                    for li in content_area.find_all('li'):
-                        link_tag = li.find('a')
-                        date_span = li.find('span', class_='publishdatesmall')
-                        
-                        if link_tag and date_span:
-                            href = link_tag.get('href', '')
-                            if href and not href.startswith('http'):
-                                if href.startswith('/'):
-                                    href = f"https://www.pib.gov.in{href}"
-                                else:
-                                    href = f"https://www.pib.gov.in/{href}"
-
-                            results.append({
-                                'title': link_tag.text.strip(),
-                                'url': href,
-                                'date': date_span.text.replace('Posted on:', '').strip()
-                            })
+        form_data, fresh = await pib_form_state(url)
+        if form_data is None:
+            return []
+        results = await post_pib_query(url, {**form_data, **overrides})
+        if not results and not fresh:
+            # The server may have stopped accepting the stored ViewState;
+            # try once more with a freshly fetched one.
+            form_data, fresh = await pib_form_state(url, refresh=True)
+            if form_data is None:
+                return []
+            results = await post_pib_query(url, {**form_data, **overrides})
+        # None is a failed request or a page without a listing; an empty
+        # listing is an answer too, and archived as such.
+        if results is None:
+            return []
+        if results:
+            cache.set(cache_key, results, timeout=PIB_RESULTS_TIMEOUT)
+        if url in PIB_ARCHIVE_SOURCES:
+            await asyncio.to_thread(archive_pib_results, PIB_ARCHIVE_SOURCES[url], results,
+                                    ministry_val, year_val, month_val, day_val)
+        return results
 
     except Exception as e:
         print(f"PIB scraping error: {e}")
     
-    return results
+    return []
+
+async def first_non_empty(candidates, hedge_delay):
+    # Candidates are in order of preference. Each one starts when the one
+    # before it has come back empty or has been running for hedge_delay, so
+    # a quick primary costs a single request and a slow one overlaps with
+    # its fallback.
+    tasks = []
+    try:
+        for candidate in candidates:
+            tasks.append(asyncio.ensure_future(candidate()))
+            await asyncio.wait([tasks[-1]], timeout=hedge_delay)
+            for task in tasks:
+                if not task.done():
+                    break
+                if task.result():
+                    return task.result()
+        for task in tasks:
+            result = await task
+            if result:
+                return result
+        return []
+    finally:
+        for task in tasks:
+            task.cancel()
 
 async def scrape_pib(ministry=None, year=None, month=None, day=None):
-    url = "https://www.pib.gov.in/ViewBackgrounder.aspx?MenuId=51&reg=3&lang=1"
-    data = await scrape_pib_asp_net(url, ministry, year, month, day)
-    if data ==[]:
-        url1 = "https://www.pib.gov.in/ViewBackgrounder.aspx?MenuId=51"
-        data = await scrape_pib_asp_net(url1, ministry, year, month, day)
+    data = archived_pib_results('pib_backgrounders', ministry, year, month, day)
+    if data is None:
+        data = await first_non_empty([
+            functools.partial(scrape_pib_asp_net, PIB_BACKGROUNDERS_URL, ministry, year, month, day),
+            functools.partial(scrape_pib_asp_net, PIB_BACKGROUNDERS_FALLBACK_URL, ministry, year, month, day)
+        ], PIB_HEDGE_DELAY)
     return {'Backgrounders': data}
 
 async def scrape_pib_facts(ministry=None, year=None, month=None, day=None):
-    url = "https://www.pib.gov.in/AllFactsheet.aspx?MenuId=12&reg=3&lang=1"
-    data = await scrape_pib_asp_net(url, ministry, year, month, day)
-    if data ==[]:
-        url1 = "https://www.pib.gov.in/ViewBackgrounder.aspx?MenuId=51"
-        data = await scrape_pib_asp_net(url1, ministry, year, month, day)
-
+    data = archived_pib_results('pib_facts', ministry, year, month, day)
+    if data is None:
+        data = await first_non_empty([
+            functools.partial(scrape_pib_asp_net, PIB_FACTS_URL, ministry, year, month, day),
+            functools.partial(scrape_pib_asp_net, PIB_BACKGROUNDERS_FALLBACK_URL, ministry, year, month, day)
+        ], PIB_HEDGE_DELAY)
     return {'Backgrounders': data}
 
 
@@ -365,115 +1053,740 @@ async def scrape_pib_facts(ministry=None, year=None, month=None, day=None):
 TH_url = "https://learningcorner.epaper.thehindu.com/articles" 
 
 
-@app.route('/')
-@cache.cached(timeout=300)
-async def index():
-    playlist_data = []
-    spotlight_episodes, insight_episodes, economy_episodes, current_episodes_air = [], [], [], []
-    indian_express_articles_data, orf_articles_data, sansad_tv_summaries_data = [], [], []
-    pib_backgrounders_result, pib_facts_result, forum_ca_result = {}, {}, []
-    headers = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+# Seconds between background refreshes of each dashboard source.
+REFRESH_INTERVALS = {
+    'playlists': 600,
+    'air_spotlight': 900,
+    'air_insight': 1800,
+    'air_economy': 1800,
+    'air_current_affairs': 1800,
+    'indian_express': 900,
+    'orf': 3600,
+    'sansad_tv': 3600,
+    'pib_backgrounders': 1800,
+    'pib_facts': 1800,
+    'forumias': 900,
+    'insights': 1800,
+    'mea': 3600,
+    'prs': 3600,
+    'prs_bills': 3600,
+    'iasgyan': 1800,
+}
+# How long the very first request waits for the initial refresh round.
+COLD_START_WAIT = 25
+# How often a worker that lost the refresh lease for a source looks for the
+# winner's result in the shared cache.
+SNAPSHOT_POLL_INTERVAL = int(os.environ.get('SNAPSHOT_POLL_INTERVAL', 15))
+# Time budget for one refresh of a source, in seconds, and per-source
+# overrides for the ones that legitimately take longer.
+SOURCE_DEADLINE = int(os.environ.get('SOURCE_DEADLINE', 45))
+SOURCE_DEADLINES = {
+    'playlists': 90,
+    'mea': 120,
 }
+# Consecutive failures after which a source's circuit breaker opens. The
+# first backoff is twice the source's refresh interval, so the next scheduled
+# refresh is skipped, doubling up to the maximum.
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', 3))
+BREAKER_MAX_BACKOFF = int(os.environ.get('BREAKER_MAX_BACKOFF', 6 * 3600))
+# After a listing refresh, the top linked articles are fetched into the
+# article store so clicking through from the dashboard needs no upstream trip.
+ARTICLE_PREFETCH_ENABLED = os.environ.get('ARTICLE_PREFETCH', '1') != '0'
+ARTICLE_PREFETCH_LIMIT = int(os.environ.get('ARTICLE_PREFETCH_LIMIT', 10))
+
+snapshot = {}
+snapshot_lock = threading.Lock()
+snapshot_changed = threading.Condition(snapshot_lock)
+_snapshot_ready = threading.Event()
+_refresh_thread = None
+_refresh_thread_lock = threading.Lock()
+_scraper_loop = None
+_scraper_loop_ready = threading.Event()
+_source_breakers = {}
+_prefetch_tasks = set()
+
+
+async def fetch_playlist_entry(semaphore, playlist_item):
+    async with semaphore:
+        videos = await fetch_videos_from_playlist(playlist_item['id'])
+    return {
+        'id': playlist_item['id'],
+        'title': playlist_item['title'],
+        'channel_title': playlist_item['channel_title'],
+        'videos': filter_videos_by_date(videos, days=5)
+    }
+
 
-    async with aiohttp.ClientSession(headers=headers) as session:
+async def refresh_playlists():
+    playlists = []
+    # One feed per distinct playlist, shared by every user who follows it.
+    playlist_ids = list(dict.fromkeys(load_playlist_ids() + user_store.all_playlist_ids()))
+    loaded_playlists = await load_playlists(playlist_ids)
+    semaphore = asyncio.Semaphore(YOUTUBE_CONCURRENCY)
+    results = await asyncio.gather(*[
+        fetch_playlist_entry(semaphore, playlist_item) for playlist_item in loaded_playlists
+    ], return_exceptions=True)
+    for playlist_item, result in zip(loaded_playlists, results):
+        if isinstance(result, Exception):
+            print(f"Error processing playlist {playlist_item.get('id', 'N/A')}: {result}")
+        else:
+            playlists.append(result)
+    return playlists
+
+
+def dashboard_sources():
+    sources = {
+        'playlists': refresh_playlists,
+        'air_spotlight': scrape_air_spotlight,
+        'air_insight': scrape_air_insight,
+        'air_economy': scrape_air_economy,
+        'air_current_affairs': scrape_current_affairs_air,
+        'indian_express': scrape_indian_express_articles,
+        'orf': scrape_orf_articles,
+        'sansad_tv': scrape_AIR_sansad_tv_summaries_Iasgyan,
+        'pib_backgrounders': scrape_pib,
+        'pib_facts': scrape_pib_facts,
+        'forumias': scrape_forumias_combined,
+        'insights': scrape_insights_articles,
+        'mea': scrape_bilateral_documents,
+        'prs': scrape_prs_india,
+        'prs_bills': refresh_prs_bills,
+        'iasgyan': scrape_current_affairs_iasgyan,
+    }
+    if not YOUTUBE_ENABLED:
+        del sources['playlists']
+    return sources
+
+
+def source_breaker(name):
+    breaker = _source_breakers.get(name)
+    if breaker is None:
+        breaker = _source_breakers.setdefault(name, CircuitBreaker(
+            failure_threshold=BREAKER_FAILURE_THRESHOLD,
+            base_backoff=2 * REFRESH_INTERVALS[name],
+            max_backoff=BREAKER_MAX_BACKOFF
+        ))
+    return breaker
+
+
+def article_prefetchers():
+    return {
+        'indian_express': ('full_article', 'url', scrape_full_article),
+        'insights': ('insights_article', 'link', scrape_full_article_insight),
+    }
+
+
+async def prefetch_article(kind, url, scrape_function):
+    if article_store.has(kind, url):
+        return
+    await scrape_function(url)
+
+
+async def prefetch_articles(name, listing):
+    # Prefetching runs in its own task, so this only lowers its own requests
+    # to the back of each host's queue.
+    fetch_priority.set(PRIORITY_PREFETCH)
+    kind, url_field, scrape_function = article_prefetchers()[name]
+    urls = []
+    for item in listing:
+        url = item.get(url_field)
+        if url and url.startswith('http') and url not in urls:
+            urls.append(url)
+    results = await asyncio.gather(*[
+        prefetch_article(kind, url, scrape_function) for url in urls[:ARTICLE_PREFETCH_LIMIT]
+    ], return_exceptions=True)
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            print(f"Error prefetching article {url}: {result}")
+
+
+async def backfill_archive():
+    # Walks back through past months and years that are not archived yet,
+    # newest first, behind every other request to the same hosts.
+    fetch_priority.set(PRIORITY_PREFETCH)
+    now = datetime.now()
+    for year in range(now.year, ARCHIVE_START_YEAR - 1, -1):
+        for source, url in (('pib_backgrounders', PIB_BACKGROUNDERS_URL), ('pib_facts', PIB_FACTS_URL)):
+            for ministry in dict.fromkeys(['0', *document_archive.wanted(source)]):
+                for month in range(12, 0, -1):
+                    if is_past_period(year, month) and not document_archive.covered(source, year, month, ministry):
+                        await scrape_pib_asp_net(url, ministry, str(year), str(month), None)
+                        await asyncio.sleep(ARCHIVE_BACKFILL_DELAY)
+        if not is_past_period(year):
+            continue
+        for status in dict.fromkeys(['0', *document_archive.wanted('prs_bills')]):
+            if not prs_archive_covers(year, status):
+                await backfill_prs_bills(year, '' if status == '0' else status)
+                await asyncio.sleep(ARCHIVE_BACKFILL_DELAY)
+
+
+async def _backfill_archive_forever():
+    while True:
+        # One worker per host backfills; the archive file is shared.
+        if cache.add('archive-backfill-lease', os.getpid(), timeout=ARCHIVE_BACKFILL_INTERVAL):
+            try:
+                await backfill_archive()
+            except Exception as e:
+                print(f"Error backfilling archive: {e}")
+        await asyncio.sleep(ARCHIVE_BACKFILL_INTERVAL)
+
+
+def topic_sources():
+    # The items of each clustered source, as url/title/summary dicts.
+    return {
+        'indian_express': lambda data: data,
+        'forumias': lambda data: [article for section in data for article in section.get('articles', [])],
+        'orf': lambda data: [
+            {'url': article.get('link'), 'title': article.get('title'), 'summary': article.get('description')}
+            for article in data
+        ],
+        'pib_backgrounders': lambda data: data.get('Backgrounders', []),
+        'iasgyan': lambda data: [article for day in data for article in day.get('articles', [])],
+    }
+
+
+async def index_topics(name, data):
+    items_of = topic_sources().get(name)
+    if items_of is None or not data:
+        return
+    try:
+        await asyncio.to_thread(topic_index.add, name, items_of(data))
+    except Exception as e:
+        print(f"Error clustering topics for {name}: {e}")
+
+
+# A refresh returning under this share of the previous item count, from at
+# least SOURCE_ITEMS_DROP_MIN items, is reported as a likely layout change.
+SOURCE_ITEMS_DROP_RATIO = 0.5
+SOURCE_ITEMS_DROP_MIN = 4
+SEARCH_DATE_FORMATS = ("%Y-%m-%d", "%d %b %Y", "%d %B %Y", "%B %d, %Y", "%d-%m-%Y")
+
+
+def search_date(value):
+    # YYYY-MM-DD from a parsed date or one of the listings' date strings;
+    # None where there is no usable date.
+    if isinstance(value, datetime):
+        return None if value == datetime.min else value.strftime('%Y-%m-%d')
+    text = re.sub(r'\s+', ' ', str(value or '')).strip().title()
+    for date_format in SEARCH_DATE_FORMATS:
         try:
-            loaded_playlists = await load_playlists(session) 
-            for playlist_item in loaded_playlists: 
-                try:
-                    videos = await fetch_videos_from_playlist(session, playlist_item['id'])
-                    recent_videos = filter_videos_by_date(videos, days=5)
-                    unseen_videos = filter_unseen_videos(recent_videos)
-                    playlist_data.append({
-                        'id': playlist_item['id'],
-                        'title': playlist_item['title'],
-                        'unseen_count': len(unseen_videos),
-                        'channel': playlist_item['channel_title']
-                    })
-                except Exception as e:
-                    print(f"Error processing playlist {playlist_item.get('id', 'N/A')}: {e}")
-            playlist_data.sort(key=lambda x: x['unseen_count'], reverse=True)
+            return datetime.strptime(text, date_format).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
+
+
+def search_document(item):
+    url = next((item[field] for field in ('url', 'link', 'link_url', 'audio_link') if item.get(field)), None)
+    return {
+        'url': url if url != '#' else None,
+        'title': item.get('title'),
+        'summary': item.get('summary') or item.get('description') or ' '.join(item.get('points') or []) or item.get('status'),
+        'date': search_date(item.get('date_obj') or item.get('date')),
+    }
+
+
+def search_sources():
+    # The items of each searchable source; the rest are lists of items already.
+    flat = lambda data: data
+    return {
+        'air_spotlight': flat,
+        'air_insight': flat,
+        'air_economy': flat,
+        'air_current_affairs': flat,
+        'indian_express': flat,
+        'orf': flat,
+        'sansad_tv': flat,
+        'pib_backgrounders': lambda data: data.get('Backgrounders', []),
+        'pib_facts': lambda data: data.get('Backgrounders', []),
+        'forumias': lambda data: [article for section in data for article in section.get('articles', [])],
+        'insights': flat,
+        'mea': flat,
+        'prs': flat,
+        'prs_bills': flat,
+        'iasgyan': lambda data: [dict(article, date=day['date']) for day in data for article in day.get('articles', [])],
+    }
+
+
+def index_search_documents(source, items):
+    try:
+        search_index.add(source, [search_document(item) for item in items])
+    except Exception as e:
+        print(f"Error indexing {source} for search: {e}")
+
+
+async def index_search(name, data):
+    items_of = search_sources().get(name)
+    if items_of is None or not data:
+        return
+    await asyncio.to_thread(index_search_documents, name, items_of(data))
+
+
+def source_item_count(name, data):
+    items_of = search_sources().get(name)
+    if data and items_of is not None:
+        return len(items_of(data))
+    return len(data) if data else 0
+
+
+def record_source_refresh(name, data, previous_data, seconds):
+    items = source_item_count(name, data)
+    previous_items = source_item_count(name, previous_data)
+    source_refresh_seconds.observe(seconds, source=name, outcome='ok')
+    source_items.set(items, source=name)
+    source_items_refreshed.observe(items, source=name)
+    log_event('refresh', source=name, outcome='ok', items=items, previous_items=previous_items,
+              ms=round(seconds * 1000, 1))
+    # Losing most items at once is how a changed page layout usually shows.
+    if previous_items >= SOURCE_ITEMS_DROP_MIN and items < previous_items * SOURCE_ITEMS_DROP_RATIO:
+        print(f"Warning: {name} returned {items} items, down from {previous_items}")
+
+
+def article_text(article):
+    # Plain text of a parsed article: the HTML of an Indian Express article or
+    # the blocks of an Insights or TH Learning Corner one.
+    if isinstance(article, str):
+        return make_soup(article).get_text(' ', strip=True)
+    parts = []
+    for block in article or []:
+        parts.append(block.get('text') or '')
+        parts.extend(block.get('items') or [])
+        parts.extend(' '.join(row) for row in block.get('rows') or [])
+    return '\n'.join(part for part in parts if part)
+
+
+def article_title(article):
+    if isinstance(article, str):
+        heading = make_soup(article, SoupStrainer('h1')).find('h1')
+        return heading.get_text(strip=True) if heading else None
+    return next((block['text'] for block in article or [] if block.get('type') in ('h1', 'h2') and block.get('text')), None)
+
+
+def index_article_body(source, url, article):
+    # Only articles a listing has indexed: /article/<url> reads any URL it is
+    # given, which must not put pages of the caller's choosing into search.
+    try:
+        search_index.add(source, [{'url': url, 'title': article_title(article), 'body': article_text(article)}],
+                         listed_only=True)
+    except Exception as e:
+        print(f"Error indexing article {url} for search: {e}")
+
+
+def schedule_article_prefetch(name, listing):
+    if not ARTICLE_PREFETCH_ENABLED or name not in article_prefetchers() or not listing:
+        return
+    task = asyncio.create_task(prefetch_articles(name, listing))
+    _prefetch_tasks.add(task)
+    task.add_done_callback(_prefetch_tasks.discard)
+
+
+def _update_snapshot_ready():
+    # Called with snapshot_lock held. The index is only rendered whole, and
+    # cached, once every source has data to show.
+    if all(snapshot.get(name, {}).get('data') for name in dashboard_sources()):
+        _snapshot_ready.set()
+
+
+def load_persisted_snapshot(name):
+    persisted = cache.get(f"snapshot/{name}")
+    if persisted:
+        with snapshot_lock:
+            entry = snapshot.setdefault(name, {'data': None, 'refreshed_at': None, 'refreshing': False, 'last_error': None})
+            if entry['refreshed_at'] is None or persisted['refreshed_at'] > entry['refreshed_at']:
+                entry.update(persisted)
+                _update_snapshot_ready()
+                snapshot_changed.notify_all()
+    return persisted
+
+
+async def follow_persisted_snapshot(name, interval):
+    # Another worker holds the lease for this interval: poll the shared cache
+    # so its result shows up here as soon as it lands, then wait out the rest.
+    deadline = time.monotonic() + interval
+    with snapshot_lock:
+        known = snapshot.get(name, {}).get('refreshed_at')
+    while (remaining := deadline - time.monotonic()) > 0:
+        await asyncio.sleep(min(SNAPSHOT_POLL_INTERVAL, remaining))
+        persisted = await asyncio.to_thread(load_persisted_snapshot, name)
+        if persisted and persisted['refreshed_at'] != known:
+            await asyncio.sleep(max(deadline - time.monotonic(), 0))
+            return
+
+
+async def refresh_source(name, scrape_function):
+    # The lease makes one worker per host refresh each source per interval;
+    # the others pick up its result from the shared cache.
+    if not cache.add(f"refresh-lease/{name}", os.getpid(), timeout=REFRESH_INTERVALS[name]):
+        load_persisted_snapshot(name)
+        return False
+    # A source that keeps failing is left alone for a growing backoff; the
+    # dashboard keeps showing its last good data meanwhile.
+    breaker = source_breaker(name)
+    if not breaker.allow():
+        return True
+    deadline = SOURCE_DEADLINES.get(name, SOURCE_DEADLINE)
+    with snapshot_lock:
+        entry = snapshot.setdefault(name, {'data': None, 'refreshed_at': None, 'refreshing': False, 'last_error': None})
+        entry['refreshing'] = True
+        previous_data = entry['data']
+    metrics_source.set(name)
+    started = time.perf_counter()
+    try:
+        data = await asyncio.wait_for(scrape_function(), timeout=deadline)
+        # Scrapers swallow their own errors and return nothing, so an empty
+        # result counts as a failure and is never persisted.
+        if not data:
+            raise ValueError("returned no data")
+    except Exception as e:
+        if isinstance(e, asyncio.TimeoutError):
+            e = f"no result within {deadline}s"
+        print(f"Error refreshing dashboard source {name}: {e}")
+        seconds = time.perf_counter() - started
+        source_refresh_seconds.observe(seconds, source=name, outcome='error')
+        log_event('refresh', source=name, outcome='error', error=str(e), ms=round(seconds * 1000, 1))
+        breaker.record_failure(e)
+        with snapshot_lock:
+            entry['refreshing'] = False
+            entry['last_error'] = str(e)
+            snapshot_changed.notify_all()
+        return True
+    breaker.record_success()
+    record_source_refresh(name, data, previous_data, time.perf_counter() - started)
+    # Clustered and indexed before the snapshot changes, so a topics section
+    # or search rendered on the change already includes this source.
+    await index_topics(name, data)
+    await index_search(name, data)
+    with snapshot_lock:
+        entry['data'] = data
+        entry['refreshed_at'] = datetime.now(timezone.utc)
+        entry['refreshing'] = False
+        entry['last_error'] = None
+        _update_snapshot_ready()
+        snapshot_changed.notify_all()
+    cache.set(f"snapshot/{name}", {'data': data, 'refreshed_at': entry['refreshed_at'], 'last_error': None}, timeout=0)
+    schedule_article_prefetch(name, data)
+    return True
+
+
+async def _refresh_source_forever(name, scrape_function, interval, delay):
+    await asyncio.sleep(delay)
+    while True:
+        if await refresh_source(name, scrape_function):
+            await asyncio.sleep(interval)
+        else:
+            await follow_persisted_snapshot(name, interval)
+
+
+async def _run_refresh_tasks():
+    sources = dashboard_sources()
+    first_round = []
+    delays = {}
+    for name, scrape_function in sources.items():
+        interval = REFRESH_INTERVALS[name]
+        persisted = load_persisted_snapshot(name)
+        age = (datetime.now(timezone.utc) - persisted['refreshed_at']).total_seconds() if persisted else None
+        if age is not None and age < interval:
+            delays[name] = interval - age
+        else:
+            first_round.append(refresh_source(name, scrape_function))
+            delays[name] = interval
+    await asyncio.gather(*first_round, return_exceptions=True)
+    background = [
+        _refresh_source_forever(name, scrape_function, REFRESH_INTERVALS[name], delays[name])
+        for name, scrape_function in sources.items()
+    ]
+    if ARCHIVE_BACKFILL_ENABLED:
+        background.append(_backfill_archive_forever())
+    await asyncio.gather(*background)
+
+
+def _run_refresh_loop():
+    global _scraper_loop
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    _scraper_loop = loop
+    loop.create_task(_run_refresh_tasks())
+    _scraper_loop_ready.set()
+    try:
+        loop.run_forever()
+    except Exception as e:
+        print(f"Background refresh loop stopped: {e}")
+    finally:
+        loop.close()
+
+
+async def _shutdown_scraper_loop():
+    current = asyncio.current_task()
+    pending = [task for task in asyncio.all_tasks() if task is not current]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    await close_http_session()
+    shutdown_parse_pool()
+    asyncio.get_running_loop().stop()
+
+
+def start_background_refresh():
+    global _refresh_thread
+    with _refresh_thread_lock:
+        if _refresh_thread is None:
+            _refresh_thread = threading.Thread(target=_run_refresh_loop, name='dashboard-refresh', daemon=True)
+            _refresh_thread.start()
+    _scraper_loop_ready.wait()
+
+
+def stop_background_refresh():
+    global _refresh_thread
+    with _refresh_thread_lock:
+        if _refresh_thread is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(_shutdown_scraper_loop(), _scraper_loop)
+            _refresh_thread.join(timeout=10)
         except Exception as e:
-            print(f"Error loading or processing playlists: {e}")
-
-        tasks_to_run = [
-            scrape_air_spotlight(),
-            scrape_air_insight(),
-            scrape_air_economy(),
-            scrape_current_affairs_air(),
-            scrape_indian_express_articles(),
-            scrape_orf_articles(),
-            scrape_AIR_sansad_tv_summaries_Iasgyan(),
-            scrape_pib(), 
-            scrape_pib_facts(),
-            scrape_forumias(),
-            scrape_insights_articles() 
-        ]
-        forum_ca = await scrape_forumias_combined()
-        results = await asyncio.gather(*tasks_to_run, return_exceptions=True)
+            print(f"Error stopping background refresh: {e}")
+        _refresh_thread = None
+        _scraper_loop_ready.clear()
+
+
+atexit.register(stop_background_refresh)
+
+
+async def with_fetch_priority(coro, priority, source=None):
+    fetch_priority.set(priority)
+    if source:
+        metrics_source.set(source)
+    return await coro
+
+
+def submit_to_scraper_loop(coro, priority=PRIORITY_USER):
+    # Work handed over from a route is for a user who is waiting on it, and
+    # is measured under that route.
+    start_background_refresh()
+    source = f"route:{request.endpoint}" if has_request_context() else None
+    return asyncio.run_coroutine_threadsafe(with_fetch_priority(coro, priority, source), _scraper_loop)
+
+
+async def run_on_scraper_loop(coro):
+    return await asyncio.wrap_future(submit_to_scraper_loop(coro))
 
-        if not isinstance(results[0], Exception): spotlight_episodes = results[0]
-        else: print(f"Error scraping AIR Spotlight: {results[0]}")
 
-        if not isinstance(results[1], Exception): insight_episodes = results[1]
-        else: print(f"Error scraping AIR Insight: {results[1]}")
+@app.before_request
+def ensure_background_refresh():
+    start_background_refresh()
 
-        if not isinstance(results[2], Exception): economy_episodes = results[2]
-        else: print(f"Error scraping AIR Economy: {results[2]}")
 
-        if not isinstance(results[3], Exception): current_episodes_air = results[3]
-        else: print(f"Error scraping AIR Current Affairs: {results[3]}")
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
 
-        if not isinstance(results[4], Exception): indian_express_articles_data = results[4]
-        else: print(f"Error scraping Indian Express: {results[4]}")
 
-        if not isinstance(results[5], Exception): orf_articles_data = results[5]
-        else: print(f"Error scraping ORF articles: {results[5]}")
+@app.after_request
+def record_request_time(response):
+    # A streamed page is timed to its first chunk; the rest is still on its way.
+    started = g.pop('request_started', None)
+    if started is not None:
+        seconds = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        request_seconds.observe(seconds, route=route, method=request.method, status=response.status_code)
+        log_event('request', route=route, method=request.method, status=response.status_code,
+                  ms=round(seconds * 1000, 1))
+    return response
 
-        if not isinstance(results[6], Exception): sansad_tv_summaries_data = results[6]
-        else: print(f"Error scraping Sansad TV Summaries (IASGyan): {results[6]}")
-        
-        if not isinstance(results[7], Exception): pib_backgrounders_result = results[7]
-        else: print(f"Error scraping PIB Backgrounders: {results[7]}")
 
-        if not isinstance(results[8], Exception): pib_facts_result = results[8]
-        else: print(f"Error scraping PIB Facts: {results[8]}")
-        
-        if not isinstance(results[9], Exception): forum_ca_result = results[9]
-        else: print(f"Error scraping ForumIAS CA: {results[9]}")
-        if not isinstance(results[9], Exception): insights_articles_result  = results[10]
-        else: print(f"Error scraping ForumIAS CA: {results[10]}")
+def snapshot_data(name, default):
+    with snapshot_lock:
+        entry = snapshot.get(name)
+        if entry is None or entry['data'] is None:
+            return default
+        return entry['data']
+
+
+def current_user_id():
+    return session.get('user_id')
+
+
+def index_cache_key():
+    return f"view/index/{session.get('user_id', 'anon')}"
+
+
+def playlists_section_context(user_id):
+    # The feeds are shared; per user we only look up which of their items
+    # have been marked, in one query per kind of item.
+    playlist_ids = user_store.playlist_ids(user_id) if user_id is not None else load_playlist_ids()
+    playlists_by_id = {playlist_item['id']: playlist_item for playlist_item in snapshot_data('playlists', [])}
+    user_playlists = [playlists_by_id[playlist_id] for playlist_id in playlist_ids if playlist_id in playlists_by_id]
+    watched = watched_video_ids([video['videoId'] for playlist_item in user_playlists for video in playlist_item['videos']], user_id)
+
+    playlist_data = []
+    for playlist_item in user_playlists:
+        playlist_data.append({
+            'id': playlist_item['id'],
+            'title': playlist_item['title'],
+            'unseen_count': sum(1 for video in playlist_item['videos'] if video['videoId'] not in watched),
+            'channel': playlist_item['channel_title']
+        })
+    playlist_data.sort(key=lambda x: x['unseen_count'], reverse=True)
+    return {'playlists': playlist_data}
+
+
+def air_section_context(user_id):
+    air_recent = {
+        'spotlight': filter_recent_episodes(snapshot_data('air_spotlight', []), days=5),
+        'insight': filter_recent_episodes(snapshot_data('air_insight', []), days=5),
+        'economy': filter_recent_episodes(snapshot_data('air_economy', []), days=5),
+        'current': filter_recent_episodes(snapshot_data('air_current_affairs', []), days=10),
+    }
+    listened = listened_episode_links([episode.get('audio_link') for episodes in air_recent.values() for episode in episodes], user_id)
+    return {
+        f"{name}_unheard_count": sum(1 for episode in episodes if episode.get('audio_link') not in listened)
+        for name, episodes in air_recent.items()
+    }
+
+
+# Each dashboard section is a partial in templates/sections/, rendered from
+# the snapshot of the listed sources.
+DASHBOARD_SECTIONS = {
+    'playlists': ('playlists',),
+    'air': ('air_spotlight', 'air_insight', 'air_economy', 'air_current_affairs'),
+    'ie_quiz': ('indian_express',),
+    'forumias': ('forumias',),
+    'orf': ('orf',),
+    'indian_express': ('indian_express',),
+    'insights': ('insights',),
+    'sansad_tv': ('sansad_tv',),
+    'topics': tuple(TOPIC_SOURCE_LABELS),
+}
+if not YOUTUBE_ENABLED:
+    del DASHBOARD_SECTIONS['playlists']
+
+
+def dashboard_section_contexts():
+    return {
+        'playlists': playlists_section_context,
+        'air': air_section_context,
+        'ie_quiz': lambda user_id: {'articles': snapshot_data('indian_express', [])},
+        'forumias': lambda user_id: {'forum_ca': snapshot_data('forumias', [])},
+        'orf': lambda user_id: {'orfarticles': snapshot_data('orf', [])},
+        'indian_express': lambda user_id: {'articles': snapshot_data('indian_express', [])},
+        'insights': lambda user_id: {'insightarticles': snapshot_data('insights', [])},
+        'sansad_tv': lambda user_id: {'sansad_tv_summaries': snapshot_data('sansad_tv', [])},
+        'topics': lambda user_id: {
+            'topics': topic_index.clusters(max_age=TOPIC_DISPLAY_MAX_AGE),
+            'topic_source_labels': TOPIC_SOURCE_LABELS
+        },
+    }
+
 
-    spotlight_unheard = filter_unheard_episodes(filter_recent_episodes(spotlight_episodes or [], days=5))
-    insight_unheard = filter_unheard_episodes(filter_recent_episodes(insight_episodes or [], days=5))
-    economy_unheard = filter_unheard_episodes(filter_recent_episodes(economy_episodes or [], days=5))
-    current_unheard_air = filter_unheard_episodes(filter_recent_episodes(current_episodes_air or [], days=10))
+def _sources_settled(sources):
+    # Called with snapshot_lock held. A source that failed counts as settled
+    # so its section renders (empty) instead of waiting out the deadline.
+    for name in sources:
+        entry = snapshot.get(name)
+        if not entry or (entry['refreshed_at'] is None and entry['last_error'] is None):
+            return False
+    return True
+
+
+def stream_dashboard_sections(user_id):
+    section_contexts = dashboard_section_contexts()
+    pending = list(DASHBOARD_SECTIONS)
+    deadline = time.monotonic() + COLD_START_WAIT
+    while pending:
+        with snapshot_changed:
+            ready = [name for name in pending if _sources_settled(DASHBOARD_SECTIONS[name])]
+            remaining = deadline - time.monotonic()
+            if not ready and remaining > 0:
+                snapshot_changed.wait(remaining)
+                continue
+        for name in ready or list(pending):
+            pending.remove(name)
+            html = render_template(f'sections/{name}.html', **section_contexts[name](user_id))
+            yield (Markup(f'<template id="section-source-{name}">') + Markup(html)
+                   + Markup(f'</template><script>fillSection({json.dumps(name)});</script>\n'))
+
+
+def should_stream_index():
+    # Stream on request, and always while some source has no data yet so the
+    # page shell does not wait for the slowest one and no empty page is cached.
+    return request.args.get('stream') == '1' or not _snapshot_ready.is_set()
 
 
+@app.route('/')
+@cache.cached(timeout=ROUTE_CACHE_TIMEOUTS['index'], key_prefix=index_cache_key, unless=should_stream_index)
+async def index():
+    user_id = current_user_id()
+    if should_stream_index():
+        return stream_template('index.html',
+                               streaming=True,
+                               username=session.get('username'),
+                               subreddits=SUBREDDITS,
+                               youtube_enabled=YOUTUBE_ENABLED,
+                               reddit_enabled=REDDIT_ENABLED,
+                               section_fragments=stream_dashboard_sections(user_id))
+
+    context = {}
+    section_contexts = dashboard_section_contexts()
+    for name in DASHBOARD_SECTIONS:
+        context.update(section_contexts[name](user_id))
     return render_template('index.html', 
-                           playlists=playlist_data, 
-                           spotlight_unheard_count=len(spotlight_unheard), 
-                           insight_unheard_count=len(insight_unheard),
-                           economy_unheard_count=len(economy_unheard),
-                           current_unheard_count=len(current_unheard_air), 
-                           sansad_tv_summaries=sansad_tv_summaries_data or [], 
-                           pib_backgrounders=pib_backgrounders_result or {}, 
+                           username=session.get('username'),
+                           pib_backgrounders=snapshot_data('pib_backgrounders', {}), 
                            subreddits=SUBREDDITS,
-                           articles=indian_express_articles_data or [], 
-                           orfarticles=orf_articles_data or [],  
-                           pibfacts=pib_facts_result or {},
-                           insightarticles=insights_articles_result or [],
-                           forum_ca=forum_ca
+                           youtube_enabled=YOUTUBE_ENABLED,
+                           reddit_enabled=REDDIT_ENABLED,
+                           pibfacts=snapshot_data('pib_facts', {}),
+                           **context
                            ) 
 
+
+@app.route('/refresh_status')
+def refresh_status():
+    status = {}
+    with snapshot_lock:
+        for name in dashboard_sources():
+            entry = snapshot.get(name, {})
+            refreshed_at = entry.get('refreshed_at')
+            status[name] = {
+                'interval': REFRESH_INTERVALS[name],
+                'refreshed_at': refreshed_at.isoformat() if refreshed_at else None,
+                'refreshing': entry.get('refreshing', False),
+                'last_error': entry.get('last_error'),
+                'breaker': source_breaker(name).status()
+            }
+    return jsonify(status)
+
+@metrics_registry.on_collect
+def collect_source_metrics():
+    now = datetime.now(timezone.utc)
+    with snapshot_lock:
+        refreshed = {name: snapshot.get(name, {}).get('refreshed_at') for name in dashboard_sources()}
+    for name, refreshed_at in refreshed.items():
+        if refreshed_at:
+            source_age_seconds.set(round((now - refreshed_at).total_seconds(), 3), source=name)
+        source_breaker_open.set(int(source_breaker(name).status()['state'] == CircuitBreaker.OPEN), source=name)
+    for host, status in host_limiter.status().items():
+        if host in METRICS_HOSTS:
+            host_interval_seconds.set(status['interval'], host=host)
+            host_queued_requests.set(status['queued'], host=host)
+
+
+@app.route('/metrics')
+def metrics():
+    return Response(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+async def fetch_recent_playlist_videos(playlist_id):
+    videos = await fetch_videos_from_playlist(playlist_id)
+    return filter_videos_by_date(videos, days=5)
+
 @app.route('/unseen_videos/<playlist_id>')
 async def unseen_videos(playlist_id):
+    if not YOUTUBE_ENABLED:
+        return "YouTube playlists are turned off", 404
     unseen_vids = [] 
     try:
-        async with aiohttp.ClientSession() as session:
-            videos = await fetch_videos_from_playlist(session, playlist_id)
-            recent_videos = filter_videos_by_date(videos, days=5)
-            unseen_vids = filter_unseen_videos(recent_videos)
+        recent_videos = await run_on_scraper_loop(fetch_recent_playlist_videos(playlist_id))
+        unseen_vids = filter_unseen_videos(recent_videos, current_user_id())
     except Exception as e:
         print(f"Error in /unseen_videos/{playlist_id}: {e}")
     return render_template('unseen_videos.html', videos=unseen_vids, playlist_id=playlist_id)
@@ -485,7 +1798,7 @@ async def pibscrap():
     month = request.args.get('month','0')
     day = request.args.get('day','0')
 
-    pib_data = await scrape_pib(ministry=ministry, year=year, month=month, day=day)
+    pib_data = await run_on_scraper_loop(scrape_pib(ministry=ministry, year=year, month=month, day=day))
     return render_template('pib.html', pib_backgrounders=pib_data or {})
 
 @app.route('/pib_facts')
@@ -495,13 +1808,14 @@ async def pibscrapfacts():
     month = request.args.get('month', '0')
     day = request.args.get('day', '0')
 
-    pib_data = await scrape_pib_facts(ministry=ministry, year=year, month=month, day=day)
+    pib_data = await run_on_scraper_loop(scrape_pib_facts(ministry=ministry, year=year, month=month, day=day))
     return render_template('pib_facts.html', pib_backgrounders=pib_data or {}) 
 
 @app.route('/mark_watched', methods=['POST'])
 def mark_watched():
     video_ids = request.form.getlist('video_ids')
-    save_watched_videos(video_ids)
+    save_watched_videos(video_ids, current_user_id())
+    cache.delete(index_cache_key())
     playlist_id = request.form.get('playlist_id')
     if playlist_id:
         return redirect(url_for('unseen_videos', playlist_id=playlist_id))
@@ -510,19 +1824,62 @@ def mark_watched():
 
 @app.route('/add_playlist', methods=['GET', 'POST'])
 def add_playlist_route():
+    if not YOUTUBE_ENABLED:
+        return "YouTube playlists are turned off", 404
     if request.method == 'POST':
         playlist_id = request.form.get('playlist_id', '').strip()
         if playlist_id:
-            add_playlist(playlist_id)
+            add_playlist(playlist_id, current_user_id())
+            cache.delete(index_cache_key())
         return redirect(url_for('index'))
     return render_template('add_playlist.html')
 
+
+@app.route('/register', methods=['GET', 'POST'])
+def register():
+    if request.method == 'POST':
+        username = request.form.get('username', '').strip()
+        password = request.form.get('password', '')
+        if not username or not password:
+            return render_template('login.html', mode='register', error='Username and password are required.')
+        user_id = user_store.create_user(username, password)
+        if user_id is None:
+            return render_template('login.html', mode='register', error='That username is taken.')
+        # New accounts start with the shared playlists; users can add their own.
+        for playlist_id in load_playlist_ids():
+            user_store.add_playlist(user_id, playlist_id)
+        session.clear()
+        session['user_id'] = user_id
+        session['username'] = username
+        return redirect(url_for('index'))
+    return render_template('login.html', mode='register')
+
+
+@app.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form.get('username', '').strip()
+        user_id = user_store.authenticate(username, request.form.get('password', ''))
+        if user_id is None:
+            return render_template('login.html', mode='login', error='Invalid username or password.')
+        session.clear()
+        session['user_id'] = user_id
+        session['username'] = username
+        return redirect(url_for('index'))
+    return render_template('login.html', mode='login')
+
+
+@app.route('/logout', methods=['POST'])
+def logout():
+    session.clear()
+    return redirect(url_for('index'))
+
 async def _render_air_episodes_page(scrape_function, days_filter, template_name='spotlight.html'):
     episodes_data = []
     try:
-        raw_episodes = await scrape_function()
+        raw_episodes = await run_on_scraper_loop(scrape_function())
         recent_episodes_data = filter_recent_episodes(raw_episodes or [], days=days_filter)
-        episodes_data = filter_unheard_episodes(recent_episodes_data or [])
+        episodes_data = filter_unheard_episodes(recent_episodes_data or [], current_user_id())
     except Exception as e:
         print(f"Error in AIR episodes route for {scrape_function.__name__}: {e}")
     return render_template(template_name, episodes=episodes_data)
@@ -547,213 +1904,222 @@ async def airCA():
 @app.route('/mark_listened', methods=['POST'])
 def mark_listened():
     episode_links = request.form.getlist('episode_links')
-    save_listened_episodes(episode_links)
+    save_listened_episodes(episode_links, current_user_id())
+    cache.delete(index_cache_key())
     return redirect(request.referrer or url_for('index'))
 
 
 BASE_URL_MEA = "https://www.mea.gov.in/bilateral-documents.htm" 
-
-async def fetch_page_mea(session, url): # Renamed
+MEA_CUTOFF_DAYS = 90
+MEA_MAX_PAGES = 10
+# Listing pages differ only in this number, so once the first page's next
+# link shows the pattern the following pages can be fetched side by side.
+MEA_PAGE_NUMBER = re.compile(r'([?&](?:page|pageno|pn)=)(\d+)', re.IGNORECASE)
+# The documents of the last complete crawl; later crawls stop at the first
+# of them they meet.
+MEA_DOCUMENTS_KEY = 'mea/documents'
+
+async def fetch_page_mea(url):
     try:
-        async with session.get(url, timeout=20) as response: 
-            if response.status != 200:
-                print(f"Failed to fetch MEA page {url}: {response.status}")
-                return None
-            return await response.text()
+        result = await fetch_text(url)
+        if result.status != 200:
+            print(f"Failed to fetch MEA page {url}: {result.status}")
+            return None
+        return result
     except Exception as e:
         print(f"Error fetching MEA page {url}: {e}")
         return None
 
-async def parse_page_mea(content, days_ago_cutoff_date):
-    documents = []
-    continue_scraping = True 
-    if not content:
-        return documents, False 
-
-    soup = BeautifulSoup(content, "html.parser")
-    item_list = soup.find('ul', class_='commonListing')
-    
-    if item_list:
-        for item in item_list.find_all('li'):
-            title_link = item.find('a', class_='searchContent')
-            date_container = item.find('span', class_='date') 
-            
-            if title_link and date_container:
-                title = title_link.text.strip()
-                doc_url = title_link['href']
-                if not doc_url.startswith('http'):
-                    doc_url = f"https://www.mea.gov.in{doc_url}" if doc_url.startswith('/') else f"https://www.mea.gov.in/{doc_url}"
-                
-                date_str_raw = date_container.text.strip() 
-                
-                try:
-                    date_obj = datetime.strptime(date_str_raw, "%B %d, %Y").replace(tzinfo=timezone.utc)
-                    if date_obj >= days_ago_cutoff_date:
-                        documents.append({
-                            'title': title,
-                            'url': doc_url,
-                            'date': date_obj.strftime("%B %d, %Y") 
-                        })
-                    else:
-                        continue_scraping = False 
-                        break 
-                except ValueError:
-                    print(f"Error parsing MEA date: {date_str_raw} for title '{title}'")
-    else:
-        print("MEA commonListing not found.")
-        continue_scraping = False 
-
-    return documents, continue_scraping
-
-def get_next_page_url_mea(content):
-    if not content: return None
-    soup = BeautifulSoup(content, "html.parser")
-    next_link = soup.find('a', class_='next')
-    if next_link and 'href' in next_link.attrs:
-        href = next_link['href']
-        if href.startswith('http'):
-            return href
-        elif href.startswith('/'):
-            return f"https://www.mea.gov.in{href}"
-        else:
-            return f"https://www.mea.gov.in/bilateral-documents/{href}"
-    return None
+def mea_document_date(document):
+    return datetime.strptime(document['date'], "%B %d, %Y").replace(tzinfo=timezone.utc)
+
+def mea_page_urls(next_url, count):
+    match = MEA_PAGE_NUMBER.search(next_url or '')
+    if not match:
+        return [next_url] if next_url else []
+    number = int(match.group(2))
+    return [next_url[:match.start(2)] + str(number + offset) + next_url[match.end(2):] for offset in range(count)]
+
+def mea_pages_needed(documents, pages_seen, cutoff_date):
+    # Guess from the dates seen so far how many more pages reach back to the
+    # cutoff; a short guess only costs another batch.
+    if not documents or not pages_seen:
+        return 1
+    newest, oldest = mea_document_date(documents[0]), mea_document_date(documents[-1])
+    days_per_page = (newest - oldest).days / pages_seen
+    if days_per_page <= 0:
+        return 1
+    return max(1, math.ceil((oldest - cutoff_date).days / days_per_page))
+
+async def fetch_and_parse_page_mea(url, days_ago_cutoff_date):
+    print(f"Scraping MEA page: {url}")
+    result = await fetch_page_mea(url)
+    if not result:
+        return None
+    return await cached_parse(result, parse_page_mea, days_ago_cutoff_date)
 
+@single_flight
 async def scrape_bilateral_documents():
-    all_documents = []
+    days_ago_cutoff_date = (datetime.now(timezone.utc) - timedelta(days=MEA_CUTOFF_DAYS)).replace(hour=0, minute=0, second=0, microsecond=0)
+    stored_documents = cache.get(MEA_DOCUMENTS_KEY) or []
+    known_urls = {document['url'] for document in stored_documents}
+    new_documents = []
+    failed = False
+    pending = []
     try:
-        async with aiohttp.ClientSession() as session:
-            current_url = f"{BASE_URL_MEA}?53/Bilateral/Multilateral_Documents" 
-            days_ago_cutoff_date = (datetime.now(timezone.utc) - timedelta(days=90)).replace(hour=0, minute=0, second=0, microsecond=0)
-
-            page_count = 0
-            max_pages = 10
-
-            while current_url and page_count < max_pages:
-                page_count += 1
-                print(f"Scraping MEA page {page_count}: {current_url}")
-                content = await fetch_page_mea(session, current_url)
-                if not content:
+        page_urls = [f"{BASE_URL_MEA}?53/Bilateral/Multilateral_Documents"]
+        page_count = 0
+        done = False
+        while page_urls and not done:
+            page_urls = page_urls[:MEA_MAX_PAGES - page_count]
+            page_count += len(page_urls)
+            pending = [asyncio.ensure_future(fetch_and_parse_page_mea(url, days_ago_cutoff_date)) for url in page_urls]
+            next_url = None
+            for task in pending:
+                parsed = await task
+                if parsed is None:
+                    failed = done = True
                     break
-
-                documents_on_page, continue_scraping = await parse_page_mea(content, days_ago_cutoff_date)
-                all_documents.extend(documents_on_page)
-
-                if not continue_scraping:
-                    print("Stopping MEA scraping based on date or parsing issue.")
-                    break
-                
-                current_url = get_next_page_url_mea(content)
-                if not current_url:
-                    print("No next page found for MEA.")
+                documents_on_page, continue_scraping, next_url = parsed
+                fresh = [document for document in documents_on_page if document['url'] not in known_urls]
+                new_documents.extend(fresh)
+                # Pages are newest first, so past the cutoff or the newest
+                # stored document there is nothing left to fetch.
+                if not continue_scraping or len(fresh) < len(documents_on_page) or not next_url:
+                    done = True
                     break
-                await asyncio.sleep(1)
+            for task in pending:
+                task.cancel()
+            if not done:
+                page_urls = mea_page_urls(next_url, mea_pages_needed(new_documents, page_count, days_ago_cutoff_date))
     except Exception as e:
         print(f"Error during MEA bilateral documents scraping: {e}")
+        failed = True
+    finally:
+        for task in pending:
+            task.cancel()
+
+    all_documents = []
+    seen_urls = set()
+    for document in new_documents + stored_documents:
+        if document['url'] not in seen_urls and mea_document_date(document) >= days_ago_cutoff_date:
+            seen_urls.add(document['url'])
+            all_documents.append(document)
+    # A failed crawl would leave a gap the next one never revisits.
+    if not failed:
+        cache.set(MEA_DOCUMENTS_KEY, all_documents, timeout=0)
     return all_documents
 
 @app.route('/MEAsite')
-@cache.cached(timeout=3600) 
+@cache.cached(timeout=ROUTE_CACHE_TIMEOUTS['bilateral_documents'])
 async def bilateral_documents():
-    documents_data = await scrape_bilateral_documents()
+    documents_data = snapshot_data('mea', None)
+    if documents_data is None:
+        documents_data = await run_on_scraper_loop(scrape_bilateral_documents())
     return render_template('bilateral_documents.html', documents=documents_data or [])
 
+@single_flight
 async def scrape_prs_india():
-    cards_data = []
     try:
-        url = "https://prsindia.org"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=20) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch PRS India data: {response.status}")
-                    return []
-                content = await response.text()
-                soup = BeautifulSoup(content, "html.parser")
-                
-                right_banner = soup.find('div', class_='right-banner') 
-                if right_banner:
-                    for item in right_banner.find_all(['div','section'], class_=re.compile(r"col-\w*-6|card-item-class")): 
-                        image_tag = item.find('img')
-                        link_tag = item.find('a')
-                        title_tag = item.find(['h3','h4','h5']) 
-                        
-                        if link_tag and title_tag: 
-                            img_src = None
-                            if image_tag and 'src' in image_tag.attrs:
-                                img_src = image_tag['src']
-                                if not img_src.startswith('http'):
-                                    img_src = url + img_src if img_src.startswith('/') else url + '/' + img_src
-                            
-                            link_href = link_tag['href']
-                            if not link_href.startswith('http'):
-                                link_href = url + link_href if link_href.startswith('/') else url + '/' + link_href
-
-                            cards_data.append({
-                                'title': title_tag.text.strip(),
-                                'image_url': img_src,
-                                'link_url': link_href
-                            })
-                else:
-                    print("PRS India: right-banner not found.")
-
+        result = await fetch_text(PRS_INDIA_URL)
+        if result.status != 200:
+            print(f"Failed to fetch PRS India data: {result.status}")
+            return []
+        return await cached_parse(result, parse_prs_india)
     except Exception as e:
         print(f"Error scraping PRS India: {e}")
-    return cards_data
+    return []
 
 @app.route('/prsindia')
-@cache.cached(timeout=3600) 
+@cache.cached(timeout=ROUTE_CACHE_TIMEOUTS['prs_india'])
 async def prs_india():
-    scraped_cards = await scrape_prs_india() 
+    scraped_cards = snapshot_data('prs', None)
+    if scraped_cards is None:
+        scraped_cards = await run_on_scraper_loop(scrape_prs_india())
     return render_template('prsindia.html', cards=scraped_cards or [])
 
 
-async def scrape_prs_bills(session, search_keyword=None, year=None, status=None):
-    bills_data = []
+PRS_BILLS_URL = "https://prsindia.org/billtrack/category/billtrack"
+
+def prs_bills_url(search_keyword=None, year=None, status=None):
+    params = {}
+    if search_keyword:
+        params['BillActsBillsParliamentSearch[title]'] = search_keyword
+    if status:
+        params['BillActsBillsParliamentSearch[bill_status_id]'] = status
+    if year:
+        params['BillActsBillsParliamentSearch[date_of_introduction]'] = year
+    return f"{PRS_BILLS_URL}?{urlencode(params)}" if params else PRS_BILLS_URL
+
+def archive_prs_bills(bills, year, status):
+    year = int(year) if year and str(year).isdigit() else None
+    document_archive.add('prs_bills', bills, year=year, category=status or '0')
+    index_search_documents('prs_bills', bills)
+
+async def backfill_prs_bills(year, status):
+    # Reads every page of a past year's listing before marking the year
+    # archived, so a keyword search over it finds bills past the first page.
+    url, seen = prs_bills_url(year=str(year), status=status), set()
+    for _ in range(PRS_BACKFILL_MAX_PAGES):
+        result = await fetch_text(url)
+        if result.status != 200:
+            print(f"Failed to fetch PRS India bills page {url}: {result.status}")
+            return
+        page = await cached_parse(result, parse_prs_bills_page)
+        bills = [bill for bill in page['bills'] if bill['url'] not in seen]
+        if not bills:
+            break
+        seen.update(bill['url'] for bill in bills)
+        await asyncio.to_thread(archive_prs_bills, bills, year, status)
+        if not page['next']:
+            break
+        url = urljoin(url, page['next'])
+        await asyncio.sleep(ARCHIVE_BACKFILL_DELAY)
+    else:
+        print(f"PRS India bills for {year} run past {PRS_BACKFILL_MAX_PAGES} pages; not archived")
+        return
+    await asyncio.to_thread(document_archive.mark_covered, 'prs_bills', year, category=status or '0')
+
+def prs_archive_covers(year, status):
+    return document_archive.covered('prs_bills', year, category=status or '0', max_age=PRS_ARCHIVE_MAX_AGE)
+
+@single_flight
+async def scrape_prs_bills(search_keyword=None, year=None, status=None):
+    current_year = datetime.now().year
+    if year and year.isdigit() and int(year) < current_year:
+        if prs_archive_covers(int(year), status):
+            return document_archive.query('prs_bills', int(year), category=status or '0', text=search_keyword)
+        document_archive.want('prs_bills', status or '0')
+    if not year:
+        if all(prs_archive_covers(past_year, status) for past_year in range(ARCHIVE_START_YEAR, current_year)):
+            # All years: the past from the archive, only this year from upstream.
+            bills = await scrape_prs_bills(search_keyword, str(current_year), status)
+            urls = {bill['url'] for bill in bills}
+            return bills + [
+                bill for bill in document_archive.query('prs_bills', category=status or '0', text=search_keyword)
+                if bill['url'] not in urls
+            ]
+        document_archive.want('prs_bills', status or '0')
     try:
-        base_url = "https://prsindia.org/billtrack/category/billtrack"
-        params = {}
-        
-        if search_keyword:
-            params['BillActsBillsParliamentSearch[title]'] = search_keyword
-        if status:
-            params['BillActsBillsParliamentSearch[bill_status_id]'] = status
-        if year:
-            params['BillActsBillsParliamentSearch[date_of_introduction]'] = year
-            
-        async with session.get(base_url, params=params, timeout=20) as response:
-            if response.status != 200:
-                print(f"Failed to fetch PRS India bills data: {response.status}")
-                return []
-            
-            content = await response.text()
-            soup = BeautifulSoup(content, "html.parser")
-            
-           
-            for row in soup.find_all('div', class_='views-row'):
-                
-                title_div = row.find('div', class_='views-field-title-field')
-                status_div = row.find('div', class_='views-field-field-bill-status')
-                
-                if title_div and status_div:
-                    title_tag = title_div.find('h3', class_='cate')
-                    if title_tag and title_tag.a:
-                        bill_url = title_tag.a['href']
-                        if not bill_url.startswith('http'):
-                            bill_url = f"https://prsindia.org{bill_url}"
-                        
-                        status_span = status_div.find('span')
-                        status_text = status_span.text.strip() if status_span else "Unknown"
-                        
-                        bills_data.append({
-                            'title': title_tag.a.text.strip(),
-                            'url': bill_url,
-                            'status': status_text
-                        })
+        result = await fetch_text(prs_bills_url(search_keyword, year, status))
+        if result.status != 200:
+            print(f"Failed to fetch PRS India bills data: {result.status}")
+            return []
+        # Only the first page, so the year is left for the backfill to mark
+        # archived.
+        bills = await cached_parse(result, parse_prs_bills)
+        if bills:
+            await asyncio.to_thread(archive_prs_bills, bills, year, status)
+        return bills
     except Exception as e:
         print(f"Error scraping PRS India bills: {e}")
     
-    return bills_data
+    return []
+
 
+async def refresh_prs_bills():
+    # The unfiltered listing for the current year, as /prsindia_bills shows by default.
+    return await scrape_prs_bills('', str(datetime.now().year), '')
 
 @app.route('/prsindia_bills')
 async def prs_india_bills():
@@ -761,9 +2127,12 @@ async def prs_india_bills():
     year = request.args.get('year', str(datetime.now().year))
     status = request.args.get('status', '')
     
-    async with aiohttp.ClientSession() as session:
-        bills = await scrape_prs_bills(session, search_keyword, year, status)
-    
+    bills = None
+    if not search_keyword and not status and year == str(datetime.now().year):
+        bills = snapshot_data('prs_bills', None)
+    if bills is None:
+        bills = await run_on_scraper_loop(scrape_prs_bills(search_keyword, year, status))
+
     return render_template('prsindia_bills.html', 
                           bills=bills, 
                           search_keyword=search_keyword, 
@@ -771,484 +2140,135 @@ async def prs_india_bills():
                           status=status)
 
 
+@single_flight
 async def scrape_current_affairs_iasgyan():
-    current_affairs_data = [] 
     try:
         url = "https://www.iasgyan.in/daily-current-affairs"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=20) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch IASGyan Current Affairs data: {response.status}")
-                    return []
-                content = await response.text()
-                soup = BeautifulSoup(content, "html.parser")
-
-                cutoff_date_iasgyan = datetime.now() - timedelta(days=6)
-
-                for article_block in soup.find_all('div', class_='shadow mt-4 rounded-2'): 
-                    title_tag_ias = article_block.find('h3', class_='fw-semibold text-white m-0 fs-5')
-                    article_links_list = article_block.find_all('a', class_='w-100')
-
-                    if title_tag_ias and article_links_list:
-                        date_str_match = re.search(r'–\s*(.+)$', title_tag_ias.text.strip())
-                        if not date_str_match: continue
-                        
-                        date_str_cleaned = re.sub(r'(\d+)(st|nd|rd|th|TH|ND|RD|ST)\s*', r'\1 ', date_str_match.group(1).strip())
-                        date_str_cleaned = date_str_cleaned.replace("  ", " ") 
-                        
-                        try:
-                            article_date_obj = datetime.strptime(date_str_cleaned.strip(), '%d %B %Y') 
-                        except ValueError as ve:
-                            print(f"IASGyan: Error parsing date '{date_str_cleaned}': {ve}")
-                            continue
-                        
-                        if article_date_obj >= cutoff_date_iasgyan:
-                            articles_for_date = []
-                            for link_item in article_links_list:
-                                articles_for_date.append({
-                                    'title': link_item.text.strip(),
-                                    'url': link_item['href'] if link_item.get('href') else '#'
-                                })
-                            if articles_for_date: 
-                                current_affairs_data.append({
-                                    'date': article_date_obj, 
-                                    'articles': articles_for_date
-                                })
-        current_affairs_data.sort(key=lambda x: x['date'], reverse=True) 
+        result = await fetch_text(url)
+        if result.status != 200:
+            print(f"Failed to fetch IASGyan Current Affairs data: {result.status}")
+            return []
+        return await cached_parse(result, parse_current_affairs_iasgyan)
     except Exception as e:
         print(f"Error scraping IASGyan Current Affairs: {e}")
-    return current_affairs_data
-
+    return []
 
+@single_flight
 async def scrape_AIR_sansad_tv_summaries_Iasgyan():
-    summaries_data = []
     try:
         url = "https://www.iasgyan.in/sansad-tv-air-summaries"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=20) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch IASGyan Sansad TV & AIR summaries: {response.status}")
-                    return []
-                content = await response.text()
-                soup = BeautifulSoup(content, "html.parser")
-
-                for summary_block_item in soup.find_all('div', class_='content_bx'):
-                    title_tag_sum = summary_block_item.find('div', class_='title').find('a') if summary_block_item.find('div', class_='title') else None
-                    date_tag_sum = summary_block_item.find('li', class_='text-muted')
-                    description_tag_sum = summary_block_item.find('div', class_='short_descr').find('ol') if summary_block_item.find('div', class_='short_descr') else None
-                    read_more_tag_sum = summary_block_item.find('div', class_='readmore_btn').find('a') if summary_block_item.find('div', class_='readmore_btn') else None
-
-                    if not (title_tag_sum and date_tag_sum and description_tag_sum and read_more_tag_sum):
-                        continue 
-
-                    title_text = title_tag_sum.text.strip()
-                    doc_url_sum = title_tag_sum['href']
-                    
-                    summary_date_str_raw = " ".join(date_tag_sum.text.strip().split()).replace(',', '') 
-                    try:
-                        if len(summary_date_str_raw.split()[1]) == 3:
-                             parsed_date_sum = datetime.strptime(summary_date_str_raw, '%d %b %Y')
-                        else: 
-                             parsed_date_sum = datetime.strptime(summary_date_str_raw, '%d %B %Y')
-                    except ValueError:
-                        print(f"IASGyan Summaries: Could not parse date '{summary_date_str_raw}' for '{title_text}'")
-                        parsed_date_sum = datetime.min 
-
-                    summary_points_list = [li.text.strip() for li in description_tag_sum.find_all('li')]
-
-                    summaries_data.append({
-                        'title': title_text,
-                        'url': doc_url_sum,
-                        'date_obj': parsed_date_sum, 
-                        'date': parsed_date_sum.strftime('%d %b %Y') if parsed_date_sum != datetime.min else summary_date_str_raw,
-                        'points': summary_points_list,
-                        'read_more_url': read_more_tag_sum['href']
-                    })
-                
-                summaries_data.sort(key=lambda x: x['date_obj'], reverse=True) 
-                return summaries_data[:3] 
+        result = await fetch_text(url)
+        if result.status != 200:
+            print(f"Failed to fetch IASGyan Sansad TV & AIR summaries: {result.status}")
+            return []
+        return await cached_parse(result, parse_sansad_tv_summaries)
     except Exception as e:
         print(f"Error scraping IASGyan Sansad TV summaries: {e}")
-    return summaries_data 
-
+    return []
 
+@single_flight
 async def scrape_indian_express_articles():
-    articles_data = []
     try:
         url = "https://indianexpress.com/section/upsc-current-affairs/upsc-essentials/"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url, timeout=20) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch Indian Express UPSC articles: {response.status}")
-                    return []
-                content = await response.text()
-                soup = BeautifulSoup(content, "html.parser")
-                
-                one_week_ago_cutoff = datetime.now(timezone.utc) - timedelta(days=7)
-                
-                for article_div in soup.find_all('div', class_='articles'):
-                    try:
-                        context_div = article_div.find('div', class_='img-context')
-                        if not context_div: continue
-
-                        title_tag = context_div.find('h2', class_='title').find('a')
-                        if not title_tag: continue
-                        
-                        title_text = title_tag.text.strip()
-                        doc_url = title_tag['href']
-                        date_div = context_div.find('div', class_='date')
-                        date_str_raw = date_div.text.strip() if date_div else ""
-                        summary_tag = context_div.find('p')
-                        summary_text = summary_tag.text.strip() if summary_tag else ""
-                        snaps_div = article_div.find('div', class_='snaps')
-                        image_url = None
-                        if snaps_div:
-                            img = snaps_div.find('img')
-                            if img:
-                                image_url = img.get('src') or img.get('data-src')
-                        article_date_obj = None
-                        clean_date_str = date_str_raw.replace('IST', '').strip()
-                        clean_date_str = re.sub(r'\s+', ' ', clean_date_str)
-                        
-                        try:
-                            article_date_obj = datetime.strptime(clean_date_str, '%B %d, %Y %H:%M')
-                        except ValueError:
-                            try:
-                                article_date_obj = datetime.strptime(clean_date_str, '%B %d, %Y')
-                            except ValueError:
-                                continue 
-                        article_date_obj = article_date_obj.replace(tzinfo=timezone.utc)
-
-                        if article_date_obj >= one_week_ago_cutoff:
-                            articles_data.append({
-                                'title': title_text,
-                                'url': doc_url,
-                                'image_url': image_url,
-                                'date': date_str_raw,
-                                'summary': summary_text,
-                                'date_obj': article_date_obj 
-                            })
-                    except Exception as inner_e:
-                        print(f"Error parsing specific IE article: {inner_e}")
-                        continue
-
-        articles_data.sort(key=lambda x: x['date_obj'], reverse=True)
-
+        result = await fetch_text(url)
+        if result.status != 200:
+            print(f"Failed to fetch Indian Express UPSC articles: {result.status}")
+            return []
+        return await cached_parse(result, parse_indian_express_articles)
     except Exception as e:
         print(f"Error scraping Indian Express articles: {e}")
-    return articles_data
-
+    return []
 
+@single_flight
 async def scrape_full_article(url):
+    stored = article_store.get('full_article', url)
+    if stored is not None:
+        return stored
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=20) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch article content from {url}: {response.status}")
-                    return None
-                content = await response.text()
-                soup = BeautifulSoup(content, "html.parser")
-                
-                content_div = soup.find('div', id='pcl-full-content') 
-                if not content_div: 
-                    content_div = soup.find('article') or soup.find('main') or soup.find('div', class_=re.compile(r'content|article-body|story'))
-
-                if not content_div:
-                    print(f"Could not find main content container for {url}")
-                    return f"<p>Content not found. Please visit <a href='{url}'>original article</a>.</p>"
-                
-                title_tag_full = soup.find(['h1', 'h2'], class_=re.compile(r'title|headline')) 
-                if not title_tag_full: title_tag_full = soup.find('h1') 
-                title_text_full = title_tag_full.get_text(strip=True) if title_tag_full else "Article"
-                
-                author_date_div = soup.find(['div','span'], class_=re.compile(r'editor|author|date|byline|meta')) 
-                author_date_text_full = author_date_div.get_text(separator=" ", strip=True) if author_date_div else ""
-                
-
-                elements = content_div.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'blockquote', 'figure', 'table'])
-                formatted_content_parts = []
-                for elem in elements:
-                    if elem.name in ['h1','h2','h3','h4','h5','h6']:
-                        formatted_content_parts.append(f"<{elem.name}>{elem.get_text(strip=True)}</{elem.name}>")
-                    elif elem.name == 'p':
-                        
-                        if elem.find_parent('li'): 
-                            continue 
-                        formatted_content_parts.append(f"<p>{elem.get_text(separator=' ', strip=True)}</p>")
-                    elif elem.name in ['ul', 'ol']:
-                        list_items_html = "".join([f"<li>{li_item.get_text(separator=' ', strip=True)}</li>" for li_item in elem.find_all('li', recursive=False)])
-                        formatted_content_parts.append(f"<{elem.name}>{list_items_html}</{elem.name}>")
-                    elif elem.name == 'blockquote':
-                        formatted_content_parts.append(f"<blockquote>{elem.get_text(separator=' ', strip=True)}</blockquote>")
-                    elif elem.name == 'figure':
-                        img = elem.find('img')
-                        caption = elem.find('figcaption')
-                        if img and 'src' in img.attrs:
-                            img_html = f"<img src='{img['src']}' alt='{img.get('alt','Image')}' style='max-width:100%; height:auto;'>"
-                            if caption:
-                                img_html += f"<figcaption>{caption.get_text(strip=True)}</figcaption>"
-                            formatted_content_parts.append(f"<figure>{img_html}</figure>")
-                    elif elem.name == 'table':
-                        table_html = "<table>"
-                        for tr in elem.find_all('tr'):
-                            table_html += "<tr>"
-                            for th_td in tr.find_all(['th', 'td']):
-                                table_html += f"<{th_td.name}>{th_td.get_text(strip=True)}</{th_td.name}>"
-                            table_html += "</tr>"
-                        table_html += "</table>"
-                        formatted_content_parts.append(table_html)
-
-
-                full_article_html = f"<h1>{title_text_full}</h1>"
-                if author_date_text_full:
-                    full_article_html += f"<div class='article-meta' style='color:grey; margin-bottom:1em;'>{author_date_text_full}</div>"
-                full_article_html += "\n".join(formatted_content_parts)
-                
-                return full_article_html
+        result = await fetch_text(url)
+        if result.status != 200:
+            print(f"Failed to fetch article content from {url}: {result.status}")
+            return None
+        article = await cached_parse(result, parse_full_article, url)
+        if article != ARTICLE_NOT_FOUND_HTML.format(url=url):
+            await asyncio.to_thread(article_store.put, 'full_article', url, article)
+            await asyncio.to_thread(index_article_body, 'indian_express', url, article)
+        return article
     except Exception as e:
         print(f"Error scraping full article from {url}: {e}")
         return f"<p>Error loading article content. Please visit <a href='{url}'>original article</a>.</p>"
 
-
 @app.route('/article/<path:url>')
 async def show_article(url):
     if not url.startswith('http'):
         print(f"Warning: URL '{url}' might be partial. Assuming it's complete.")
 
-    full_content_html = await scrape_full_article(url)
+    full_content_html = await run_on_scraper_loop(scrape_full_article(url))
     if full_content_html is None:
         full_content_html = f"<p>Failed to fetch article content for {url}.</p>"
     return render_template('full_article.html', content=full_content_html)
 
 
+@single_flight
 async def scrape_insights_articles():
-    articles_data_insights = []
     try:
         url = 'https://www.insightsonindia.com/upsc-mains-answer-writing-2025-insights-ias/'
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url, timeout=20) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch Insights Answer Writing links: {response.status}")
-                    return []
-                content = await response.text()
-                soup = BeautifulSoup(content, 'html.parser')
-                count = 0
-                for div_block in soup.find_all('div', class_='list_div'):
-                    if count >= 2: break 
-                    
-                    ul_tag = div_block.find('ul', class_='lcp_catlist')
-                    if ul_tag:
-                        for li in ul_tag.find_all('li'):
-                            a_tag = li.find('a')
-                            if a_tag and a_tag.get('href'):
-                                title = a_tag.text.strip()
-                                link = a_tag['href']
-                                articles_data_insights.append({
-                                    'title': title,
-                                    'link': link
-                                })
-                        count += 1
-                        
+        result = await fetch_text(url)
+        if result.status != 200:
+            print(f"Failed to fetch Insights Answer Writing links: {result.status}")
+            return []
+        return await cached_parse(result, parse_insights_articles)
     except Exception as e:
         print(f"Error scraping Insights Answer Writing links: {e}")
-    return articles_data_insights
+    return []
 
+@single_flight
 async def scrape_full_article_insight(article_url):
-    filtered_content_parts = []
+    stored = article_store.get('insights_article', article_url)
+    if stored is not None:
+        return stored
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(article_url, timeout=20) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch Insights article content from {article_url}: {response.status}")
-                    return None 
-                content = await response.text()
-                soup = BeautifulSoup(content, 'html.parser')
-
-
-                article_body = soup.find('div', class_=re.compile(r'entry-content|article-content|post-content'))
-                if not article_body:
-                    print(f"Insights: Could not find article body for {article_url}")
-                    return [{'type': 'p', 'text': 'Article content not found.'}]
-
-                current_section_text = None
-
-                for tag_item in article_body.find_all(['h1','h2','h3', 'h4', 'p', 'ul', 'ol', 'blockquote', 'table']):
-                    if tag_item.name in ['h1','h2','h3','h4']: 
-                        current_section_text = tag_item.text.strip()
-                        filtered_content_parts.append({'type': tag_item.name, 'text': current_section_text})
-                    elif tag_item.name == 'p':
-                   
-                        filtered_content_parts.append({'type': 'p', 'text': tag_item.text.strip()})
-                    elif tag_item.name in ['ul', 'ol']:
-                        items = [li.get_text(strip=True) for li in tag_item.find_all('li')]
-                        if items:
-                            filtered_content_parts.append({'type': 'list', 'ordered': tag_item.name == 'ol', 'items': items})
-                    elif tag_item.name == 'blockquote':
-                        filtered_content_parts.append({'type': 'blockquote', 'text': tag_item.get_text(strip=True)})
-                    elif tag_item.name == 'table':
-                        rows = []
-                        for tr in tag_item.find_all('tr'):
-                            cells = [td.get_text(strip=True) for td in tr.find_all(['th', 'td'])]
-                            rows.append(cells)
-                        if rows:
-                           filtered_content_parts.append({'type': 'table', 'rows': rows})
-
-
+        result = await fetch_text(article_url)
+        if result.status != 200:
+            print(f"Failed to fetch Insights article content from {article_url}: {result.status}")
+            return None
+        article = await cached_parse(result, parse_full_article_insight, article_url)
+        if article and article != INSIGHTS_ARTICLE_NOT_FOUND:
+            await asyncio.to_thread(article_store.put, 'insights_article', article_url, article)
+            await asyncio.to_thread(index_article_body, 'insights', article_url, article)
+        return article
     except Exception as e:
         print(f"Error scraping full Insights article from {article_url}: {e}")
         return [{'type': 'p', 'text': f'Error loading article: {e}'}]
-    return filtered_content_parts
-
 
 @app.route('/article_insight/<path:url>')
 async def show_article_insight(url):
-    full_content_data = await scrape_full_article_insight(url) 
+    full_content_data = await run_on_scraper_loop(scrape_full_article_insight(url))
     if not full_content_data: 
         return "Failed to load the Insights article content.", 404
     return render_template('full_article_insight.html', content=full_content_data)
 
 
+@single_flight
 async def scrape_orf_articles():
-    orf_articles_data = []
     try:
         url = 'https://www.orfonline.org/content-type/issue-briefs'
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url, timeout=20) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch ORF articles from {url}: {response.status}")
-                    return []
-                content = await response.text()
-                soup = BeautifulSoup(content, 'html.parser')
-
-                cutoff_orf = datetime.now(timezone.utc) - timedelta(days=45)
-
-                potential_articles = soup.find_all('div', class_=re.compile(r'col-|card|item|listing|post'))
-                
-                for article_block in potential_articles:
-                    title_tag = article_block.find(['h2', 'h3'])
-                    if not title_tag: 
-                        continue
-                    
-                    title_text = title_tag.get_text(strip=True)
-                    if not title_text or len(title_text) < 10: 
-                        continue
-
-                   
-                    link_tag = title_tag.find('a')
-                    if not link_tag:
-                       
-                        link_tag = article_block.find('a')
-                    
-                    if not link_tag or not link_tag.get('href'):
-                        continue
-                        
-                    doc_url = link_tag['href']
-                    if not doc_url.startswith('http'):
-                        doc_url = f"https://www.orfonline.org{doc_url}" if doc_url.startswith('/') else f"https://www.orfonline.org/{doc_url}"
-
-                   
-                    date_tag = article_block.find('time') or article_block.find(class_=re.compile(r'date|meta|time'))
-                    article_date_obj = None
-                    
-                    if date_tag:
-                        date_str = date_tag.get_text(strip=True)
-                        try:
-                            
-                            article_date_obj = datetime.strptime(date_str, "%b %d, %Y").replace(tzinfo=timezone.utc)
-                        except ValueError:
-                            try:
-                                article_date_obj = datetime.strptime(date_str, "%d %B %Y").replace(tzinfo=timezone.utc)
-                            except ValueError:
-                                pass 
-                    
-                   
-                    if not article_date_obj:
-                         article_date_obj = datetime.now(timezone.utc) 
-
-                    if article_date_obj >= cutoff_orf:
-                        
-                        desc_tag = article_block.find('p')
-                        desc_text = desc_tag.get_text(strip=True) if desc_tag else ""
-                        
-                       
-                        if any(a['link'] == doc_url for a in orf_articles_data):
-                            continue
-
-                        orf_articles_data.append({
-                            'title': title_text,
-                            'link': doc_url,
-                            'date_obj': article_date_obj,
-                            'date': article_date_obj.strftime('%B %d, %Y'),
-                            'description': desc_text,
-                            'author': "ORF" 
-                        })
-
+        result = await fetch_text(url)
+        if result.status != 200:
+            print(f"Failed to fetch ORF articles from {url}: {result.status}")
+            return []
+        return await cached_parse(result, parse_orf_articles)
     except Exception as e:
         print(f"Error scraping ORF articles: {e}")
-    
-    
-    seen = set()
-    unique_data = []
-    for d in orf_articles_data:
-        if d['link'] not in seen:
-            seen.add(d['link'])
-            unique_data.append(d)
-            
-    unique_data.sort(key=lambda x: x['date_obj'], reverse=True)
-    return unique_data
+    return []
 
+@single_flight
 async def scrape_forumias(url_path="7pm"):
     url = f"https://forumias.com/blog/{url_path}/"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-
-    async with aiohttp.ClientSession(headers=headers) as session:
-        async with session.get(url, timeout=15) as response:
-            if response.status != 200:
-                return []
-            
-            html = await response.text()
-            soup = BeautifulSoup(html, "html.parser")
-            
-            sections_data = []
-            articles_list = []
-            date_groups = soup.find_all('div', class_='cat-archive-date-group')
-            
-            for group in date_groups:
-                date_div = group.find('div', class_='post-date')
-                date_text = date_div.get_text(" ", strip=True) if date_div else ""
-                
-                links = group.find_all('a')
-                for a in links:
-                    articles_list.append({
-                        'title': a.get_text(strip=True),
-                        'url': a.get('href'),
-                        'date': date_text
-                    })
-
-            if articles_list:
-                sections_data.append({
-                    'section': f"ForumIAS {url_path.upper()} Editorials",
-                    'articles': articles_list
-                })
-                
-            return sections_data
+    result = await fetch_text(url, timeout=aiohttp.ClientTimeout(total=15))
+    if result.status != 200:
+        return []
+    return await cached_parse(result, parse_forumias, url_path)
 
 async def scrape_forumias_combined():
     results = await asyncio.gather(
@@ -1261,57 +2281,246 @@ async def scrape_forumias_combined():
 
 @app.route('/forumias')
 async def forumias():
-    scraped_sections = await scrape_forumias_combined()
+    scraped_sections = await run_on_scraper_loop(scrape_forumias_combined())
     return render_template('forumias.html', sections=scraped_sections)
 
 @app.route('/forumias/<section>')
 async def forumias_section(section):
     if section not in ['7pm', '9pm']:
         return "Invalid section", 404
-    scraped_sections = await scrape_forumias(section)
+    scraped_sections = await run_on_scraper_loop(scrape_forumias(section))
     return render_template('forumias.html', sections=scraped_sections)
 
 @app.route('/TH_article/<path:url>')
 async def show_th_article(url):
-    article_content_data = await scrape_TH_learning(url) 
+    article_content_data = await run_on_scraper_loop(scrape_TH_learning(url))
     if not article_content_data: 
         return "Failed to load The Hindu Learning Corner article content.", 404
     return render_template('article_content.html', content=article_content_data)
 
+@single_flight
 async def scrape_TH_learning(article_url_th):
-    article_content_th = []
+    stored = article_store.get('th_learning', article_url_th)
+    if stored is not None:
+        return stored
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(article_url_th, timeout=20) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch TH Learning article from {article_url_th}: {response.status}")
-                    return None
-                content = await response.text()
-                soup = BeautifulSoup(content, "html.parser")
-
-     
-                main_content_area = soup.find('div', class_=re.compile(r'articlebody|content|story-body'))
-                if not main_content_area:
-                     main_content_area = soup
-
-                for tag_item_th in main_content_area.find_all(['h1','h2','h3', 'h4', 'p', 'ul', 'ol']):
-                    if tag_item_th.name in ['h1','h2','h3','h4']:
-                        article_content_th.append({'type': tag_item_th.name, 'text': tag_item_th.text.strip()})
-                    elif tag_item_th.name == 'p':
-                        article_content_th.append({'type': 'p', 'text': tag_item_th.text.strip()})
-                    elif tag_item_th.name in ['ul', 'ol']:
-                        items = [li.get_text(strip=True) for li in tag_item_th.find_all('li')]
-                        if items:
-                             article_content_th.append({'type':'list', 'ordered': tag_item_th.name=='ol', 'items':items})
-                
-                if not article_content_th and main_content_area == soup:
-                    print(f"TH Learning: No specific content tags found on {article_url_th}, page might be structured differently.")
-
+        result = await fetch_text(article_url_th)
+        if result.status != 200:
+            print(f"Failed to fetch TH Learning article from {article_url_th}: {result.status}")
+            return None
+        article_content_th = await cached_parse(result, parse_TH_learning, article_url_th)
+        if article_content_th:
+            await asyncio.to_thread(article_store.put, 'th_learning', article_url_th, article_content_th)
+        return article_content_th
     except Exception as e:
         print(f"Error scraping TH Learning article from {article_url_th}: {e}")
-        return None 
-    return article_content_th
+        return None
+
+SEARCH_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def search_filters():
+    # q, any number of source=, and from=/to= as YYYY-MM-DD.
+    sources = tuple(source for source in request.args.getlist('source') if source)
+    date_from, date_to = request.args.get('from') or None, request.args.get('to') or None
+    for value in (date_from, date_to):
+        if value and not SEARCH_DATE.match(value):
+            raise ValueError("from and to must be dates as YYYY-MM-DD")
+    return request.args.get('q', '').strip(), sources, date_from, date_to
 
 
+@app.route('/search')
+def search():
+    try:
+        query, sources, date_from, date_to = search_filters()
+    except ValueError as e:
+        return str(e), 400
+    page = max(request.args.get('page', 1, type=int), 1)
+    results = search_index.search(query, sources, date_from, date_to,
+                                  limit=SEARCH_PAGE_SIZE, offset=(page - 1) * SEARCH_PAGE_SIZE)
+    return render_template('search.html', query=query, sources=sources, date_from=date_from, date_to=date_to,
+                           page=page, page_size=SEARCH_PAGE_SIZE, results=results,
+                           source_labels=SEARCH_SOURCE_LABELS)
+
+# Read-only JSON API over the dashboard snapshot. It never fetches upstream:
+# every source is served from the same background refresh as the HTML pages.
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+API_COMPRESS_MIN_BYTES = 1024
+
+
+def pib_items(data):
+    return data.get('Backgrounders', [])
+
+
+def forumias_items(url_path=None):
+    def items(data):
+        return [
+            dict(article, section=section['section'])
+            for section in data
+            if url_path is None or section['section'] == forumias_section_title(url_path)
+            for article in section['articles']
+        ]
+    return items
+
+
+# API path -> (snapshot source, function extracting the item list).
+API_SOURCES = {
+    'playlists': ('playlists', None),
+    'air/spotlight': ('air_spotlight', None),
+    'air/insight': ('air_insight', None),
+    'air/economy': ('air_economy', None),
+    'air/current-affairs': ('air_current_affairs', None),
+    'pib': ('pib_backgrounders', pib_items),
+    'pib/backgrounders': ('pib_backgrounders', pib_items),
+    'pib/facts': ('pib_facts', pib_items),
+    'ie': ('indian_express', None),
+    'orf': ('orf', None),
+    'insights': ('insights', None),
+    'sansad-tv': ('sansad_tv', None),
+    'forumias': ('forumias', forumias_items()),
+    'forumias/7pm': ('forumias', forumias_items('7pm')),
+    'forumias/9pm': ('forumias', forumias_items('9pm')),
+    'mea': ('mea', None),
+    'prs': ('prs', None),
+    'prs/bills': ('prs_bills', None),
+}
+if not YOUTUBE_ENABLED:
+    del API_SOURCES['playlists']
+
+
+def _api_json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _api_item_key(item):
+    for field in ('url', 'link', 'audio_link', 'id', 'title'):
+        if item.get(field):
+            return str(item[field])
+    return None
+
+
+def encode_api_cursor(item, offset):
+    cursor = json.dumps({'k': _api_item_key(item), 'o': offset}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(cursor.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_api_cursor(cursor, items):
+    # The cursor names the last item returned, so a refresh that inserts or
+    # drops items does not shift the next page; the offset is only a fallback
+    # for when that item is gone. Keys can repeat within a source (the same
+    # link listed twice), so of the matching items the one nearest where the
+    # last page ended wins, rather than the first, which would page back.
+    padded = cursor + '=' * (-len(cursor) % 4)
+    position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    offset = int(position['o'])
+    matches = [index for index, item in enumerate(items) if _api_item_key(item) == position['k']]
+    if not matches:
+        return offset
+    return min(matches, key=lambda index: (abs(index + 1 - offset), -index)) + 1
+
+
+def api_error(message, status):
+    return jsonify({'error': message}), status
+
+
+def api_response(payload):
+    body = json.dumps(payload, default=_api_json_default, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    if etag in {tag.split('-')[0] for tag in request.if_none_match.as_set(include_weak=True)}:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    encoding = None
+    if len(body) >= API_COMPRESS_MIN_BYTES:
+        if brotli is not None and 'br' in request.accept_encodings:
+            encoding, body = 'br', brotli.compress(body)
+        elif 'gzip' in request.accept_encodings:
+            encoding, body = 'gzip', gzip.compress(body)
+    response = Response(body, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    if encoding:
+        response.content_encoding = encoding
+        response.set_etag(f"{etag}-{encoding}")
+    else:
+        response.set_etag(etag)
+    return response
+
+
+@app.route('/api/v1/sources')
+def api_sources():
+    sources = []
+    with snapshot_lock:
+        for path, (source, _) in API_SOURCES.items():
+            entry = snapshot.get(source, {})
+            refreshed_at = entry.get('refreshed_at')
+            sources.append({
+                'path': f"/api/v1/sources/{path}",
+                'source': source,
+                'refreshed_at': refreshed_at.isoformat() if refreshed_at else None,
+            })
+    return api_response({'sources': sources})
+
+
+@app.route('/api/v1/sources/<path:name>')
+def api_source(name):
+    if name not in API_SOURCES:
+        return api_error(f"Unknown source '{name}'", 404)
+    source, extract_items = API_SOURCES[name]
+    with snapshot_lock:
+        entry = dict(snapshot.get(source) or {})
+    if entry.get('data') is None:
+        return api_error(f"Source '{name}' has not been fetched yet", 503)
+    items = extract_items(entry['data']) if extract_items else entry['data']
+
+    try:
+        limit = min(max(int(request.args.get('limit', API_PAGE_SIZE)), 1), API_MAX_PAGE_SIZE)
+    except ValueError:
+        return api_error("limit must be an integer", 400)
+    start = 0
+    if request.args.get('cursor'):
+        try:
+            start = decode_api_cursor(request.args['cursor'], items)
+        except (ValueError, KeyError, TypeError):
+            return api_error("Invalid cursor", 400)
+    page = items[start:start + limit]
+    next_cursor = encode_api_cursor(page[-1], start + len(page)) if page and start + len(page) < len(items) else None
+
+    fields = [field for field in request.args.get('fields', '').split(',') if field]
+    if fields:
+        page = [{field: item[field] for field in fields if field in item} for item in page]
+
+    return api_response({
+        'source': name,
+        'refreshed_at': entry['refreshed_at'],
+        'total': len(items),
+        'items': page,
+        'next_cursor': next_cursor,
+    })
+
+
+@app.route('/api/v1/search')
+def api_search():
+    try:
+        query, sources, date_from, date_to = search_filters()
+    except ValueError as e:
+        return api_error(str(e), 400)
+    try:
+        limit = min(max(int(request.args.get('limit', API_PAGE_SIZE)), 1), API_MAX_PAGE_SIZE)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return api_error("limit and offset must be integers", 400)
+    if not query:
+        return api_error("q is required", 400)
+    results = search_index.search(query, sources, date_from, date_to, limit=limit, offset=offset)
+    for result in results['results']:
+        result['snippet'] = str(result['snippet'])
+    return api_response(dict(results, query=query, limit=limit, offset=offset))
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
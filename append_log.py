@@ -0,0 +1,67 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class AppendOnlySet:
+    """In-memory set mirroring a file of one entry per line that only ever
+    grows. The file is read once; refresh() then reads just the lines other
+    workers appended since the last read, so membership checks stay O(1)
+    without re-reading the file. Appends take an exclusive lock on the file
+    where fcntl is available so lines from concurrent workers never
+    interleave.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._items = set()
+        self._offset = 0
+        self._inode = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._items, self._offset, self._inode = set(), 0, None
+                return
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                # The file was replaced or truncated; start over.
+                self._items, self._offset, self._inode = set(), 0, stat.st_ino
+            if stat.st_size == self._offset:
+                return
+            with open(self.path, 'rb') as file:
+                file.seek(self._offset)
+                data = file.read()
+            # A line still being written by another worker is picked up next time.
+            complete = data.rfind(b'\n') + 1
+            for line in data[:complete].decode('utf-8', errors='replace').splitlines():
+                line = line.strip()
+                if line:
+                    self._items.add(line)
+            self._offset += complete
+
+    def add(self, entries):
+        entries = [entry for entry in entries if entry]
+        if not entries:
+            return
+        with open(self.path, 'a') as file:
+            if fcntl:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                file.write(''.join(f"{entry}\n" for entry in entries))
+                file.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+        with self._lock:
+            self._items.update(entries)
+
+    def __contains__(self, entry):
+        return entry in self._items
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class ArticleStore:
+    """Content-addressed store for parsed articles, keyed by a hash of the
+    parser kind and article URL. Published articles do not change, so entries
+    are never refreshed; an article goes once nobody has read it for max_age
+    seconds, and the store is kept under max_bytes by evicting the least
+    recently read articles. Bodies are zlib-compressed when compress is set.
+    """
+
+    def __init__(self, path='articles.sqlite3', max_bytes=256 * 1024 * 1024, max_age=30 * 24 * 3600, compress=True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+        self._local = threading.local()
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS articles ('
+            'key TEXT PRIMARY KEY, kind TEXT NOT NULL, url TEXT NOT NULL, body BLOB NOT NULL, '
+            'compressed INTEGER NOT NULL, size INTEGER NOT NULL, stored REAL NOT NULL, accessed REAL NOT NULL)'
+        )
+        self._connection().execute('CREATE INDEX IF NOT EXISTS articles_accessed ON articles (accessed)')
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def key(kind, url):
+        return hashlib.sha256(f"{kind}:{url}".encode('utf-8')).hexdigest()
+
+    def get(self, kind, url):
+        key = self.key(kind, url)
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                'SELECT body, compressed FROM articles WHERE key = ? AND accessed >= ?', (key, self._oldest())
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute('UPDATE articles SET accessed = ? WHERE key = ?', (time.time(), key))
+            body = zlib.decompress(row[0]) if row[1] else row[0]
+            return pickle.loads(body)
+        except (sqlite3.Error, zlib.error, pickle.PickleError, EOFError) as e:
+            print(f"Error reading stored article {url}: {e}")
+            return None
+
+    def has(self, kind, url):
+        try:
+            row = self._connection().execute(
+                'SELECT 1 FROM articles WHERE key = ? AND accessed >= ?', (self.key(kind, url), self._oldest())
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error checking stored article {url}: {e}")
+            return False
+        return row is not None
+
+    def put(self, kind, url, article):
+        body = pickle.dumps(article, pickle.HIGHEST_PROTOCOL)
+        if self.compress:
+            body = zlib.compress(body)
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute(
+                'INSERT OR REPLACE INTO articles (key, kind, url, body, compressed, size, stored, accessed) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (self.key(kind, url), kind, url, body, int(self.compress), len(body), now, now)
+            )
+            self._evict()
+        except sqlite3.Error as e:
+            print(f"Error storing article {url}: {e}")
+
+    def _oldest(self):
+        return time.time() - self.max_age if self.max_age else 0
+
+    def _evict(self):
+        connection = self._connection()
+        connection.execute('DELETE FROM articles WHERE accessed < ?', (self._oldest(),))
+        total_size = connection.execute('SELECT COALESCE(SUM(size), 0) FROM articles').fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in connection.execute('SELECT key, size FROM articles ORDER BY accessed'):
+            if total_size <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total_size -= size
+        connection.executemany('DELETE FROM articles WHERE key = ?', evicted)
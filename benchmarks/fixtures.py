@@ -0,0 +1,203 @@
+"""Recorded responses for running the scrapers offline.
+
+A fixture directory holds manifest.json, with one entry per request
+recorded: method, host, path and query, a hash of the request body, and the
+status, headers and time the response came with. The response bodies sit
+under bodies/, named by their hash. recording_middleware() fills a
+directory from live requests. start_replay_server() answers from it, and
+replay_middleware() points the app's requests at that server. See
+benchmarks/scrapers.py for both in use.
+
+The replay server listens on one port per recorded host, so the app's
+per-host connection limits hold as they do against the real sites. Each
+response waits its recorded time, scaled by latency_scale, and conditional
+requests are answered 304 as the site would. Query parameters named in
+SECRET_PARAMETERS are neither stored nor matched, so API keys never reach
+the directory. robots.txt is not recorded: a replayed Crawl-delay would
+only measure the rate limiter's waiting.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+
+from aiohttp import web
+from yarl import URL
+
+SECRET_PARAMETERS = ('key', 'api_key', 'access_token')
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Location', 'Retry-After')
+
+
+def request_target(url):
+    # Path and query of a request, secrets left out. The query is rebuilt
+    # only to drop them: some sites' queries do not survive re-encoding.
+    if any(name in SECRET_PARAMETERS for name in url.query):
+        url = url.with_query([(name, value) for name, value in url.query.items() if name not in SECRET_PARAMETERS])
+    target = url.raw_path_qs
+    return target if target.startswith('/') else f"/{target}"
+
+
+def body_hash(body):
+    return hashlib.sha256(body).hexdigest() if body else ''
+
+
+class FixtureStore:
+    """The responses recorded into one fixture directory, looked up by
+    method, host, target and request body. A request whose body was not
+    recorded falls back to the same request with any body, so a form posted
+    with fresh state still finds its page. article_urls keeps the article
+    each article scraper was recorded reading, by scraper name.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.article_urls = {}
+        self.requests = 0
+        self.missing = []
+        self._entries = {}
+        self._lock = threading.Lock()
+        path = os.path.join(directory, 'manifest.json')
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            self.article_urls = manifest.get('article_urls', {})
+            for entry in manifest['entries']:
+                self._entries[self._key(entry)] = entry
+
+    @staticmethod
+    def _key(entry):
+        return entry['method'], entry['host'], entry['target'], entry['request_body']
+
+    def hosts(self):
+        return sorted({entry['host'] for entry in self._entries.values()})
+
+    def add(self, method, url, request_body, status, headers, body, elapsed):
+        digest = hashlib.sha256(body).hexdigest()
+        path = os.path.join(self.directory, 'bodies', digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(body)
+        entry = {
+            'method': method,
+            'host': url.host,
+            'target': request_target(url),
+            'request_body': body_hash(request_body),
+            'status': status,
+            'headers': {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+            'body': digest,
+            'elapsed': round(elapsed, 4),
+        }
+        with self._lock:
+            self._entries[self._key(entry)] = entry
+
+    def find(self, method, host, target, request_body):
+        with self._lock:
+            self.requests += 1
+            entry = self._entries.get((method, host, target, request_body))
+            if entry is None:
+                entry = next((entry for key, entry in self._entries.items() if key[:3] == (method, host, target)), None)
+            if entry is None:
+                self.missing.append(f"{method} {host}{target}")
+            return entry
+
+    def body(self, entry):
+        with open(os.path.join(self.directory, 'bodies', entry['body']), 'rb') as f:
+            return f.read()
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            entries = sorted(self._entries.values(), key=self._key)
+        tmp_path = os.path.join(self.directory, f"manifest.json.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'article_urls': self.article_urls, 'entries': entries}, f, indent=1)
+        os.replace(tmp_path, os.path.join(self.directory, 'manifest.json'))
+
+
+def recording_middleware(store):
+    async def record(request, handler):
+        started = time.perf_counter()
+        url = request.url
+        request_body = await request.body.as_bytes() if request.body else b''
+        response = await handler(request)
+        # Read here so the time includes the body; the caller reads it again
+        # from aiohttp's copy.
+        body = await response.read()
+        # A 304 only confirms what was recorded; the replay server answers
+        # conditional requests itself.
+        if response.status != 304 and url.path != '/robots.txt':
+            store.add(request.method, url, request_body, response.status, response.headers, body,
+                      time.perf_counter() - started)
+        return response
+    return record
+
+
+def replay_middleware(addresses):
+    # addresses: replay server URL per host, as start_replay_server returns.
+    async def replay(request, handler):
+        # Only where the request connects changes: its Host header still
+        # names the site, and the response keeps the original URL.
+        base = addresses.get(request.url.host) or addresses[None]
+        request.url = URL.build(scheme=base.scheme, host=base.host, port=base.port, path=request.url.raw_path,
+                                query_string=request.url.raw_query_string, encoded=True)
+        return await handler(request)
+    return replay
+
+
+def replay_application(store, latency_scale=1.0):
+    async def respond(request):
+        if request.path == '/robots.txt':
+            return web.Response(status=404)
+        host = request.host.rsplit(':', 1)[0]
+        entry = store.find(request.method, host, request_target(request.rel_url), body_hash(await request.read()))
+        if entry is None:
+            return web.Response(status=404)
+        if latency_scale:
+            await asyncio.sleep(entry['elapsed'] * latency_scale)
+        headers = entry['headers']
+        if (headers.get('ETag') and request.headers.get('If-None-Match') == headers['ETag']) or \
+                (headers.get('Last-Modified') and request.headers.get('If-Modified-Since') == headers['Last-Modified']):
+            return web.Response(status=304, headers=headers)
+        return web.Response(status=entry['status'], body=store.body(entry), headers=headers)
+
+    application = web.Application()
+    application.router.add_route('*', '/{target:.*}', respond)
+    return application
+
+
+def start_replay_server(store, latency_scale=1.0):
+    # Serves on a daemon thread; returns the URL to reach each recorded host
+    # at, and under None the one for any other host.
+    addresses = {}
+    ready = threading.Event()
+    errors = []
+
+    async def serve():
+        runner = web.AppRunner(replay_application(store, latency_scale), access_log=None)
+        await runner.setup()
+        for host in store.hosts() + [None]:
+            known = set(runner.addresses)
+            await web.TCPSite(runner, '127.0.0.1', 0).start()
+            address, port = (set(runner.addresses) - known).pop()[:2]
+            addresses[host] = URL.build(scheme='http', host=address, port=port)
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(serve())
+        except Exception as e:
+            errors.append(e)
+            return
+        finally:
+            ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, name='replay-server', daemon=True).start()
+    ready.wait()
+    if errors:
+        raise errors[0]
+    return addresses
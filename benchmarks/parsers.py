@@ -0,0 +1,127 @@
+"""Compare the scoped, backend-selected parsers in page_parsers.py with the
+original full-page html.parser parse.
+
+Each page is fetched once (or read from --pages DIR/<name>.html), then every
+parser is timed twice: as it was originally (the whole document through
+html.parser) and as the app runs it now (HTML_PARSER plus its SoupStrainer).
+The outputs of both runs are compared so a faster parse never changes what
+the dashboard shows.
+
+    python benchmarks/parsers.py [--pages DIR] [--save DIR] [--repeat N]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+import page_parsers  # noqa: E402
+
+PAGES = {
+    'air_daily': ('https://www.newsonair.gov.in/listen-broadcast-category/daily-broadcast/',
+                  lambda content: page_parsers.parse_air_rows(content, 'air_daily')),
+    'air_weekly': ('https://www.newsonair.gov.in/listen-broadcast-category/weekly-broadcast/',
+                   lambda content: page_parsers.parse_air_rows(content, 'air_weekly')),
+    'pib_backgrounders': ('https://www.pib.gov.in/ViewBackgrounder.aspx?MenuId=51&reg=3&lang=1',
+                          page_parsers.parse_pib_form),
+    'mea': (app.BASE_URL_MEA,
+            lambda content: page_parsers.parse_page_mea(content, datetime(2000, 1, 1, tzinfo=timezone.utc))),
+    'prs_india': (page_parsers.PRS_INDIA_URL, page_parsers.parse_prs_india),
+    'prs_bills': ('https://prsindia.org/billtrack/category/billtrack', page_parsers.parse_prs_bills),
+    'iasgyan': ('https://www.iasgyan.in/daily-current-affairs', page_parsers.parse_current_affairs_iasgyan),
+    'sansad_tv': ('https://www.iasgyan.in/sansad-tv-air-summaries', page_parsers.parse_sansad_tv_summaries),
+    'indian_express': ('https://indianexpress.com/section/upsc-current-affairs/upsc-essentials/',
+                       page_parsers.parse_indian_express_articles),
+    'insights': ('https://www.insightsonindia.com/upsc-mains-answer-writing-2025-insights-ias/',
+                 page_parsers.parse_insights_articles),
+    'orf': ('https://www.orfonline.org/content-type/issue-briefs', page_parsers.parse_orf_articles),
+    'forumias': ('https://forumias.com/blog/7pm/', lambda content: page_parsers.parse_forumias(content, '7pm')),
+}
+
+
+def original_make_soup(content, parse_only=None):
+    return BeautifulSoup(content, 'html.parser')
+
+
+def normalize(value):
+    # Parsers stamp undated items with now(), which differs between runs.
+    if isinstance(value, datetime):
+        return value.replace(second=0, microsecond=0)
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    return value
+
+
+async def fetch_pages(names):
+    pages = {}
+    async with aiohttp.ClientSession(headers=app.HTTP_HEADERS, timeout=app.HTTP_TIMEOUT) as session:
+        for name in names:
+            url = PAGES[name][0]
+            try:
+                async with session.get(url, ssl=False) as response:
+                    if response.status != 200:
+                        print(f"{name}: HTTP {response.status}, skipped")
+                        continue
+                    pages[name] = await response.text()
+            except Exception as e:
+                print(f"{name}: {e}, skipped")
+    return pages
+
+
+def load_pages(directory, names):
+    pages = {}
+    for name in names:
+        path = os.path.join(directory, f"{name}.html")
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                pages[name] = f.read()
+    return pages
+
+
+def timed(parse_function, content, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = parse_function(content)
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', help='read saved pages from this directory instead of fetching')
+    parser.add_argument('--save', help='save fetched pages to this directory')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('names', nargs='*', default=list(PAGES))
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.names) if args.pages else asyncio.run(fetch_pages(args.names))
+    if args.save:
+        os.makedirs(args.save, exist_ok=True)
+        for name, content in pages.items():
+            with open(os.path.join(args.save, f"{name}.html"), 'w', encoding='utf-8') as f:
+                f.write(content)
+
+    print(f"backend: {page_parsers.HTML_PARSER}")
+    print(f"{'page':<18} {'KiB':>7} {'original ms':>12} {'scoped ms':>10} {'speedup':>8}  output")
+    scoped_make_soup = page_parsers.make_soup
+    for name, content in pages.items():
+        parse_function = PAGES[name][1]
+        page_parsers.make_soup = original_make_soup
+        original_time, original_result = timed(parse_function, content, args.repeat)
+        page_parsers.make_soup = scoped_make_soup
+        scoped_time, scoped_result = timed(parse_function, content, args.repeat)
+        same = 'same' if normalize(original_result) == normalize(scoped_result) else 'DIFFERENT'
+        print(f"{name:<18} {len(content) / 1024:>7.0f} {original_time * 1000:>12.1f} "
+              f"{scoped_time * 1000:>10.1f} {original_time / scoped_time:>7.1f}x  {same}")
+
+
+if __name__ == '__main__':
+    main()
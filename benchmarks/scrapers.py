@@ -0,0 +1,281 @@
+"""Benchmark every scraper offline against recorded responses.
+
+--record runs each scraper once against the live sites. Every response is
+kept in the fixture directory (benchmarks/fixtures by default), along with
+the first Indian Express and Insights articles listed and the --th-url
+article, for the article scrapers to read. Without --record nothing leaves
+the machine: a local replay server answers every request (see fixtures.py),
+and the script reports
+
+  * index(): the first dashboard load, which waits out the first refresh of
+    every source, then the cached page and an uncached render;
+  * per scraper: its time with empty caches (cold) and straight after (warm,
+    pages revalidated and parses reused), and the requests it made;
+  * per page parsed: parse time, throughput and peak memory.
+
+--save writes what each scraper extracted and --compare checks a run
+against an earlier --save, so a change can be shown to be faster with the
+same output. Compare runs from the same day: listings are cut off by age.
+--check only runs each scraper once and fails if any extracted nothing, as
+happens when a site's layout has changed under a parser.
+
+Fixtures are not committed: they are copies of the sites' pages, and go
+stale as the sites change. Record a set before a first run, and again
+after a parser is changed for a new layout.
+
+The app runs in a scratch directory, so its caches and stores start empty
+and the working tree is left alone. Requests are not spaced out unless
+HTTP_HOST_INTERVAL is set, and YouTube playlists, which need an API key and
+the user's own playlists, are left out.
+
+    python benchmarks/scrapers.py --record [--th-url URL] [--fixtures DIR] [names...]
+    python benchmarks/scrapers.py [--fixtures DIR] [--repeat N] [--latency-scale X]
+                                  [--save FILE] [--compare FILE] [names...]
+    python benchmarks/scrapers.py --check [--fixtures DIR] [names...]
+"""
+import argparse
+import asyncio
+import atexit
+import functools
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import FixtureStore, recording_middleware, replay_middleware, start_replay_server  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SKIPPED_SOURCES = ('playlists',)
+
+app = None
+
+
+def import_app(replay):
+    # app reads its settings and opens its stores on import, relative to the
+    # working directory.
+    global app
+    os.environ.setdefault('ARCHIVE_BACKFILL', '0')
+    os.environ.setdefault('ARTICLE_PREFETCH', '0')
+    os.environ.setdefault('LOG_JSON', '0')
+    os.environ.setdefault('RATE_LIMIT_PATH', '')
+    if replay:
+        os.environ.setdefault('HTTP_HOST_INTERVAL', '0')
+    directory = tempfile.mkdtemp(prefix='scrapers-')
+    # Registered first so it runs after the app's own exit handlers.
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    os.chdir(directory)
+    import app as app_module
+    app = app_module
+
+
+def article_scrapers():
+    scrapers = {kind: scrape_function for kind, _, scrape_function in app.article_prefetchers().values()}
+    scrapers['th_learning'] = app.scrape_TH_learning
+    return scrapers
+
+
+def scrapers(store, names):
+    functions = {name: function for name, function in app.dashboard_sources().items() if name not in SKIPPED_SOURCES}
+    for kind, url in store.article_urls.items():
+        functions[kind] = functools.partial(article_scrapers()[kind], url)
+    return {name: function for name, function in functions.items() if not names or name in names}
+
+
+def normalize(value):
+    # Undated items are stamped with now(), which differs between runs.
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()[:16]
+    if isinstance(value, dict):
+        return {str(key): normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    return value
+
+
+async def record(store, names, th_url):
+    app.http_middlewares.append(recording_middleware(store))
+    functions = scrapers(store, names)
+    listings = {}
+    for name, function in functions.items():
+        print(f"recording {name}")
+        listings[name] = await function()
+    for name, (kind, url_field, _) in app.article_prefetchers().items():
+        url = next((item.get(url_field) for item in listings.get(name) or []
+                    if str(item.get(url_field, '')).startswith('http')), None)
+        if url:
+            store.article_urls[kind] = url
+    if th_url:
+        store.article_urls['th_learning'] = th_url
+    for kind, url in store.article_urls.items():
+        if kind not in functions and (not names or kind in names):
+            print(f"recording {kind}")
+            await article_scrapers()[kind](url)
+    await app.close_http_session()
+    app.shutdown_parse_pool()
+
+
+def reset_caches(run):
+    app.cache.clear()
+    shutil.rmtree(app.HTTP_CACHE_DIR, ignore_errors=True)
+    app._parsed_results.clear()
+    app.article_store = app.ArticleStore(path=f"articles-{run}.sqlite3")
+
+
+def run_scraper(function, parses=None):
+    # On the scraper loop, as the app runs them; parse_html is wrapped to
+    # keep what was parsed.
+    original_parse_html = app.parse_html
+
+    async def capturing_parse_html(parse_function, content, *args):
+        parses.append((parse_function, content, args))
+        return await original_parse_html(parse_function, content, *args)
+
+    if parses is not None:
+        app.parse_html = capturing_parse_html
+    try:
+        started = time.perf_counter()
+        result = app.submit_to_scraper_loop(function()).result()
+        return time.perf_counter() - started, result
+    finally:
+        app.parse_html = original_parse_html
+
+
+def time_parse(parse_function, content, args, repeat):
+    tracemalloc.start()
+    parse_function(content, *args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        parse_function(content, *args)
+    return (time.perf_counter() - started) / repeat, peak
+
+
+def benchmark_index(repeat):
+    client = app.app.test_client()
+    started = time.perf_counter()
+    response = client.get('/', buffered=False)
+    chunks = iter(response.response)
+    next(chunks, None)
+    shell = time.perf_counter() - started
+    for _ in chunks:
+        pass
+    response.close()
+    complete = time.perf_counter() - started
+    app._snapshot_ready.wait(app.COLD_START_WAIT)
+    with app.app.test_request_context('/'):
+        cache_key = app.index_cache_key()
+    cached, uncached = [], []
+    for _ in range(repeat):
+        app.cache.delete(cache_key)
+        started = time.perf_counter()
+        client.get('/').get_data()
+        uncached.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        client.get('/').get_data()
+        cached.append(time.perf_counter() - started)
+    print(f"{'index()':<28} {'ms':>8}")
+    print(f"{'first load, page shell':<28} {shell * 1000:8.1f}")
+    print(f"{'first load, every section':<28} {complete * 1000:8.1f}")
+    print(f"{'uncached render (median)':<28} {statistics.median(uncached) * 1000:8.1f}")
+    print(f"{'cached (median)':<28} {statistics.median(cached) * 1000:8.1f}")
+
+
+def benchmark(store, args):
+    app.http_middlewares.append(replay_middleware(start_replay_server(store, args.latency_scale)))
+    benchmark_index(args.repeat)
+
+    outputs, parsed = {}, {}
+    print(f"\n{'scraper':<20} {'cold ms':>8} {'warm ms':>8} {'requests':>9}")
+    for name, function in scrapers(store, args.names).items():
+        cold, warm = [], []
+        requests = store.requests
+        for run in range(args.repeat):
+            reset_caches(run)
+            parses = [] if run == 0 else None
+            seconds, result = run_scraper(function, parses)
+            cold.append(seconds)
+            if run == 0:
+                requests = store.requests - requests
+                outputs[name] = normalize(result)
+                parsed[name] = parses
+            warm.append(run_scraper(function)[0])
+        print(f"{name:<20} {statistics.median(cold) * 1000:8.1f} {statistics.median(warm) * 1000:8.1f} "
+              f"{requests:9}")
+
+    print(f"\n{'scraper':<20} {'parser':<34} {'KiB':>6} {'ms':>7} {'MB/s':>6} {'peak MiB':>9}")
+    for name, parses in parsed.items():
+        for parse_function, content, parse_args in parses:
+            seconds, peak = time_parse(parse_function, content, parse_args, args.repeat)
+            size = len(content.encode('utf-8')) if isinstance(content, str) else len(content)
+            print(f"{name:<20} {parse_function.__name__:<34} {size / 1024:6.0f} {seconds * 1000:7.1f} "
+                  f"{size / seconds / 1e6:6.1f} {peak / 2 ** 20:9.1f}")
+
+    if store.missing:
+        print(f"\n{len(store.missing)} requests had no fixture, e.g. {store.missing[0]}")
+    outputs = json.loads(json.dumps(outputs, default=str))
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(outputs, f, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        for name, output in outputs.items():
+            status = 'not in baseline' if name not in baseline else 'same' if baseline[name] == output else 'DIFFERENT'
+            print(f"{name:<20} {status}")
+
+
+def check(store, args):
+    app.http_middlewares.append(replay_middleware(start_replay_server(store, latency_scale=0)))
+    empty = []
+    for name, function in scrapers(store, args.names).items():
+        reset_caches(0)
+        result = run_scraper(function)[1]
+        if not result:
+            empty.append(name)
+        print(f"{name:<20} {'EMPTY' if not result else 'ok'}")
+    if empty:
+        sys.exit(f"{len(empty)} scrapers extracted nothing: {', '.join(empty)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--record', action='store_true', help='record fixtures from the live sites')
+    parser.add_argument('--th-url', help='The Hindu Learning Corner article to record')
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--latency-scale', type=float, default=1.0,
+                        help='share of the recorded response time to wait before replying; 0 replies at once')
+    parser.add_argument('--check', action='store_true', help='fail if any scraper extracts nothing')
+    parser.add_argument('--save', help='write what each scraper extracted to this file')
+    parser.add_argument('--compare', help='compare what each scraper extracted with an earlier --save')
+    parser.add_argument('names', nargs='*')
+    args = parser.parse_args()
+    for option in ('fixtures', 'save', 'compare'):
+        if getattr(args, option):
+            setattr(args, option, os.path.abspath(getattr(args, option)))
+
+    store = FixtureStore(args.fixtures)
+    import_app(replay=not args.record)
+    if args.record:
+        asyncio.run(record(store, args.names, args.th_url))
+        store.save()
+        print(f"saved {len(store.hosts())} hosts to {args.fixtures}")
+    else:
+        if not store.hosts():
+            sys.exit(f"no fixtures in {args.fixtures}; record some with --record")
+        if args.check:
+            check(store, args)
+        else:
+            benchmark(store, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Query latency of the search index over a year of synthetic documents.
+
+Builds an index shaped like a year of scraping (--per-day listing items a
+day spread over the sources, a share of them with full article bodies), or
+opens an existing one with --index, then times a mix of queries: everyday
+and subject words, phrases, words typed half way, each unfiltered and with
+a source or date filter. Reports p50/p99/max per kind; the index is meant
+to answer at p99 within 50 ms.
+
+    python benchmarks/search.py [--index PATH] [--days N] [--per-day N] [--bodies SHARE] [--repeat N]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex  # noqa: E402
+
+SOURCES = ('indian_express', 'orf', 'pib_backgrounders', 'pib_facts', 'mea', 'prs_bills', 'forumias',
+           'insights', 'iasgyan', 'air_spotlight')
+# Word frequencies follow Zipf's law over a made-up vocabulary; the real
+# words queried sit at ranks typical for them in news text, the everyday
+# words near the top and the subject words further down.
+VOCABULARY_SIZE = 20000
+COMMON_WORDS = (
+    'government', 'policy', 'reform', 'scheme', 'report', 'ministry', 'states', 'union', 'court', 'bill',
+    'parliament', 'development', 'sector', 'growth', 'investment', 'security', 'trade', 'energy',
+)
+COMMON_RANK = 40
+TOPICS = (
+    'monsoon', 'inflation', 'semiconductor', 'judiciary', 'federalism', 'biodiversity', 'cybersecurity',
+    'agriculture', 'fiscal deficit', 'election commission', 'climate finance', 'critical minerals',
+    'digital public infrastructure', 'groundwater', 'space station', 'quad summit', 'panchayati raj',
+    'monetary policy', 'green hydrogen', 'tribal rights', 'coastal erosion', 'skill development',
+)
+TOPIC_RANK = 400
+QUERIES = {
+    'common word': ['government', 'policy', 'ministry', 'development'],
+    'rare word': ['semiconductor', 'groundwater', 'panchayati', 'cybersecurity'],
+    'phrase': ['fiscal deficit', 'election commission', 'green hydrogen', 'critical minerals'],
+    'typing': ['mon', 'infl', 'climate fin', 'digital public infra'],
+}
+
+
+def vocabulary():
+    words = [f"w{rank}" for rank in range(VOCABULARY_SIZE)]
+    words[COMMON_RANK:COMMON_RANK + len(COMMON_WORDS)] = COMMON_WORDS
+    topic_words = sorted({word for topic in TOPICS for word in topic.split()} - set(COMMON_WORDS))
+    words[TOPIC_RANK:TOPIC_RANK + len(topic_words)] = topic_words
+    weights, total = [], 0.0
+    for rank in range(VOCABULARY_SIZE):
+        total += 1 / (rank + 1)
+        weights.append(total)
+    return words, weights
+
+
+def build(index, days, per_day, bodies, seed=1):
+    generator = random.Random(seed)
+    words, weights = vocabulary()
+    text = lambda count: ' '.join(generator.choices(words, cum_weights=weights, k=count))
+    start = date.today() - timedelta(days=days)
+    count = 0
+    for day in range(days):
+        day_date = (start + timedelta(days=day)).isoformat()
+        documents = []
+        for _ in range(per_day):
+            topic = generator.choice(TOPICS)
+            document = {
+                'url': f"https://example.org/{count}",
+                'title': f"{topic.title()} {text(6)}",
+                'summary': f"{text(12)} {topic} {text(12)}",
+                'date': day_date,
+            }
+            if generator.random() < bodies:
+                document['body'] = f"{topic} {text(generator.randint(300, 900))}"
+            documents.append((generator.choice(SOURCES), document))
+            count += 1
+        for source in SOURCES:
+            index.add(source, [document for document_source, document in documents if document_source == source])
+    return count
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(share * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--index', help="existing index to query instead of a synthetic one")
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--per-day', type=int, default=100, help="documents listed per day across the sources")
+    parser.add_argument('--bodies', type=float, default=0.2, help="share of documents with a full body")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.index:
+        index = SearchIndex(args.index)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), 'search.sqlite3')
+        index = SearchIndex(path)
+        started = time.perf_counter()
+        count = build(index, args.days, args.per_day, args.bodies)
+        print(f"indexed {count} documents in {time.perf_counter() - started:.1f} s "
+              f"({os.path.getsize(path) / 1e6:.0f} MB)")
+
+    # The first query of a process loads the source and date of every
+    # document; later ones only read what was added since.
+    started = time.perf_counter()
+    index.search('warm up')
+    print(f"first query {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    month_ago = (date.today() - timedelta(days=30)).isoformat()
+    filters = {
+        'no filter': {},
+        'one source': {'sources': ('indian_express',)},
+        'last month': {'date_from': month_ago},
+    }
+    all_timings = []
+    print(f"{'query':<14} {'filter':<11} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'hits':>7}")
+    for kind, queries in QUERIES.items():
+        for name, options in filters.items():
+            timings, hits = [], 0
+            for _ in range(args.repeat):
+                for query in queries:
+                    started = time.perf_counter()
+                    results = index.search(query, **options)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    hits = max(hits, results['total'])
+            all_timings.extend(timings)
+            print(f"{kind:<14} {name:<11} {statistics.median(timings):8.1f} {percentile(timings, 0.99):8.1f} "
+                  f"{max(timings):8.1f} {hits:7}")
+    print(f"{'all':<26} {statistics.median(all_timings):8.1f} {percentile(all_timings, 0.99):8.1f} "
+          f"{max(all_timings):8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Import time and memory of the app and of each integration it loads.
+
+Every measurement runs in a fresh interpreter, since a module is only
+imported once per process: the interpreter's own RSS is read first, then
+the integration's modules are imported and the time taken and the RSS
+added are reported, as the median of --repeat runs. app is imported from a
+scratch directory so its stores open empty. Spawned parse workers import
+only page_parsers, so its row is the cost of each worker. app no longer
+imports playwright; where it is installed, its row shows the saving.
+
+    python benchmarks/startup.py [--repeat N] [names...]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INTEGRATIONS = {
+    'flask': ('flask', 'flask_caching'),
+    'aiohttp': ('aiohttp',),
+    'html parsing': ('bs4', 'lxml'),
+    'brotli': ('brotli',),
+    'dotenv': ('dotenv',),
+    'playwright': ('playwright.async_api', 'playwright_stealth'),
+    'page_parsers': ('page_parsers',),
+    'app': ('app',),
+}
+
+MEASURE = """
+import importlib, json, resource, sys, time
+scale = 1 if sys.platform == 'darwin' else 1024
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+started = time.perf_counter()
+try:
+    for name in sys.argv[1:]:
+        importlib.import_module(name)
+except ImportError as e:
+    print(json.dumps({'error': str(e)}))
+    sys.exit()
+seconds = time.perf_counter() - started
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+print(json.dumps({'seconds': seconds, 'bytes': after - before, 'rss': after}))
+"""
+
+
+def measure(modules, directory):
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    output = subprocess.run([sys.executable, '-c', MEASURE, *modules], cwd=directory, env=environment,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('names', nargs='*', default=list(INTEGRATIONS))
+    args = parser.parse_args()
+
+    print(f"{'integration':<14} {'import ms':>10} {'RSS MiB':>8} {'total RSS MiB':>14}")
+    for name in args.names:
+        runs = []
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory(prefix='startup-') as directory:
+                runs.append(measure(INTEGRATIONS[name], directory))
+            if 'error' in runs[-1]:
+                break
+        if 'error' in runs[-1]:
+            print(f"{name:<14} not installed ({runs[-1]['error']})")
+            continue
+        seconds = statistics.median(run['seconds'] for run in runs)
+        added = statistics.median(run['bytes'] for run in runs)
+        total = statistics.median(run['rss'] for run in runs)
+        print(f"{name:<14} {seconds * 1000:10.1f} {added / 2 ** 20:8.1f} {total / 2 ** 20:14.1f}")
+
+
+if __name__ == '__main__':
+    main()
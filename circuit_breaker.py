@@ -0,0 +1,71 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """Stops calling a failing source for a while. After failure_threshold
+    consecutive failures the breaker opens for base_backoff seconds, doubling
+    each time it re-opens up to max_backoff. Once the backoff has passed it
+    is half-open: a single probe call is let through, and its outcome either
+    closes the breaker or opens it again for longer.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, base_backoff=60, max_backoff=6 * 3600):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = self.CLOSED
+        self.failures = 0
+        self.total_failures = 0
+        self.backoff = 0
+        self.open_until = 0
+        self.last_error = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() < self.open_until:
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.backoff = 0
+            self.open_until = 0
+            self._probing = False
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self.failures += 1
+            self.total_failures += 1
+            self.last_error = str(error) if error is not None else None
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.backoff = min(self.max_backoff, self.backoff * 2 if self.backoff else self.base_backoff)
+                self.open_until = time.monotonic() + self.backoff
+                self.state = self.OPEN
+            self._probing = False
+
+    def status(self):
+        with self._lock:
+            retry_in = max(0, self.open_until - time.monotonic()) if self.state == self.OPEN else 0
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'total_failures': self.total_failures,
+                'backoff': self.backoff,
+                'retry_in': round(retry_in),
+                'last_error': self.last_error,
+            }
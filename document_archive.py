@@ -0,0 +1,138 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+
+class DocumentArchive:
+    """Every document a filtered listing has returned, kept in SQLite with an
+    FTS5 index over the titles. Each document records the year/month/day it
+    belongs to and the category it was listed under (a PIB ministry, a PRS
+    bill status). Once a period has been scraped in full it is marked
+    covered, and later queries over covered periods are answered from here
+    without asking the site. Categories asked for over a period not yet
+    covered are remembered, for the backfill to archive as well.
+    """
+
+    def __init__(self, path='archive.sqlite3'):
+        self.path = path
+        self._local = threading.local()
+        self._connection().executescript(
+            'CREATE TABLE IF NOT EXISTS documents ('
+            'id INTEGER PRIMARY KEY, source TEXT NOT NULL, url TEXT NOT NULL, title TEXT NOT NULL, '
+            'year INTEGER, month INTEGER, day INTEGER, category TEXT, position INTEGER NOT NULL, '
+            'data TEXT NOT NULL, first_seen REAL NOT NULL, UNIQUE (source, url));'
+            'CREATE INDEX IF NOT EXISTS documents_period ON documents (source, year, month, day);'
+            'CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5('
+            "title, content='documents', content_rowid='id');"
+            'CREATE TRIGGER IF NOT EXISTS documents_insert AFTER INSERT ON documents BEGIN '
+            'INSERT INTO documents_fts (rowid, title) VALUES (new.id, new.title); END;'
+            'CREATE TRIGGER IF NOT EXISTS documents_delete AFTER DELETE ON documents BEGIN '
+            "INSERT INTO documents_fts (documents_fts, rowid, title) VALUES ('delete', old.id, old.title); END;"
+            'CREATE TRIGGER IF NOT EXISTS documents_update AFTER UPDATE OF title ON documents BEGIN '
+            "INSERT INTO documents_fts (documents_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+            'INSERT INTO documents_fts (rowid, title) VALUES (new.id, new.title); END;'
+            'CREATE TABLE IF NOT EXISTS coverage ('
+            'source TEXT NOT NULL, category TEXT NOT NULL, year INTEGER NOT NULL, month INTEGER NOT NULL, '
+            'archived REAL NOT NULL, PRIMARY KEY (source, category, year, month)) WITHOUT ROWID;'
+            'CREATE TABLE IF NOT EXISTS wanted_categories ('
+            'source TEXT NOT NULL, category TEXT NOT NULL, PRIMARY KEY (source, category)) WITHOUT ROWID;'
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def add(self, source, documents, year=None, month=0, category='0', dates=None):
+        # dates holds a (year, month, day) per document where the listing
+        # shows one; the rest belong to the period queried.
+        now = time.time()
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            for position, document in enumerate(documents):
+                document_year, document_month, document_day = (dates[position] if dates else None) or (year, month or None, None)
+                connection.execute(
+                    'INSERT INTO documents (source, url, title, year, month, day, category, position, data, first_seen) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT (source, url) DO UPDATE SET title = excluded.title, data = excluded.data, '
+                    'year = COALESCE(excluded.year, year), month = COALESCE(excluded.month, month), '
+                    'day = COALESCE(excluded.day, day), '
+                    # A document seen under "all" keeps the category it was listed under.
+                    "category = CASE WHEN excluded.category = '0' THEN category ELSE excluded.category END",
+                    (source, document['url'], document.get('title') or '', document_year, document_month,
+                     document_day, category, position, json.dumps(document), now)
+                )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def mark_covered(self, source, year, month=0, category='0'):
+        # Called once a period has been read in full, whether or not it had
+        # any documents.
+        self._connection().execute(
+            'INSERT OR REPLACE INTO coverage (source, category, year, month, archived) VALUES (?, ?, ?, ?, ?)',
+            (source, category, year, month, time.time())
+        )
+
+    def covered(self, source, year, month=0, category='0', max_age=None):
+        # max_age is for listings whose entries still change, like the status
+        # of a bill; older coverage then no longer counts.
+        oldest = time.time() - max_age if max_age else 0
+        rows = self._connection().execute(
+            'SELECT month FROM coverage WHERE source = ? AND category = ? AND year = ? AND archived >= ?',
+            (source, category, year, oldest)
+        )
+        months = {row[0] for row in rows}
+        # A whole year covers each of its months, and twelve months a year.
+        return 0 in months or (month in months if month else set(range(1, 13)) <= months)
+
+    def want(self, source, category):
+        self._connection().execute(
+            'INSERT OR IGNORE INTO wanted_categories (source, category) VALUES (?, ?)', (source, category)
+        )
+
+    def wanted(self, source):
+        rows = self._connection().execute(
+            'SELECT category FROM wanted_categories WHERE source = ? ORDER BY category', (source,)
+        )
+        return [row[0] for row in rows]
+
+    def query(self, source, year=None, month=0, day=0, category='0', text=None, limit=500):
+        clauses = ['source = ?']
+        params = [source]
+        for column, value in (('year', year), ('month', month), ('day', day)):
+            if value:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if category and category != '0':
+            clauses.append('category = ?')
+            params.append(category)
+        match = self.match_expression(text)
+        if match:
+            clauses.append('id IN (SELECT rowid FROM documents_fts WHERE documents_fts MATCH ?)')
+            params.append(match)
+        rows = self._connection().execute(
+            f"SELECT data FROM documents WHERE {' AND '.join(clauses)} "
+            'ORDER BY year DESC, month DESC, day DESC, position LIMIT ?',
+            (*params, limit)
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    @staticmethod
+    def match_expression(text):
+        # Every word must appear, as a prefix, so "elect comm" finds
+        # "Election Commission"; quoting keeps FTS5 syntax out of user input.
+        words = re.findall(r'\w+', text or '')
+        return ' '.join(f'"{word}"*' for word in words)
@@ -0,0 +1,125 @@
+import math
+import threading
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Metric:
+    """One metric family: a counter, gauge or histogram with a fixed set of
+    label names, and one series per combination of label values seen.
+    """
+
+    def __init__(self, name, help_text, kind, label_names=(), buckets=None):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets) if buckets else None
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts, then the sum and count of observations.
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        with self._lock:
+            series = {key: list(value) if isinstance(value, list) else value for key, value in self._series.items()}
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(series.items()):
+            labels = list(zip(self.label_names, key))
+            if self.kind != 'histogram':
+                lines.append(f"{self.name}{format_labels(labels)} {format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(self.buckets, value):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels(labels + [('le', format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_bucket{format_labels(labels + [('le', '+Inf')])} {value[-1]}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {format_value(value[-2])}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {value[-1]}")
+        return '\n'.join(lines)
+
+
+class MetricsRegistry:
+    """The metrics of one process, rendered in the Prometheus text format.
+    Collectors registered with on_collect run just before each render, for
+    gauges that are read off other objects rather than updated as they go.
+    Each worker process keeps and serves its own series.
+    """
+
+    def __init__(self, prefix=''):
+        self.prefix = prefix
+        self._metrics = []
+        self._collectors = []
+
+    def _add(self, name, help_text, kind, label_names, buckets=None):
+        metric = Metric(f"{self.prefix}{name}", help_text, kind, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, label_names=()):
+        return self._add(name, help_text, 'counter', label_names)
+
+    def gauge(self, name, help_text, label_names=()):
+        return self._add(name, help_text, 'gauge', label_names)
+
+    def histogram(self, name, help_text, label_names=(), buckets=SECONDS_BUCKETS):
+        return self._add(name, help_text, 'histogram', label_names, buckets)
+
+    def on_collect(self, collector):
+        self._collectors.append(collector)
+        return collector
+
+    def render(self):
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"Error collecting metrics in {collector.__name__}: {e}")
+        return '\n'.join(metric.render() for metric in self._metrics) + '\n'
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label_value(value)}"' for name, value in labels) + '}'
+
+
+def escape_label_value(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(value)
@@ -0,0 +1,623 @@
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# The parsers for every page the scrapers read: each takes the page's HTML
+# and returns plain data. Large pages are parsed in app.py's process pool,
+# whose workers import this module alone, so it imports nothing from the app.
+
+# lxml builds trees several times faster than the pure-Python html.parser;
+# it is used when installed, and HTML_PARSER can force either backend.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = os.environ.get('HTML_PARSER', 'lxml')
+except ImportError:
+    HTML_PARSER = os.environ.get('HTML_PARSER', 'html.parser')
+
+
+def make_soup(content, parse_only=None):
+    # parse_only restricts the tree to the containers a parser actually reads.
+    return BeautifulSoup(content, HTML_PARSER, parse_only=parse_only)
+
+
+def parse_air_rows(content, url):
+    episodes = []
+    soup = make_soup(content, SoupStrainer('table', class_='table'))
+
+    table = soup.find('table', class_='table')
+    if not table:
+        print(f"Table not found on {url}")
+        return []
+
+    rows = table.find_all('tr')[1:] 
+    for row in rows:
+        cols = row.find_all('td')
+        if len(cols) < 4:
+            continue
+
+        title = cols[0].text.strip()
+        date_str = cols[1].text.strip()
+        time_str = cols[2].text.strip()
+
+        audio_tag = cols[3].find('audio')
+        audio_src = None
+        if audio_tag:
+            source_tag = audio_tag.find('source')
+            if source_tag and 'src' in source_tag.attrs:
+                audio_src = source_tag['src']
+
+        if not audio_src:
+            continue
+
+        try:
+            date_obj = datetime.strptime(f"{date_str} {time_str}", '%d %b %Y %H:%M')
+        except ValueError:
+            print(f"Could not parse date for AIR episode: {date_str} {time_str}")
+            continue
+
+        episodes.append({
+            'title': title,
+            'date': date_obj,
+            'audio_link': audio_src
+        })
+    return episodes
+
+
+def parse_pib_form(html):
+    soup = make_soup(html, SoupStrainer('input'))
+    form_data = {}
+    for input_tag in soup.find_all('input'):
+        if input_tag.get('name'):
+            form_data[input_tag.get('name')] = input_tag.get('value', '')
+    return form_data
+
+
+def parse_pib_results(post_content):
+    # None when the page has no results area at all, as opposed to a listing
+    # with no releases in it.
+    results = []
+    post_soup = make_soup(post_content, SoupStrainer('div', class_='content-area'))
+
+    content_area = post_soup.find('div', class_='content-area')
+    if content_area is None:
+        return None
+    for li in content_area.find_all('li'):
+        link_tag = li.find('a')
+        date_span = li.find('span', class_='publishdatesmall')
+
+        if link_tag and date_span:
+            href = link_tag.get('href', '')
+            if href and not href.startswith('http'):
+                if href.startswith('/'):
+                    href = f"https://www.pib.gov.in{href}"
+                else:
+                    href = f"https://www.pib.gov.in/{href}"
+
+            results.append({
+                'title': link_tag.text.strip(),
+                'url': href,
+                'date': date_span.text.replace('Posted on:', '').strip()
+            })
+    return results
+
+
+def parse_page_mea(content, days_ago_cutoff_date):
+    documents = []
+    continue_scraping = True 
+    if not content:
+        return documents, False, None
+
+    soup = make_soup(content, SoupStrainer(['ul', 'a'], class_=['commonListing', 'next']))
+    item_list = soup.find('ul', class_='commonListing')
+    
+    if item_list:
+        for item in item_list.find_all('li'):
+            title_link = item.find('a', class_='searchContent')
+            date_container = item.find('span', class_='date') 
+            
+            if title_link and date_container:
+                title = title_link.text.strip()
+                doc_url = title_link['href']
+                if not doc_url.startswith('http'):
+                    doc_url = f"https://www.mea.gov.in{doc_url}" if doc_url.startswith('/') else f"https://www.mea.gov.in/{doc_url}"
+                
+                date_str_raw = date_container.text.strip() 
+                
+                try:
+                    date_obj = datetime.strptime(date_str_raw, "%B %d, %Y").replace(tzinfo=timezone.utc)
+                    if date_obj >= days_ago_cutoff_date:
+                        documents.append({
+                            'title': title,
+                            'url': doc_url,
+                            'date': date_obj.strftime("%B %d, %Y") 
+                        })
+                    else:
+                        continue_scraping = False 
+                        break 
+                except ValueError:
+                    print(f"Error parsing MEA date: {date_str_raw} for title '{title}'")
+    else:
+        print("MEA commonListing not found.")
+        continue_scraping = False 
+
+    next_url = None
+    next_link = soup.find('a', class_='next')
+    if next_link and 'href' in next_link.attrs:
+        href = next_link['href']
+        if href.startswith('http'):
+            next_url = href
+        elif href.startswith('/'):
+            next_url = f"https://www.mea.gov.in{href}"
+        else:
+            next_url = f"https://www.mea.gov.in/bilateral-documents/{href}"
+    return documents, continue_scraping, next_url
+
+
+PRS_INDIA_URL = "https://prsindia.org"
+
+
+def parse_prs_india(content):
+    cards_data = []
+    url = PRS_INDIA_URL
+    soup = make_soup(content, SoupStrainer('div', class_='right-banner'))
+
+    right_banner = soup.find('div', class_='right-banner') 
+    if right_banner:
+        for item in right_banner.find_all(['div','section'], class_=re.compile(r"col-\w*-6|card-item-class")): 
+            image_tag = item.find('img')
+            link_tag = item.find('a')
+            title_tag = item.find(['h3','h4','h5']) 
+
+            if link_tag and title_tag: 
+                img_src = None
+                if image_tag and 'src' in image_tag.attrs:
+                    img_src = image_tag['src']
+                    if not img_src.startswith('http'):
+                        img_src = url + img_src if img_src.startswith('/') else url + '/' + img_src
+
+                link_href = link_tag['href']
+                if not link_href.startswith('http'):
+                    link_href = url + link_href if link_href.startswith('/') else url + '/' + link_href
+
+                cards_data.append({
+                    'title': title_tag.text.strip(),
+                    'image_url': img_src,
+                    'link_url': link_href
+                })
+    else:
+        print("PRS India: right-banner not found.")
+    return cards_data
+
+
+def parse_prs_bills(content):
+    bills_data = []
+    soup = make_soup(content, SoupStrainer('div', class_='views-row'))
+
+
+    for row in soup.find_all('div', class_='views-row'):
+
+        title_div = row.find('div', class_='views-field-title-field')
+        status_div = row.find('div', class_='views-field-field-bill-status')
+
+        if title_div and status_div:
+            title_tag = title_div.find('h3', class_='cate')
+            if title_tag and title_tag.a:
+                bill_url = title_tag.a['href']
+                if not bill_url.startswith('http'):
+                    bill_url = f"https://prsindia.org{bill_url}"
+
+                status_span = status_div.find('span')
+                status_text = status_span.text.strip() if status_span else "Unknown"
+
+                bills_data.append({
+                    'title': title_tag.a.text.strip(),
+                    'url': bill_url,
+                    'status': status_text
+                })
+    return bills_data
+
+
+def parse_prs_next_page(content):
+    soup = make_soup(content, SoupStrainer('ul', class_=re.compile('pager|pagination')))
+    link = soup.find('a', rel='next') or soup.select_one('li.next a, li.pager-next a, li.pager__item--next a')
+    return link.get('href') if link else None
+
+
+def parse_prs_bills_page(content):
+    return {'bills': parse_prs_bills(content), 'next': parse_prs_next_page(content)}
+
+
+def parse_current_affairs_iasgyan(content):
+    current_affairs_data = [] 
+    soup = make_soup(content, SoupStrainer('div', class_='shadow mt-4 rounded-2'))
+
+    cutoff_date_iasgyan = datetime.now() - timedelta(days=6)
+
+    for article_block in soup.find_all('div', class_='shadow mt-4 rounded-2'): 
+        title_tag_ias = article_block.find('h3', class_='fw-semibold text-white m-0 fs-5')
+        article_links_list = article_block.find_all('a', class_='w-100')
+
+        if title_tag_ias and article_links_list:
+            date_str_match = re.search(r'–\s*(.+)$', title_tag_ias.text.strip())
+            if not date_str_match: continue
+
+            date_str_cleaned = re.sub(r'(\d+)(st|nd|rd|th|TH|ND|RD|ST)\s*', r'\1 ', date_str_match.group(1).strip())
+            date_str_cleaned = date_str_cleaned.replace("  ", " ") 
+
+            try:
+                article_date_obj = datetime.strptime(date_str_cleaned.strip(), '%d %B %Y') 
+            except ValueError as ve:
+                print(f"IASGyan: Error parsing date '{date_str_cleaned}': {ve}")
+                continue
+
+            if article_date_obj >= cutoff_date_iasgyan:
+                articles_for_date = []
+                for link_item in article_links_list:
+                    articles_for_date.append({
+                        'title': link_item.text.strip(),
+                        'url': link_item['href'] if link_item.get('href') else '#'
+                    })
+                if articles_for_date: 
+                    current_affairs_data.append({
+                        'date': article_date_obj, 
+                        'articles': articles_for_date
+                    })
+    current_affairs_data.sort(key=lambda x: x['date'], reverse=True) 
+    return current_affairs_data
+
+
+def parse_sansad_tv_summaries(content):
+    summaries_data = []
+    soup = make_soup(content, SoupStrainer('div', class_='content_bx'))
+
+    for summary_block_item in soup.find_all('div', class_='content_bx'):
+        title_tag_sum = summary_block_item.find('div', class_='title').find('a') if summary_block_item.find('div', class_='title') else None
+        date_tag_sum = summary_block_item.find('li', class_='text-muted')
+        description_tag_sum = summary_block_item.find('div', class_='short_descr').find('ol') if summary_block_item.find('div', class_='short_descr') else None
+        read_more_tag_sum = summary_block_item.find('div', class_='readmore_btn').find('a') if summary_block_item.find('div', class_='readmore_btn') else None
+
+        if not (title_tag_sum and date_tag_sum and description_tag_sum and read_more_tag_sum):
+            continue 
+
+        title_text = title_tag_sum.text.strip()
+        doc_url_sum = title_tag_sum['href']
+
+        summary_date_str_raw = " ".join(date_tag_sum.text.strip().split()).replace(',', '') 
+        try:
+            if len(summary_date_str_raw.split()[1]) == 3:
+                 parsed_date_sum = datetime.strptime(summary_date_str_raw, '%d %b %Y')
+            else: 
+                 parsed_date_sum = datetime.strptime(summary_date_str_raw, '%d %B %Y')
+        except ValueError:
+            print(f"IASGyan Summaries: Could not parse date '{summary_date_str_raw}' for '{title_text}'")
+            parsed_date_sum = datetime.min 
+
+        summary_points_list = [li.text.strip() for li in description_tag_sum.find_all('li')]
+
+        summaries_data.append({
+            'title': title_text,
+            'url': doc_url_sum,
+            'date_obj': parsed_date_sum, 
+            'date': parsed_date_sum.strftime('%d %b %Y') if parsed_date_sum != datetime.min else summary_date_str_raw,
+            'points': summary_points_list,
+            'read_more_url': read_more_tag_sum['href']
+        })
+
+    summaries_data.sort(key=lambda x: x['date_obj'], reverse=True) 
+    return summaries_data[:3]
+
+
+def parse_indian_express_articles(content):
+    articles_data = []
+    soup = make_soup(content, SoupStrainer('div', class_='articles'))
+
+    one_week_ago_cutoff = datetime.now(timezone.utc) - timedelta(days=7)
+
+    for article_div in soup.find_all('div', class_='articles'):
+        try:
+            context_div = article_div.find('div', class_='img-context')
+            if not context_div: continue
+
+            title_tag = context_div.find('h2', class_='title').find('a')
+            if not title_tag: continue
+
+            title_text = title_tag.text.strip()
+            doc_url = title_tag['href']
+            date_div = context_div.find('div', class_='date')
+            date_str_raw = date_div.text.strip() if date_div else ""
+            summary_tag = context_div.find('p')
+            summary_text = summary_tag.text.strip() if summary_tag else ""
+            snaps_div = article_div.find('div', class_='snaps')
+            image_url = None
+            if snaps_div:
+                img = snaps_div.find('img')
+                if img:
+                    image_url = img.get('src') or img.get('data-src')
+            article_date_obj = None
+            clean_date_str = date_str_raw.replace('IST', '').strip()
+            clean_date_str = re.sub(r'\s+', ' ', clean_date_str)
+
+            try:
+                article_date_obj = datetime.strptime(clean_date_str, '%B %d, %Y %H:%M')
+            except ValueError:
+                try:
+                    article_date_obj = datetime.strptime(clean_date_str, '%B %d, %Y')
+                except ValueError:
+                    continue 
+            article_date_obj = article_date_obj.replace(tzinfo=timezone.utc)
+
+            if article_date_obj >= one_week_ago_cutoff:
+                articles_data.append({
+                    'title': title_text,
+                    'url': doc_url,
+                    'image_url': image_url,
+                    'date': date_str_raw,
+                    'summary': summary_text,
+                    'date_obj': article_date_obj 
+                })
+        except Exception as inner_e:
+            print(f"Error parsing specific IE article: {inner_e}")
+            continue
+
+    articles_data.sort(key=lambda x: x['date_obj'], reverse=True)
+    return articles_data
+
+
+ARTICLE_NOT_FOUND_HTML = "<p>Content not found. Please visit <a href='{url}'>original article</a>.</p>"
+
+
+def parse_full_article(content, url):
+    soup = make_soup(content)
+
+    content_div = soup.find('div', id='pcl-full-content') 
+    if not content_div: 
+        content_div = soup.find('article') or soup.find('main') or soup.find('div', class_=re.compile(r'content|article-body|story'))
+
+    if not content_div:
+        print(f"Could not find main content container for {url}")
+        return ARTICLE_NOT_FOUND_HTML.format(url=url)
+
+    title_tag_full = soup.find(['h1', 'h2'], class_=re.compile(r'title|headline')) 
+    if not title_tag_full: title_tag_full = soup.find('h1') 
+    title_text_full = title_tag_full.get_text(strip=True) if title_tag_full else "Article"
+
+    author_date_div = soup.find(['div','span'], class_=re.compile(r'editor|author|date|byline|meta')) 
+    author_date_text_full = author_date_div.get_text(separator=" ", strip=True) if author_date_div else ""
+
+
+    elements = content_div.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'blockquote', 'figure', 'table'])
+    formatted_content_parts = []
+    for elem in elements:
+        if elem.name in ['h1','h2','h3','h4','h5','h6']:
+            formatted_content_parts.append(f"<{elem.name}>{elem.get_text(strip=True)}</{elem.name}>")
+        elif elem.name == 'p':
+
+            if elem.find_parent('li'): 
+                continue 
+            formatted_content_parts.append(f"<p>{elem.get_text(separator=' ', strip=True)}</p>")
+        elif elem.name in ['ul', 'ol']:
+            list_items_html = "".join([f"<li>{li_item.get_text(separator=' ', strip=True)}</li>" for li_item in elem.find_all('li', recursive=False)])
+            formatted_content_parts.append(f"<{elem.name}>{list_items_html}</{elem.name}>")
+        elif elem.name == 'blockquote':
+            formatted_content_parts.append(f"<blockquote>{elem.get_text(separator=' ', strip=True)}</blockquote>")
+        elif elem.name == 'figure':
+            img = elem.find('img')
+            caption = elem.find('figcaption')
+            if img and 'src' in img.attrs:
+                img_html = f"<img src='{img['src']}' alt='{img.get('alt','Image')}' style='max-width:100%; height:auto;'>"
+                if caption:
+                    img_html += f"<figcaption>{caption.get_text(strip=True)}</figcaption>"
+                formatted_content_parts.append(f"<figure>{img_html}</figure>")
+        elif elem.name == 'table':
+            table_html = "<table>"
+            for tr in elem.find_all('tr'):
+                table_html += "<tr>"
+                for th_td in tr.find_all(['th', 'td']):
+                    table_html += f"<{th_td.name}>{th_td.get_text(strip=True)}</{th_td.name}>"
+                table_html += "</tr>"
+            table_html += "</table>"
+            formatted_content_parts.append(table_html)
+
+
+    full_article_html = f"<h1>{title_text_full}</h1>"
+    if author_date_text_full:
+        full_article_html += f"<div class='article-meta' style='color:grey; margin-bottom:1em;'>{author_date_text_full}</div>"
+    full_article_html += "\n".join(formatted_content_parts)
+
+    return full_article_html
+
+
+def parse_insights_articles(content):
+    articles_data_insights = []
+    soup = make_soup(content, SoupStrainer('div', class_='list_div'))
+    count = 0
+    for div_block in soup.find_all('div', class_='list_div'):
+        if count >= 2: break 
+
+        ul_tag = div_block.find('ul', class_='lcp_catlist')
+        if ul_tag:
+            for li in ul_tag.find_all('li'):
+                a_tag = li.find('a')
+                if a_tag and a_tag.get('href'):
+                    title = a_tag.text.strip()
+                    link = a_tag['href']
+                    articles_data_insights.append({
+                        'title': title,
+                        'link': link
+                    })
+            count += 1
+    return articles_data_insights
+
+
+INSIGHTS_ARTICLE_NOT_FOUND = [{'type': 'p', 'text': 'Article content not found.'}]
+
+
+def parse_full_article_insight(content, article_url):
+    filtered_content_parts = []
+    soup = make_soup(content)
+
+
+    article_body = soup.find('div', class_=re.compile(r'entry-content|article-content|post-content'))
+    if not article_body:
+        print(f"Insights: Could not find article body for {article_url}")
+        return INSIGHTS_ARTICLE_NOT_FOUND
+
+    current_section_text = None
+
+    for tag_item in article_body.find_all(['h1','h2','h3', 'h4', 'p', 'ul', 'ol', 'blockquote', 'table']):
+        if tag_item.name in ['h1','h2','h3','h4']: 
+            current_section_text = tag_item.text.strip()
+            filtered_content_parts.append({'type': tag_item.name, 'text': current_section_text})
+        elif tag_item.name == 'p':
+
+            filtered_content_parts.append({'type': 'p', 'text': tag_item.text.strip()})
+        elif tag_item.name in ['ul', 'ol']:
+            items = [li.get_text(strip=True) for li in tag_item.find_all('li')]
+            if items:
+                filtered_content_parts.append({'type': 'list', 'ordered': tag_item.name == 'ol', 'items': items})
+        elif tag_item.name == 'blockquote':
+            filtered_content_parts.append({'type': 'blockquote', 'text': tag_item.get_text(strip=True)})
+        elif tag_item.name == 'table':
+            rows = []
+            for tr in tag_item.find_all('tr'):
+                cells = [td.get_text(strip=True) for td in tr.find_all(['th', 'td'])]
+                rows.append(cells)
+            if rows:
+               filtered_content_parts.append({'type': 'table', 'rows': rows})
+    return filtered_content_parts
+
+
+def parse_orf_articles(content):
+    orf_articles_data = []
+    soup = make_soup(content, SoupStrainer('div', class_=re.compile(r'col-|card|item|listing|post')))
+
+    cutoff_orf = datetime.now(timezone.utc) - timedelta(days=45)
+
+    potential_articles = soup.find_all('div', class_=re.compile(r'col-|card|item|listing|post'))
+
+    for article_block in potential_articles:
+        title_tag = article_block.find(['h2', 'h3'])
+        if not title_tag: 
+            continue
+
+        title_text = title_tag.get_text(strip=True)
+        if not title_text or len(title_text) < 10: 
+            continue
+
+
+        link_tag = title_tag.find('a')
+        if not link_tag:
+
+            link_tag = article_block.find('a')
+
+        if not link_tag or not link_tag.get('href'):
+            continue
+
+        doc_url = link_tag['href']
+        if not doc_url.startswith('http'):
+            doc_url = f"https://www.orfonline.org{doc_url}" if doc_url.startswith('/') else f"https://www.orfonline.org/{doc_url}"
+
+
+        date_tag = article_block.find('time') or article_block.find(class_=re.compile(r'date|meta|time'))
+        article_date_obj = None
+
+        if date_tag:
+            date_str = date_tag.get_text(strip=True)
+            try:
+
+                article_date_obj = datetime.strptime(date_str, "%b %d, %Y").replace(tzinfo=timezone.utc)
+            except ValueError:
+                try:
+                    article_date_obj = datetime.strptime(date_str, "%d %B %Y").replace(tzinfo=timezone.utc)
+                except ValueError:
+                    pass 
+
+
+        if not article_date_obj:
+             article_date_obj = datetime.now(timezone.utc) 
+
+        if article_date_obj >= cutoff_orf:
+
+            desc_tag = article_block.find('p')
+            desc_text = desc_tag.get_text(strip=True) if desc_tag else ""
+
+
+            if any(a['link'] == doc_url for a in orf_articles_data):
+                continue
+
+            orf_articles_data.append({
+                'title': title_text,
+                'link': doc_url,
+                'date_obj': article_date_obj,
+                'date': article_date_obj.strftime('%B %d, %Y'),
+                'description': desc_text,
+                'author': "ORF" 
+            })
+
+    seen = set()
+    unique_data = []
+    for d in orf_articles_data:
+        if d['link'] not in seen:
+            seen.add(d['link'])
+            unique_data.append(d)
+            
+    unique_data.sort(key=lambda x: x['date_obj'], reverse=True)
+    return unique_data
+
+
+def forumias_section_title(url_path):
+    return f"ForumIAS {url_path.upper()} Editorials"
+
+
+def parse_forumias(html, url_path):
+    soup = make_soup(html, SoupStrainer('div', class_='cat-archive-date-group'))
+    
+    sections_data = []
+    articles_list = []
+    date_groups = soup.find_all('div', class_='cat-archive-date-group')
+    
+    for group in date_groups:
+        date_div = group.find('div', class_='post-date')
+        date_text = date_div.get_text(" ", strip=True) if date_div else ""
+        
+        links = group.find_all('a')
+        for a in links:
+            articles_list.append({
+                'title': a.get_text(strip=True),
+                'url': a.get('href'),
+                'date': date_text
+            })
+
+    if articles_list:
+        sections_data.append({
+            'section': forumias_section_title(url_path),
+            'articles': articles_list
+        })
+        
+    return sections_data
+
+
+def parse_TH_learning(content, article_url_th):
+    article_content_th = []
+    soup = make_soup(content)
+
+
+    main_content_area = soup.find('div', class_=re.compile(r'articlebody|content|story-body'))
+    if not main_content_area:
+         main_content_area = soup
+
+    for tag_item_th in main_content_area.find_all(['h1','h2','h3', 'h4', 'p', 'ul', 'ol']):
+        if tag_item_th.name in ['h1','h2','h3','h4']:
+            article_content_th.append({'type': tag_item_th.name, 'text': tag_item_th.text.strip()})
+        elif tag_item_th.name == 'p':
+            article_content_th.append({'type': 'p', 'text': tag_item_th.text.strip()})
+        elif tag_item_th.name in ['ul', 'ol']:
+            items = [li.get_text(strip=True) for li in tag_item_th.find_all('li')]
+            if items:
+                 article_content_th.append({'type':'list', 'ordered': tag_item_th.name=='ol', 'items':items})
+
+    if not article_content_th and main_content_area == soup:
+        print(f"TH Learning: No specific content tags found on {article_url_th}, page might be structured differently.")
+    return article_content_th
@@ -0,0 +1,251 @@
+import asyncio
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from urllib import robotparser
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """Token bucket per host, shared by every coroutine on the event loop and,
+    when given a path, by every worker process through a small SQLite table.
+    A host takes `burst` requests back to back and then one per interval; the
+    interval is the configured one or the site's robots.txt Crawl-delay,
+    whichever is longer, and it stretches while the site answers 429 or 503
+    and shrinks back as requests succeed again.
+
+    Waiters for a host are let through in priority order, lowest first, so a
+    page a user is waiting for goes ahead of queued background refreshes.
+    State is kept for the `max_hosts` most recently used hosts; shared rows
+    for hosts idle longer than `idle_ttl` are dropped.
+    """
+
+    def __init__(self, path=None, interval=1.0, burst=4, host_limits=None, fetch_robots=None,
+                 robots_ttl=24 * 3600, max_crawl_delay=30, max_penalty=16, max_retry_after=600,
+                 max_hosts=256, idle_ttl=3600):
+        self.path = path
+        self.interval = interval
+        self.burst = burst
+        self.host_limits = dict(host_limits or {})
+        self.fetch_robots = fetch_robots
+        self.robots_ttl = robots_ttl
+        self.max_crawl_delay = max_crawl_delay
+        self.max_penalty = max_penalty
+        self.max_retry_after = max_retry_after
+        self.max_hosts = max_hosts
+        self.idle_ttl = idle_ttl
+        self._hosts = OrderedDict()
+        self._updates = itertools.count(1)
+        self._buckets = {}
+        self._robots = {}
+        self._robots_pending = {}
+        self._queues = {}
+        self._dispatchers = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if path:
+            self._connection().execute(
+                'CREATE TABLE IF NOT EXISTS host_buckets ('
+                'host TEXT PRIMARY KEY, tat REAL NOT NULL, penalty REAL NOT NULL)'
+            )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _touch(self, host):
+        # Any host can be asked for, so the least recently used ones are
+        # forgotten, unless requests for them are still queued; a forgotten
+        # host starts again from a full bucket.
+        with self._lock:
+            self._hosts[host] = None
+            self._hosts.move_to_end(host)
+            for old_host in list(self._hosts):
+                if len(self._hosts) <= self.max_hosts:
+                    break
+                if old_host == host or old_host in self._dispatchers:
+                    continue
+                del self._hosts[old_host]
+                for state in (self._buckets, self._robots, self._robots_pending, self._queues):
+                    state.pop(old_host, None)
+
+    async def _update(self, host, update):
+        # update(tat, penalty) -> (tat, penalty, result), applied atomically
+        # against the shared table or, without one, the in-memory buckets.
+        if not self.path:
+            with self._lock:
+                tat, penalty = self._buckets.get(host, (0.0, 1.0))
+                tat, penalty, result = update(tat, penalty)
+                self._buckets[host] = (tat, penalty)
+            return result
+        # The transaction can wait on other workers' locks, so it runs off the
+        # event loop.
+        return await asyncio.to_thread(self._update_shared, host, update)
+
+    def _update_shared(self, host, update):
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute('SELECT tat, penalty FROM host_buckets WHERE host = ?', (host,)).fetchone()
+            tat, penalty, result = update(*(row or (0.0, 1.0)))
+            connection.execute(
+                'INSERT OR REPLACE INTO host_buckets (host, tat, penalty) VALUES (?, ?, ?)', (host, tat, penalty)
+            )
+            if next(self._updates) % self.max_hosts == 0:
+                connection.execute('DELETE FROM host_buckets WHERE tat < ?', (time.time() - self.idle_ttl,))
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        with self._lock:
+            self._buckets[host] = (tat, penalty)
+        return result
+
+    def limits(self, host):
+        interval, burst = self.host_limits.get(host, (self.interval, self.burst))
+        crawl_delay = self._robots.get(host, (None, 0))[0]
+        if crawl_delay:
+            # A Crawl-delay is a gap between requests, so no bursts either.
+            interval, burst = max(interval, crawl_delay), 1
+        return interval, burst
+
+    async def _reserve(self, host):
+        # Generic cell rate algorithm: tat is when the bucket would be full
+        # again. A request may start once it is at most burst - 1 intervals
+        # ahead of now, and each request pushes it one interval further.
+        interval, burst = self.limits(host)
+
+        def reserve(tat, penalty):
+            now = time.time()
+            step = interval * penalty
+            tat = max(tat, now)
+            start = max(now, tat - (burst - 1) * step)
+            return tat + step, penalty, start - now
+
+        return await self._update(host, reserve)
+
+    async def _load_robots(self, scheme, host):
+        crawl_delay = None
+        try:
+            text = await self.fetch_robots(f"{scheme}://{host}/robots.txt")
+            parser = robotparser.RobotFileParser()
+            parser.parse((text or '').splitlines())
+            delays = [parser.crawl_delay('*')]
+            request_rate = parser.request_rate('*')
+            if request_rate and request_rate.requests:
+                delays.append(request_rate.seconds / request_rate.requests)
+            delays = [float(delay) for delay in delays if delay]
+            if delays:
+                crawl_delay = min(max(delays), self.max_crawl_delay)
+        except Exception as e:
+            print(f"Error reading robots.txt for {host}: {e}")
+        self._robots[host] = (crawl_delay, time.monotonic() + self.robots_ttl)
+
+    async def _ensure_robots(self, scheme, host):
+        if self.fetch_robots is None or self._robots.get(host, (None, 0))[1] > time.monotonic():
+            return
+        pending = self._robots_pending.get(host)
+        if pending is None or pending.done() or pending.get_loop() is not asyncio.get_running_loop():
+            pending = asyncio.ensure_future(self._load_robots(scheme, host))
+            self._robots_pending[host] = pending
+        await asyncio.shield(pending)
+
+    async def acquire(self, url, priority=0):
+        parts = urlparse(url)
+        host = parts.netloc.lower()
+        if not host:
+            return
+        self._touch(host)
+        await self._ensure_robots(parts.scheme or 'https', host)
+        loop = asyncio.get_running_loop()
+        dispatcher = self._dispatchers.get(host)
+        if dispatcher is None or dispatcher.done() or dispatcher.get_loop() is not loop:
+            # Waiters left behind by a closed loop can never be served.
+            self._queues[host] = []
+            dispatcher = None
+        waiter = loop.create_future()
+        heapq.heappush(self._queues[host], (priority, next(self._sequence), waiter))
+        if dispatcher is None:
+            self._dispatchers[host] = loop.create_task(self._dispatch(host))
+        await waiter
+
+    async def _dispatch(self, host):
+        queue = self._queues[host]
+        try:
+            while True:
+                while queue and queue[0][2].done():
+                    heapq.heappop(queue)
+                if not queue:
+                    return
+                delay = await self._reserve(host)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # The slot goes to whoever has the highest priority now, which
+                # may have arrived while the previous one was being waited for.
+                while queue:
+                    waiter = heapq.heappop(queue)[2]
+                    if not waiter.done():
+                        waiter.set_result(None)
+                        break
+        finally:
+            if self._dispatchers.get(host) is asyncio.current_task():
+                del self._dispatchers[host]
+
+    async def record_response(self, url, status, retry_after=None):
+        host = urlparse(url).netloc.lower()
+        self._touch(host)
+        if status in (429, 503):
+            delay = self._retry_after_seconds(retry_after)
+
+            def slow_down(tat, penalty):
+                penalty = min(self.max_penalty, penalty * 2)
+                interval, burst = self.limits(host)
+                resume = time.time() + (delay if delay is not None else interval * penalty)
+                # No burst straight after the pause either.
+                return max(tat, resume + (burst - 1) * interval * penalty), penalty, None
+
+            await self._update(host, slow_down)
+        elif status < 400 and self._buckets.get(host, (0.0, 1.0))[1] > 1:
+            await self._update(host, lambda tat, penalty: (tat, max(1.0, penalty * 0.75), None))
+
+    def _retry_after_seconds(self, retry_after):
+        if not retry_after:
+            return None
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(seconds, 0), self.max_retry_after)
+
+    def status(self):
+        status = {}
+        with self._lock:
+            buckets = dict(self._buckets)
+        for host in sorted(set(buckets) | set(self._robots)):
+            interval, burst = self.limits(host)
+            penalty = buckets.get(host, (0.0, 1.0))[1]
+            status[host] = {
+                'interval': interval * penalty,
+                'burst': burst,
+                'crawl_delay': self._robots.get(host, (None, 0))[0],
+                'penalty': penalty,
+                'queued': sum(1 for entry in self._queues.get(host, []) if not entry[2].done()),
+            }
+        return status
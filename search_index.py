@@ -0,0 +1,190 @@
+import collections
+import heapq
+import operator
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from markupsafe import Markup, escape
+
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+
+
+class SearchIndex:
+    """FTS5 index over the listings and article bodies the scrapers fetch,
+    keyed by URL, with hits ranked by BM25 and counted per source and month.
+    """
+
+    def __init__(self, path='search.sqlite3', weights=(10.0, 4.0, 1.0)):
+        self.path = path
+        self.weights = weights
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._facets = {}
+        self._facets_version = 0
+        self._connection().executescript(
+            'CREATE TABLE IF NOT EXISTS documents ('
+            'id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, source TEXT NOT NULL, '
+            'date TEXT NOT NULL, added REAL NOT NULL, version INTEGER NOT NULL);'
+            'CREATE INDEX IF NOT EXISTS documents_version ON documents (version);'
+            'CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5('
+            "title, summary, body, tokenize='porter unicode61 remove_diacritics 2');"
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def add(self, source, documents, listed_only=False):
+        # documents: dicts with url and any of title, summary, body and date
+        # (YYYY-MM-DD). Fields a document does not carry keep what an earlier
+        # listing or article gave; undated documents are dated when first seen.
+        # With listed_only, only documents already indexed are updated.
+        today = time.strftime('%Y-%m-%d')
+        changed = 0
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            # Rows inserted or redated by this call get the next version, so
+            # readers pick up exactly what changed since they last looked.
+            version = connection.execute('SELECT COALESCE(MAX(version), 0) + 1 FROM documents').fetchone()[0]
+            for document in documents:
+                url = document.get('url')
+                if not url:
+                    continue
+                text = tuple((document.get(name) or '').strip() for name in ('title', 'summary', 'body'))
+                row = connection.execute('SELECT id, date FROM documents WHERE url = ?', (url,)).fetchone()
+                if row is None:
+                    if listed_only:
+                        continue
+                    cursor = connection.execute(
+                        'INSERT INTO documents (url, source, date, added, version) VALUES (?, ?, ?, ?, ?)',
+                        (url, source, document.get('date') or today, time.time(), version)
+                    )
+                    connection.execute(
+                        'INSERT INTO documents_fts (rowid, title, summary, body) VALUES (?, ?, ?, ?)',
+                        (cursor.lastrowid, *text)
+                    )
+                    changed += 1
+                    continue
+                document_id, date = row
+                stored = connection.execute(
+                    'SELECT title, summary, body FROM documents_fts WHERE rowid = ?', (document_id,)
+                ).fetchone()
+                merged = tuple(value or previous for value, previous in zip(text, stored))
+                if merged != stored:
+                    connection.execute(
+                        'UPDATE documents_fts SET title = ?, summary = ?, body = ? WHERE rowid = ?',
+                        (*merged, document_id)
+                    )
+                redated = bool(document.get('date')) and document['date'] != date
+                if redated:
+                    connection.execute(
+                        'UPDATE documents SET date = ?, version = ? WHERE id = ?', (document['date'], version, document_id)
+                    )
+                changed += merged != stored or redated
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return changed
+
+    @staticmethod
+    def match_expression(text, prefix=True):
+        # Every word must appear; the last one may be a prefix, so results
+        # follow the query as it is typed. Quoting keeps FTS5 syntax out of
+        # user input.
+        words = re.findall(r'\w+', text or '')
+        return ' '.join([f'"{word}"' for word in words[:-1]] + [f'"{word}"{"*" if prefix else ""}' for word in words[-1:]])
+
+    def _sync_facets(self, connection):
+        with self._lock:
+            rows = connection.execute(
+                'SELECT id, source, date, version FROM documents WHERE version > ?', (self._facets_version,)
+            )
+            for document_id, source, date, version in rows:
+                self._facets[document_id] = (sys.intern(source), date)
+                self._facets_version = max(self._facets_version, version)
+            return self._facets
+
+    def search(self, text, sources=(), date_from=None, date_to=None, limit=20, offset=0):
+        match = self.match_expression(text)
+        facets = {'source': {}, 'month': {}}
+        if not match:
+            return {'total': 0, 'results': [], 'facets': facets}
+        connection = self._connection()
+        documents = self._sync_facets(connection)
+
+        # Matches are counted per (source, date) first; sources are then
+        # summed over the date range and months over the chosen sources, so
+        # each facet still shows the choices its own filter would add.
+        scores = connection.execute(
+            'SELECT rowid, bm25(documents_fts, ?, ?, ?) FROM documents_fts WHERE documents_fts MATCH ?',
+            (*self.weights, match)
+        ).fetchall()
+        counts = collections.Counter(map(documents.get, [document_id for document_id, _ in scores]))
+        counts.pop(None, None)
+        shown, total = set(), 0
+        for (source, date), count in counts.items():
+            in_dates = (not date_from or date >= date_from) and (not date_to or date <= date_to)
+            in_sources = not sources or source in sources
+            if in_dates:
+                facets['source'][source] = facets['source'].get(source, 0) + count
+            if in_sources:
+                facets['month'][date[:7]] = facets['month'].get(date[:7], 0) + count
+            if in_dates and in_sources:
+                shown.add((source, date))
+                total += count
+        facets['source'] = dict(sorted(facets['source'].items(), key=lambda entry: -entry[1]))
+        facets['month'] = dict(sorted(facets['month'].items(), reverse=True))
+        if total < len(scores):
+            scores = [(document_id, score) for document_id, score in scores if documents.get(document_id) in shown]
+
+        # Snippets only for the page of hits shown. Highlighting a prefix
+        # costs far more than a whole word, so the exact words go first and
+        # the prefix only for hits that matched nothing else.
+        ranked = heapq.nsmallest(offset + limit, scores, key=operator.itemgetter(1))[offset:]
+        details = {}
+        for expression in dict.fromkeys((self.match_expression(text, prefix=False), match)):
+            missing = [document_id for document_id, _ in ranked if document_id not in details]
+            if not missing:
+                break
+            rows = connection.execute(
+                'SELECT documents.id, documents.url, documents_fts.title, '
+                f"snippet(documents_fts, -1, '{SNIPPET_START}', '{SNIPPET_END}', '…', 24) FROM documents_fts "
+                'JOIN documents ON documents.id = documents_fts.rowid '
+                f"WHERE documents_fts MATCH ? AND documents_fts.rowid IN ({', '.join('?' * len(missing))})",
+                (expression, *missing)
+            )
+            details.update((row[0], row[1:]) for row in rows)
+        results = []
+        for document_id, score in ranked:
+            if document_id not in details:
+                continue
+            url, title, snippet = details[document_id]
+            source, date = documents[document_id]
+            results.append({
+                'url': url,
+                'source': source,
+                'title': title,
+                'date': date,
+                'snippet': self.snippet_markup(snippet),
+                'score': round(-score, 3),
+            })
+        return {'total': total, 'results': results, 'facets': facets}
+
+    @staticmethod
+    def snippet_markup(snippet):
+        return Markup(str(escape(snippet or '')).replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>'))
@@ -0,0 +1,18 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app opens its stores on import, relative to the working directory, and
+# starts fetching on the first request; keep both off the network and out of
+# the working tree.
+os.environ.setdefault('ARCHIVE_BACKFILL', '0')
+os.environ.setdefault('ARTICLE_PREFETCH', '0')
+os.environ.setdefault('LOG_JSON', '0')
+os.environ.setdefault('RATE_LIMIT_PATH', '')
+_directory = tempfile.mkdtemp(prefix='tests-')
+atexit.register(shutil.rmtree, _directory, ignore_errors=True)
+os.chdir(_directory)
@@ -0,0 +1,33 @@
+import app
+
+
+def pages(items, limit):
+    # Pages the way api_source does, following next_cursor to the end.
+    start, seen = 0, []
+    while True:
+        page = items[start:start + limit]
+        seen.append(page)
+        if not page or start + len(page) >= len(items):
+            return seen
+        assert len(seen) <= len(items), "paging did not end"
+        start = app.decode_api_cursor(app.encode_api_cursor(page[-1], start + len(page)), items)
+
+
+def test_pages_through_duplicate_keys():
+    items = [{'link': '#', 'title': f"item {index}"} for index in range(7)]
+    items[3]['link'] = items[5]['link'] = 'https://example.com/a'
+    seen = pages(items, 2)
+    assert [item for page in seen for item in page] == items
+
+
+def test_cursor_follows_its_item_when_items_are_inserted():
+    items = [{'url': f"https://example.com/{index}"} for index in range(6)]
+    cursor = app.encode_api_cursor(items[1], 2)
+    items = [{'url': 'https://example.com/new'}] + items
+    assert app.decode_api_cursor(cursor, items) == 3
+
+
+def test_cursor_falls_back_to_offset_when_its_item_is_gone():
+    items = [{'url': f"https://example.com/{index}"} for index in range(6)]
+    cursor = app.encode_api_cursor(items[1], 2)
+    assert app.decode_api_cursor(cursor, items[2:]) == 2
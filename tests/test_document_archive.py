@@ -0,0 +1,10 @@
+from document_archive import DocumentArchive
+
+
+def test_empty_past_month_is_covered(tmp_path):
+    archive = DocumentArchive(path=str(tmp_path / 'archive.sqlite3'))
+    assert not archive.covered('pib_facts', 2023, 5, '12')
+    archive.mark_covered('pib_facts', 2023, 5, '12')
+    assert archive.covered('pib_facts', 2023, 5, '12')
+    assert archive.query('pib_facts', 2023, 5, category='12') == []
+    assert not archive.covered('pib_facts', 2023, 6, '12')
@@ -0,0 +1,96 @@
+import os
+from datetime import datetime, timezone
+
+import page_parsers
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_pib_results():
+    assert page_parsers.parse_pib_results(fixture('pib_results.html')) == [
+        {'title': "India's Renewable Energy Capacity Crosses 200 GW",
+         'url': 'https://www.pib.gov.in/PressReleasePage.aspx?PRID=2012345',
+         'date': '15 MAR 2024 5:30PM by PIB Delhi'},
+        {'title': 'PM-KISAN: Sixteenth Instalment Released',
+         'url': 'https://www.pib.gov.in/PressReleseDetailm.aspx?PRID=2012200',
+         'date': '02 MAR 2024 1:10PM by PIB Delhi'},
+        {'title': 'Gaganyaan Mission Explained',
+         'url': 'https://static.pib.gov.in/WriteReadData/specificdocs/documents/2024/mar/doc20240301.pdf',
+         'date': '01 MAR 2024 6:00PM by PIB Delhi'},
+    ]
+
+
+def test_pib_results_empty_listing_differs_from_no_listing():
+    assert page_parsers.parse_pib_results(fixture('pib_results_empty.html')) == []
+    assert page_parsers.parse_pib_results('<html><body><p>Service Unavailable</p></body></html>') is None
+
+
+def test_mea_page_stops_at_cutoff():
+    documents, continue_scraping, next_url = page_parsers.parse_page_mea(
+        fixture('mea.html'), datetime(2024, 3, 1, tzinfo=timezone.utc))
+    assert documents == [
+        {'title': 'Joint Statement on the India-Japan Special Strategic Partnership',
+         'url': 'https://www.mea.gov.in/bilateral-documents.htm?dtl/37712/Joint_Statement_India_Japan',
+         'date': 'March 20, 2024'},
+        {'title': 'MoU between India and Bhutan on Energy Cooperation',
+         'url': 'https://www.mea.gov.in/bilateral-documents.htm?dtl/37690/MoU_India_Bhutan',
+         'date': 'March 14, 2024'},
+    ]
+    assert continue_scraping is False
+    assert next_url == 'https://www.mea.gov.in/bilateral-documents/?page=2'
+
+
+def test_prs_india():
+    assert page_parsers.parse_prs_india(fixture('prs_india.html')) == [
+        {'title': 'The Budget Session in Numbers',
+         'image_url': 'https://prsindia.org/files/blog/budget-session.png',
+         'link_url': 'https://prsindia.org/theprsblog/the-budget-session-in-numbers'},
+        {'title': 'Vital Stats: Functioning of Parliament',
+         'image_url': 'https://prsindia.org/files/vital.png',
+         'link_url': 'https://prsindia.org/policy/vital-stats/functioning-of-parliament'},
+        {'title': 'State Laws Tracker',
+         'image_url': 'https://prsindia.org/files/state-laws.jpg',
+         'link_url': 'https://prsindia.org/legislatures/state-laws'},
+    ]
+
+
+def test_prs_bills_page():
+    assert page_parsers.parse_prs_bills_page(fixture('prs_bills.html')) == {
+        'bills': [
+            {'title': 'The Telecommunications Bill, 2023',
+             'url': 'https://prsindia.org/billtrack/the-telecommunications-bill-2023',
+             'status': 'Passed'},
+            {'title': 'The Post Office Bill, 2023',
+             'url': 'https://prsindia.org/billtrack/the-post-office-bill-2023',
+             'status': 'Unknown'},
+        ],
+        'next': '?BillActsBillsParliamentSearch%5Bdate_of_introduction%5D=2023&page=1',
+    }
+
+
+def test_orf_articles(monkeypatch):
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2024, 3, 25, tzinfo=tz)
+
+    monkeypatch.setattr(page_parsers, 'datetime', FixedDatetime)
+    assert page_parsers.parse_orf_articles(fixture('orf.html')) == [
+        {'title': 'India and the Indo-Pacific: Charting a Course',
+         'link': 'https://www.orfonline.org/research/india-and-the-indo-pacific',
+         'date_obj': datetime(2024, 3, 18, tzinfo=timezone.utc),
+         'date': 'March 18, 2024',
+         'description': 'How New Delhi balances partnerships across the region.',
+         'author': 'ORF'},
+        {'title': 'Critical Minerals and Supply Chains',
+         'link': 'https://www.orfonline.org/expert-speak/critical-minerals',
+         'date_obj': datetime(2024, 3, 12, tzinfo=timezone.utc),
+         'date': 'March 12, 2024',
+         'description': '',
+         'author': 'ORF'},
+    ]
@@ -0,0 +1,29 @@
+import asyncio
+
+from rate_limiter import HostRateLimiter
+
+
+def test_state_is_kept_for_recent_hosts_only():
+    limiter = HostRateLimiter(interval=0.01, max_hosts=2)
+
+    async def main():
+        for host in ('a.example', 'b.example', 'c.example', 'b.example', 'd.example'):
+            await limiter.acquire(f"https://{host}/page")
+
+    asyncio.run(main())
+    assert sorted(limiter.status()) == ['b.example', 'd.example']
+
+
+def test_idle_shared_rows_are_dropped(tmp_path):
+    limiter = HostRateLimiter(path=str(tmp_path / 'limits.sqlite3'), interval=0.01, max_hosts=2, idle_ttl=0)
+
+    async def main():
+        for host in ('a.example', 'b.example'):
+            await limiter.acquire(f"https://{host}/page")
+        await asyncio.sleep(0.05)
+        for host in ('c.example', 'd.example'):
+            await limiter.acquire(f"https://{host}/page")
+
+    asyncio.run(main())
+    hosts = {row[0] for row in limiter._connection().execute('SELECT host FROM host_buckets')}
+    assert hosts.isdisjoint({'a.example', 'b.example'})
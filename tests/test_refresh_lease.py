@@ -0,0 +1,34 @@
+import asyncio
+from datetime import datetime, timezone
+
+import app
+
+
+def test_lease_loser_picks_up_peer_snapshot(monkeypatch):
+    name = 'orf'
+    monkeypatch.setattr(app, 'SNAPSHOT_POLL_INTERVAL', 0.01)
+    app.snapshot.pop(name, None)
+    app.cache.delete(f"snapshot/{name}")
+    app.cache.set(f"refresh-lease/{name}", 'peer', timeout=60)
+    calls = []
+
+    async def scrape():
+        calls.append(name)
+        return [{'title': 'mine'}]
+
+    async def peer_refresh():
+        await asyncio.sleep(0.05)
+        app.cache.set(f"snapshot/{name}", {
+            'data': [{'title': 'peer'}],
+            'refreshed_at': datetime.now(timezone.utc),
+            'last_error': None
+        }, timeout=0)
+
+    async def main():
+        assert await app.refresh_source(name, scrape) is False
+        assert app.snapshot_data(name, None) is None
+        await asyncio.gather(peer_refresh(), app.follow_persisted_snapshot(name, 0.5))
+
+    asyncio.run(main())
+    assert calls == []
+    assert app.snapshot_data(name, None) == [{'title': 'peer'}]
@@ -0,0 +1,13 @@
+from search_index import SearchIndex
+
+
+def test_article_bodies_only_update_listed_documents(tmp_path):
+    index = SearchIndex(path=str(tmp_path / 'search.sqlite3'))
+    index.add('insights', [{'url': 'https://example.com/listed', 'title': 'Monsoon outlook'}])
+    index.add('insights', [
+        {'url': 'https://example.com/listed', 'body': 'groundwater recharge'},
+        {'url': 'https://example.com/unlisted', 'title': 'Groundwater scam', 'body': 'groundwater'},
+    ], listed_only=True)
+    results = index.search('groundwater')['results']
+    assert [result['url'] for result in results] == ['https://example.com/listed']
+    assert results[0]['title'] == 'Monsoon outlook'
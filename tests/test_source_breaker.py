@@ -0,0 +1,45 @@
+import asyncio
+
+import app
+import circuit_breaker
+
+
+def test_tripped_source_misses_its_next_refresh(monkeypatch):
+    name = 'orf'
+    interval = app.REFRESH_INTERVALS[name]
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', lambda: now[0])
+    app._source_breakers.pop(name, None)
+    calls = []
+
+    async def failing_scrape():
+        calls.append(now[0])
+        raise RuntimeError("site down")
+
+    # One refresh per scheduled interval, each a little after the last ended.
+    for _ in range(app.BREAKER_FAILURE_THRESHOLD + 2):
+        app.cache.delete(f"refresh-lease/{name}")
+        asyncio.run(app.refresh_source(name, failing_scrape))
+        now[0] += interval + 1
+
+    start = 1000.0
+    tripped_at = start + (app.BREAKER_FAILURE_THRESHOLD - 1) * (interval + 1)
+    assert app.source_breaker(name).status()['state'] == circuit_breaker.CircuitBreaker.OPEN
+    assert calls == [start + run * (interval + 1) for run in range(app.BREAKER_FAILURE_THRESHOLD)] \
+        + [tripped_at + 2 * (interval + 1)]
+
+
+def test_empty_result_is_a_failure():
+    name = 'sansad_tv'
+    app._source_breakers.pop(name, None)
+    app.snapshot.pop(name, None)
+    app.cache.delete(f"snapshot/{name}")
+
+    async def empty_scrape():
+        return []
+
+    app.cache.delete(f"refresh-lease/{name}")
+    asyncio.run(app.refresh_source(name, empty_scrape))
+    assert app.source_breaker(name).status()['consecutive_failures'] == 1
+    assert app.snapshot[name]['last_error'] == "returned no data"
+    assert app.cache.get(f"snapshot/{name}") is None
@@ -0,0 +1,11 @@
+from tiered_cache import TieredCache
+
+
+def test_pages_do_not_evict_entries_without_timeout(tmp_path):
+    cache = TieredCache(path=str(tmp_path / 'cache.sqlite3'), l1_max_entries=0, max_entries=4)
+    cache.set('snapshot/orf', ['item'], timeout=0)
+    for user_id in range(10):
+        cache.set(f"view/index/{user_id}", 'page', timeout=300)
+    assert cache.get('snapshot/orf') == ['item']
+    assert cache.get('view/index/9') == 'page'
+    assert cache.get('view/index/0') is None
@@ -0,0 +1,184 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask_caching.backends.base import BaseCache
+
+
+class TieredCache(BaseCache):
+    """Flask-Caching backend with a small in-process LRU (L1) in front of a
+    SQLite file (L2) that is shared by every worker on the host and survives
+    restarts. L2 is bounded by entry count and total size, evicting the least
+    recently used entries first. Entries set with timeout=0 are only evicted
+    once no expiring entry is left, so a flood of short-lived pages cannot
+    push out the long-lived ones.
+    """
+
+    def __init__(self, path='cache.sqlite3', default_timeout=300, l1_max_entries=256, l1_timeout=30,
+                 max_entries=5000, max_bytes=64 * 1024 * 1024, ignore_errors=False):
+        super().__init__(default_timeout=default_timeout)
+        self.path = path
+        self.l1_max_entries = l1_max_entries
+        self.l1_timeout = l1_timeout
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ignore_errors = ignore_errors
+        self._l1 = OrderedDict()
+        self._l1_lock = threading.Lock()
+        self._local = threading.local()
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL, '
+            'size INTEGER NOT NULL, accessed REAL NOT NULL)'
+        )
+        self._connection().execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)')
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(
+            path=config.get('CACHE_SQLITE_PATH', 'cache.sqlite3'),
+            l1_max_entries=config.get('CACHE_L1_MAX_ENTRIES', 256),
+            l1_timeout=config.get('CACHE_L1_TIMEOUT', 30),
+            max_entries=config.get('CACHE_MAX_ENTRIES', 5000),
+            max_bytes=config.get('CACHE_MAX_BYTES', 64 * 1024 * 1024),
+            ignore_errors=config['CACHE_IGNORE_ERRORS'],
+        )
+        return cls(*args, **kwargs)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _expires_at(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        return 0 if timeout == 0 else time.time() + timeout
+
+    def _l1_get(self, key):
+        with self._l1_lock:
+            item = self._l1.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.time():
+                del self._l1[key]
+                return None
+            self._l1.move_to_end(key)
+            return item
+
+    def _l1_set(self, key, value, expires):
+        l1_expires = time.time() + self.l1_timeout
+        if expires:
+            l1_expires = min(l1_expires, expires)
+        with self._l1_lock:
+            self._l1[key] = (l1_expires, value)
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.l1_max_entries:
+                self._l1.popitem(last=False)
+
+    def _l1_delete(self, key):
+        with self._l1_lock:
+            self._l1.pop(key, None)
+
+    def _evict(self):
+        connection = self._connection()
+        now = time.time()
+        connection.execute('DELETE FROM cache WHERE expires != 0 AND expires <= ?', (now,))
+        count, total_size = connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+        rows = connection.execute('SELECT key, size FROM cache ORDER BY expires = 0, accessed').fetchall()
+        evicted = []
+        for key, size in rows:
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total_size -= size
+        connection.executemany('DELETE FROM cache WHERE key = ?', evicted)
+
+    def get(self, key):
+        item = self._l1_get(key)
+        if item is not None:
+            return item[1]
+        try:
+            connection = self._connection()
+            row = connection.execute('SELECT value, expires FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] and row[1] <= time.time():
+                connection.execute('DELETE FROM cache WHERE key = ? AND expires = ?', (key, row[1]))
+                return None
+            connection.execute('UPDATE cache SET accessed = ? WHERE key = ?', (time.time(), key))
+            value = pickle.loads(row[0])
+        except (sqlite3.Error, pickle.PickleError, EOFError) as e:
+            if not self.ignore_errors:
+                print(f"Error reading cache key {key}: {e}")
+            return None
+        self._l1_set(key, value, row[1])
+        return value
+
+    def set(self, key, value, timeout=None):
+        expires = self._expires_at(timeout)
+        try:
+            blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            self._connection().execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires, size, accessed) VALUES (?, ?, ?, ?, ?)',
+                (key, blob, expires, len(blob), time.time())
+            )
+            self._evict()
+        except (sqlite3.Error, pickle.PickleError) as e:
+            print(f"Error writing cache key {key}: {e}")
+            return False
+        self._l1_set(key, value, expires)
+        return True
+
+    def add(self, key, value, timeout=None):
+        expires = self._expires_at(timeout)
+        try:
+            blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            cursor = self._connection().execute(
+                'INSERT INTO cache (key, value, expires, size, accessed) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires, '
+                'size = excluded.size, accessed = excluded.accessed '
+                'WHERE cache.expires != 0 AND cache.expires <= ?',
+                (key, blob, expires, len(blob), time.time(), time.time())
+            )
+        except (sqlite3.Error, pickle.PickleError) as e:
+            print(f"Error adding cache key {key}: {e}")
+            return False
+        if cursor.rowcount != 1:
+            return False
+        self._l1_set(key, value, expires)
+        return True
+
+    def delete(self, key):
+        self._l1_delete(key)
+        try:
+            cursor = self._connection().execute('DELETE FROM cache WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            print(f"Error deleting cache key {key}: {e}")
+            return False
+        return cursor.rowcount == 1
+
+    def has(self, key):
+        return self.get(key) is not None
+
+    def clear(self):
+        with self._l1_lock:
+            self._l1.clear()
+        try:
+            self._connection().execute('DELETE FROM cache')
+        except sqlite3.Error as e:
+            print(f"Error clearing cache: {e}")
+            return False
+        return True
@@ -0,0 +1,174 @@
+import array
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+
+# A Mersenne prime above every 64-bit token hash folded into it.
+MERSENNE_PRIME = (1 << 61) - 1
+
+STOPWORDS = frozenset((
+    'a', 'about', 'after', 'all', 'also', 'an', 'and', 'any', 'are', 'as', 'at', 'be', 'been', 'but', 'by',
+    'can', 'for', 'from', 'has', 'have', 'how', 'in', 'into', 'is', 'it', 'its', 'key', 'more', 'new', 'not',
+    'of', 'on', 'or', 'over', 'says', 'than', 'that', 'the', 'their', 'this', 'to', 'under', 'was', 'what',
+    'when', 'which', 'who', 'why', 'will', 'with',
+))
+
+
+class TopicIndex:
+    """Groups items from different sources that cover the same story. The
+    words of each item's title and summary are summarised in a MinHash
+    signature, and locality-sensitive hashing over bands of that signature
+    finds the few stored items it could match, so adding an item costs the
+    same however many are stored. An item joins the cluster of its closest
+    match at or above threshold (estimated Jaccard similarity of the word
+    sets) or starts a cluster of its own. Items older than max_age are
+    dropped.
+    """
+
+    def __init__(self, path='topics.sqlite3', bands=20, rows=3, threshold=0.4, max_age=14 * 24 * 3600,
+                 ignored_words=()):
+        self.path = path
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        self.max_age = max_age
+        self.ignored_words = STOPWORDS | frozenset(ignored_words)
+        # Fixed seed: signatures are stored, so every process must permute alike.
+        generator = random.Random(1)
+        self._permutations = [
+            (generator.randrange(1, MERSENNE_PRIME), generator.randrange(MERSENNE_PRIME))
+            for _ in range(bands * rows)
+        ]
+        self._local = threading.local()
+        self._connection().executescript(
+            'CREATE TABLE IF NOT EXISTS items ('
+            'id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, source TEXT NOT NULL, title TEXT NOT NULL, '
+            'cluster_id INTEGER NOT NULL, signature BLOB, added REAL NOT NULL);'
+            'CREATE INDEX IF NOT EXISTS items_cluster ON items (cluster_id);'
+            'CREATE INDEX IF NOT EXISTS items_added ON items (added);'
+            'CREATE TABLE IF NOT EXISTS buckets ('
+            'bucket BLOB NOT NULL, item_id INTEGER NOT NULL, PRIMARY KEY (bucket, item_id)) WITHOUT ROWID;'
+            'CREATE INDEX IF NOT EXISTS buckets_item ON buckets (item_id);'
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def words(self, text):
+        words = set()
+        for word in re.findall(r'[a-z0-9]+', (text or '').lower()):
+            if word in self.ignored_words or (len(word) < 3 and not word.isdigit()):
+                continue
+            # Plurals match their singular.
+            if len(word) > 4 and word.endswith('s') and not word.endswith('ss'):
+                word = word[:-1]
+            words.add(word)
+        return words
+
+    def signature(self, words):
+        hashes = [int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), 'big') for word in words]
+        return [min((a * value + b) % MERSENNE_PRIME for value in hashes) for a, b in self._permutations]
+
+    def _buckets(self, signature):
+        # One bucket per band; the band number is hashed in so equal values
+        # in different bands do not collide.
+        buckets = []
+        for band in range(self.bands):
+            values = array.array('Q', [band] + signature[band * self.rows:(band + 1) * self.rows])
+            buckets.append(hashlib.blake2b(values.tobytes(), digest_size=8).digest())
+        return buckets
+
+    def add(self, source, items):
+        # items: dicts with url, title and optionally summary. Items already
+        # indexed are skipped, so a whole listing can be passed every refresh.
+        now = time.time()
+        added = 0
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            for item in items:
+                url, title = item.get('url'), item.get('title')
+                if not url or not title:
+                    continue
+                if connection.execute('SELECT 1 FROM items WHERE url = ?', (url,)).fetchone():
+                    continue
+                words = self.words(f"{title} {item.get('summary') or ''}")
+                # Too few words to tell stories apart; the item stays on its own.
+                signature = self.signature(words) if len(words) >= 3 else None
+                cluster_id = self._closest_cluster(connection, signature) if signature else None
+                cursor = connection.execute(
+                    'INSERT INTO items (url, source, title, cluster_id, signature, added) VALUES (?, ?, ?, 0, ?, ?)',
+                    (url, source, title, array.array('Q', signature).tobytes() if signature else None, now)
+                )
+                item_id = cursor.lastrowid
+                connection.execute('UPDATE items SET cluster_id = ? WHERE id = ?', (cluster_id or item_id, item_id))
+                if signature:
+                    connection.executemany(
+                        'INSERT OR IGNORE INTO buckets (bucket, item_id) VALUES (?, ?)',
+                        [(bucket, item_id) for bucket in self._buckets(signature)]
+                    )
+                added += 1
+            expired = now - self.max_age
+            connection.execute('DELETE FROM buckets WHERE item_id IN (SELECT id FROM items WHERE added < ?)', (expired,))
+            connection.execute('DELETE FROM items WHERE added < ?', (expired,))
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return added
+
+    def _closest_cluster(self, connection, signature):
+        buckets = self._buckets(signature)
+        candidates = connection.execute(
+            'SELECT DISTINCT items.id, items.cluster_id, items.signature FROM buckets '
+            'JOIN items ON items.id = buckets.item_id '
+            f"WHERE buckets.bucket IN ({', '.join('?' * len(buckets))})",
+            buckets
+        )
+        best_cluster, best_similarity = None, self.threshold
+        for _, cluster_id, stored in candidates:
+            stored_signature = array.array('Q')
+            stored_signature.frombytes(stored)
+            similarity = sum(1 for a, b in zip(signature, stored_signature) if a == b) / len(signature)
+            if similarity >= best_similarity:
+                best_cluster, best_similarity = cluster_id, similarity
+        return best_cluster
+
+    def clusters(self, min_sources=2, max_age=None, limit=20):
+        # Most recently active clusters first, each with its items oldest first.
+        since = time.time() - max_age if max_age else 0
+        connection = self._connection()
+        cluster_ids = [row[0] for row in connection.execute(
+            'SELECT cluster_id FROM items GROUP BY cluster_id '
+            'HAVING COUNT(DISTINCT source) >= ? AND MAX(added) >= ? ORDER BY MAX(added) DESC LIMIT ?',
+            (min_sources, since, limit)
+        )]
+        if not cluster_ids:
+            return []
+        clusters = {cluster_id: {'id': cluster_id, 'items': [], 'sources': []} for cluster_id in cluster_ids}
+        rows = connection.execute(
+            f"SELECT cluster_id, source, title, url FROM items WHERE cluster_id IN ({', '.join('?' * len(cluster_ids))}) "
+            'ORDER BY added, id',
+            cluster_ids
+        )
+        for cluster_id, source, title, url in rows:
+            cluster = clusters[cluster_id]
+            cluster['items'].append({'source': source, 'title': title, 'url': url})
+            if source not in cluster['sources']:
+                cluster['sources'].append(source)
+        for cluster in clusters.values():
+            cluster['title'] = cluster['items'][0]['title']
+        return [clusters[cluster_id] for cluster_id in cluster_ids]
@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import threading
+import time
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# SQLite limits the number of bound parameters per statement.
+QUERY_CHUNK_SIZE = 500
+
+
+class UserStore:
+    """Per-user progress in one SQLite file: accounts, the playlists each user
+    follows, and the videos and episodes they have marked. Feeds are scraped
+    once for everyone; a dashboard only asks which of the feed's items this
+    user has already seen, which the (user, item) primary keys answer from
+    the index.
+    """
+
+    def __init__(self, path='users.sqlite3'):
+        self.path = path
+        self._local = threading.local()
+        self._connection().executescript(
+            'CREATE TABLE IF NOT EXISTS users ('
+            'id INTEGER PRIMARY KEY, username TEXT NOT NULL UNIQUE, password_hash TEXT NOT NULL, created REAL NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS user_playlists ('
+            'user_id INTEGER NOT NULL, playlist_id TEXT NOT NULL, added REAL NOT NULL, '
+            'PRIMARY KEY (user_id, playlist_id)) WITHOUT ROWID;'
+            'CREATE INDEX IF NOT EXISTS user_playlists_playlist ON user_playlists (playlist_id);'
+            'CREATE TABLE IF NOT EXISTS watched_videos ('
+            'user_id INTEGER NOT NULL, video_id TEXT NOT NULL, PRIMARY KEY (user_id, video_id)) WITHOUT ROWID;'
+            'CREATE TABLE IF NOT EXISTS listened_episodes ('
+            'user_id INTEGER NOT NULL, link TEXT NOT NULL, PRIMARY KEY (user_id, link)) WITHOUT ROWID;'
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def create_user(self, username, password):
+        try:
+            cursor = self._connection().execute(
+                'INSERT INTO users (username, password_hash, created) VALUES (?, ?, ?)',
+                (username, generate_password_hash(password), time.time())
+            )
+        except sqlite3.IntegrityError:
+            return None
+        return cursor.lastrowid
+
+    def authenticate(self, username, password):
+        row = self._connection().execute(
+            'SELECT id, password_hash FROM users WHERE username = ?', (username,)
+        ).fetchone()
+        if row is None or not check_password_hash(row[1], password):
+            return None
+        return row[0]
+
+    def playlist_ids(self, user_id):
+        rows = self._connection().execute(
+            'SELECT playlist_id FROM user_playlists WHERE user_id = ? ORDER BY added', (user_id,)
+        )
+        return [row[0] for row in rows]
+
+    def all_playlist_ids(self):
+        rows = self._connection().execute('SELECT playlist_id FROM user_playlists GROUP BY playlist_id ORDER BY MIN(added)')
+        return [row[0] for row in rows]
+
+    def add_playlist(self, user_id, playlist_id):
+        self._connection().execute(
+            'INSERT OR IGNORE INTO user_playlists (user_id, playlist_id, added) VALUES (?, ?, ?)',
+            (user_id, playlist_id, time.time())
+        )
+
+    def _marked(self, table, column, user_id, candidates):
+        candidates = list(dict.fromkeys(candidates))
+        marked = set()
+        connection = self._connection()
+        for start in range(0, len(candidates), QUERY_CHUNK_SIZE):
+            chunk = candidates[start:start + QUERY_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            rows = connection.execute(
+                f'SELECT {column} FROM {table} WHERE user_id = ? AND {column} IN ({placeholders})',
+                (user_id, *chunk)
+            )
+            marked.update(row[0] for row in rows)
+        return marked
+
+    def _mark(self, table, column, user_id, items):
+        self._connection().executemany(
+            f'INSERT OR IGNORE INTO {table} (user_id, {column}) VALUES (?, ?)',
+            [(user_id, item) for item in items if item]
+        )
+
+    def watched_videos(self, user_id, candidates):
+        return self._marked('watched_videos', 'video_id', user_id, candidates)
+
+    def mark_watched(self, user_id, video_ids):
+        self._mark('watched_videos', 'video_id', user_id, video_ids)
+
+    def listened_episodes(self, user_id, candidates):
+        return self._marked('listened_episodes', 'link', user_id, candidates)
+
+    def mark_listened(self, user_id, episode_links):
+        self._mark('listened_episodes', 'link', user_id, episode_links)